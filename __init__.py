@@ -3,26 +3,65 @@ Paquete de estructuras de datos personalizadas
 
 Estructuras implementadas:
 - ColaPrioridad: Heap para gestionar pedidos con prioridad
+- ColaPrioridadBloqueante: Cola de prioridad thread-safe para estaciones de cocina
 - ListaEnlazada: Lista enlazada simple para historial
+- ListaDesenrollada: Lista enlazada de bloques para historiales grandes
+- HistorialAcotado: Buffer circular con volcado a disco para historiales largos
 - ArbolBST: Árbol binario de búsqueda para organizar productos
 - Pila: Stack LIFO para historial de navegación y deshacer
+- HistorialOperaciones: Deshacer/rehacer basado en comandos sobre dos pilas
 - ConjuntoPersonalizado: Wrapper de sets con operaciones adicionales
+- ConjuntoBits / TablaSimbolos: Conjuntos como máscaras de bits sobre un universo internado
+- IndiceTrigramas: Índice invertido de trigramas para búsqueda por subcadena
+- IndiceDifuso: Búsqueda tolerante a errores de tipeo (borrado simétrico)
+- IndicePrefijos: Autocompletado sobre un arreglo ordenado con bisect
+- IndiceCategorias: Categoría -> conjunto de productos, con filtro de disponibles
+- EstadisticasPorGrupo: Agregados materializados (cantidad, gasto, pedidos) por grupo
+- AlmacenPedidos: Pedidos en columnas NumPy con líneas CSR (opcional, requiere NumPy)
+- AcumuladorTemporal: Rollups por minuto/hora/día en buffers circulares
 """
 
 from .cola_prioridad import ColaPrioridad
+from .cola_concurrente import ColaPrioridadBloqueante, EstacionesCocina
 from .lista_enlazada import ListaEnlazada, Nodo
+from .lista_desenrollada import ListaDesenrollada
+from .historial_acotado import HistorialAcotado
 from .arbol_bst import ArbolBST, NodoBST
 from .pila import Pila
-from .conjunto import ConjuntoPersonalizado
+from .historial_operaciones import HistorialOperaciones
+from .conjunto import ConjuntoPersonalizado, ExpresionConjunto
+from .conjunto_bits import ConjuntoBits, TablaSimbolos
+from .indice_trigramas import IndiceTrigramas
+from .indice_difuso import IndiceDifuso
+from .indice_prefijos import IndicePrefijos
+from .indice_categorias import IndiceCategorias
+from .estadisticas_grupo import EstadisticasPorGrupo
+from .almacen_pedidos import AlmacenPedidos
+from .acumulador_temporal import AcumuladorTemporal
 
 __all__ = [
     'ColaPrioridad',
+    'ColaPrioridadBloqueante',
+    'EstacionesCocina',
     'ListaEnlazada',
     'Nodo',
+    'ListaDesenrollada',
+    'HistorialAcotado',
     'ArbolBST',
     'NodoBST',
     'Pila',
-    'ConjuntoPersonalizado'
+    'HistorialOperaciones',
+    'ConjuntoPersonalizado',
+    'ExpresionConjunto',
+    'ConjuntoBits',
+    'TablaSimbolos',
+    'IndiceTrigramas',
+    'IndiceDifuso',
+    'IndicePrefijos',
+    'IndiceCategorias',
+    'EstadisticasPorGrupo',
+    'AlmacenPedidos',
+    'AcumuladorTemporal'
 ]
 
 __version__ = '1.0.0'
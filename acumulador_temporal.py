@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+
+from .tiempo import EPOCA, como_fecha, segundos_epoca
+
+
+class _Anillo:
+    # Buffer circular de cubetas de `tamano` segundos. Cada posición guarda
+    # a qué cubeta pertenece: si no es la pedida, la posición está vencida y
+    # cuenta como vacía (no hace falta limpiar al avanzar el tiempo).
+    __slots__ = ('tamano', 'capacidad', 'marcas', 'pedidos', 'totales', 'ultima')
+
+    def __init__(self, tamano, capacidad):
+        self.tamano = tamano
+        self.capacidad = capacidad
+        self.marcas = [-1] * capacidad
+        self.pedidos = [0] * capacidad
+        self.totales = [0.0] * capacidad
+        self.ultima = -1
+
+    def registrar(self, segundos, monto, pedidos):
+        cubeta = segundos // self.tamano
+        if cubeta <= self.ultima - self.capacidad:
+            return False    # más antigua que lo que cabe en el anillo
+        self.ultima = max(self.ultima, cubeta)
+        pos = cubeta % self.capacidad
+        if self.marcas[pos] != cubeta:
+            self.marcas[pos] = cubeta
+            self.pedidos[pos] = 0
+            self.totales[pos] = 0.0
+        self.pedidos[pos] += pedidos
+        self.totales[pos] += monto
+        return True
+
+    def leer(self, cubeta):
+        pos = cubeta % self.capacidad
+        if self.marcas[pos] != cubeta:
+            return 0, 0.0
+        return self.pedidos[pos], self.totales[pos]
+
+
+class AcumuladorTemporal:
+    # Rollups de pedidos e importe por minuto, hora y día en anillos de
+    # tamaño fijo: memoria acotada sin importar cuántos pedidos lleguen, y
+    # una suma sobre una ventana cuesta O(cubetas de la ventana).
+    GRANULARIDADES = {'minuto': 60, 'hora': 3600, 'dia': 86400}
+
+    def __init__(self, minutos=1440, horas=24 * 8, dias=400, reloj=datetime.now):
+        # Por defecto: 1 día de minutos, 8 días de horas (alcanza para
+        # comparar con la misma hora de la semana anterior) y 400 días
+        self.reloj = reloj
+        capacidades = {'minuto': minutos, 'hora': horas, 'dia': dias}
+        self._anillos = {nombre: _Anillo(tamano, capacidades[nombre])
+                         for nombre, tamano in self.GRANULARIDADES.items()}
+
+    def _anillo(self, granularidad):
+        anillo = self._anillos.get(granularidad)
+        if anillo is None:
+            raise ValueError(f"Granularidad desconocida: {granularidad}")
+        return anillo
+
+    def registrar(self, fecha, monto, pedidos=1):
+        segundos = segundos_epoca(fecha)
+        for anillo in self._anillos.values():
+            anillo.registrar(segundos, monto, pedidos)
+
+    def ventana(self, granularidad, cantidad, hasta=None):
+        # (pedidos, total) de las últimas `cantidad` cubetas que terminan en
+        # la que contiene `hasta` (por defecto, ahora)
+        anillo = self._anillo(granularidad)
+        if cantidad > anillo.capacidad:
+            raise ValueError(f"La ventana supera las {anillo.capacidad} cubetas guardadas")
+        fin = segundos_epoca(hasta if hasta is not None else self.reloj()) // anillo.tamano
+        pedidos, total = 0, 0.0
+        for cubeta in range(fin - cantidad + 1, fin + 1):
+            p, t = anillo.leer(cubeta)
+            pedidos += p
+            total += t
+        return pedidos, total
+
+    def tasa(self, granularidad, cantidad, hasta=None):
+        # Pedidos e importe promedio por cubeta en la ventana (0 si está vacía)
+        if cantidad <= 0:
+            return 0.0, 0.0
+        pedidos, total = self.ventana(granularidad, cantidad, hasta)
+        return pedidos / cantidad, total / cantidad
+
+    def serie(self, granularidad, cantidad, hasta=None):
+        # [(inicio de la cubeta, pedidos, total)] de la más antigua a la más reciente
+        anillo = self._anillo(granularidad)
+        if cantidad > anillo.capacidad:
+            raise ValueError(f"La ventana supera las {anillo.capacidad} cubetas guardadas")
+        fin = segundos_epoca(hasta if hasta is not None else self.reloj()) // anillo.tamano
+        resultado = []
+        for cubeta in range(fin - cantidad + 1, fin + 1):
+            pedidos, total = anillo.leer(cubeta)
+            inicio = EPOCA + timedelta(seconds=cubeta * anillo.tamano)
+            resultado.append((inicio, pedidos, total))
+        return resultado
+
+    def comparar(self, granularidad, desfase, hasta=None):
+        # Cubeta actual frente a la de `desfase` (timedelta) atrás, p. ej. esta
+        # hora contra la misma hora de la semana pasada
+        ahora = como_fecha(hasta if hasta is not None else self.reloj())
+        return self.ventana(granularidad, 1, ahora), self.ventana(granularidad, 1, ahora - desfase)
+
+    def limpiar(self):
+        for nombre, anillo in self._anillos.items():
+            self._anillos[nombre] = _Anillo(anillo.tamano, anillo.capacidad)
@@ -0,0 +1,189 @@
+from datetime import timedelta
+
+from .conjunto_bits import TablaSimbolos
+from .tiempo import EPOCA, segundos_epoca
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él el sistema no crea el almacén
+    np = None
+
+NUMPY_DISPONIBLE = np is not None
+
+class AlmacenPedidos:
+    # Pedidos en columnas NumPy (un arreglo por campo) en lugar de un dict
+    # por pedido. Las cadenas (ids, tipos, estados, productos) se internan
+    # como enteros y las líneas de cada pedido van en formato CSR:
+    # productos[inicio_lineas[i]:inicio_lineas[i + 1]] son las del pedido i.
+    # Los reportes son group-bys vectorizados (bincount) sobre esas columnas.
+    _COLUMNAS = (
+        ('pedido', 'int64'), ('usuario', 'int32'), ('tipo', 'int8'),
+        ('fecha', 'int64'), ('total', 'float64'), ('estado', 'int8'),
+    )
+
+    def __init__(self, capacidad_inicial=1024):
+        if not NUMPY_DISPONIBLE:
+            raise ImportError("AlmacenPedidos requiere NumPy")
+        self._reiniciar(capacidad_inicial)
+
+    def _reiniciar(self, capacidad_inicial):
+        self.pedidos = TablaSimbolos()
+        self.usuarios = TablaSimbolos()
+        self.tipos = TablaSimbolos()
+        self.estados = TablaSimbolos()
+        self.productos = TablaSimbolos()
+        self._cantidad = 0
+        self._cantidad_lineas = 0
+        self._columnas = {nombre: np.zeros(capacidad_inicial, dtype=tipo)
+                          for nombre, tipo in self._COLUMNAS}
+        self._inicio_lineas = np.zeros(capacidad_inicial + 1, dtype='int64')
+        self._lineas = np.zeros(capacidad_inicial * 4, dtype='int32')
+
+    @staticmethod
+    def _crecer(arreglo, minimo):
+        # Duplica la capacidad: agregar de a un pedido es O(1) amortizado
+        if len(arreglo) >= minimo:
+            return arreglo
+        nuevo = np.zeros(max(minimo, 2 * len(arreglo)), dtype=arreglo.dtype)
+        nuevo[:len(arreglo)] = arreglo
+        return nuevo
+
+    def _reservar(self, pedidos, lineas):
+        total = self._cantidad + pedidos
+        for nombre in self._columnas:
+            self._columnas[nombre] = self._crecer(self._columnas[nombre], total)
+        self._inicio_lineas = self._crecer(self._inicio_lineas, total + 1)
+        self._lineas = self._crecer(self._lineas, self._cantidad_lineas + lineas)
+
+    def agregar(self, pedido_id, usuario_id, tipo, fecha, total, estado, producto_ids):
+        # La fecha se convierte antes de tocar columnas o tablas: si no es
+        # válida (ValueError) el almacén queda como estaba
+        segundos = segundos_epoca(fecha)
+        self._reservar(1, len(producto_ids))
+        i = self._cantidad
+        columnas = self._columnas
+        columnas['pedido'][i] = self.pedidos.internar(pedido_id)
+        columnas['usuario'][i] = self.usuarios.internar(usuario_id)
+        columnas['tipo'][i] = self.tipos.internar(tipo)
+        columnas['fecha'][i] = segundos
+        columnas['total'][i] = total
+        columnas['estado'][i] = self.estados.internar(estado)
+        fin = self._cantidad_lineas + len(producto_ids)
+        self._lineas[self._cantidad_lineas:fin] = [self.productos.internar(p) for p in producto_ids]
+        self._cantidad += 1
+        self._cantidad_lineas = fin
+        self._inicio_lineas[self._cantidad] = fin
+        return True
+
+    def agregar_lote(self, pedidos):
+        # pedidos: iterable de (pedido_id, usuario_id, tipo, fecha, total,
+        # estado, producto_ids); se convierte a columnas de una sola vez.
+        # Las filas con fecha inválida se omiten y se informan en "rechazados".
+        valores = {nombre: [] for nombre, _ in self._COLUMNAS}
+        lineas = []
+        largos = []
+        agregados = []
+        rechazados = []
+        for pedido_id, usuario_id, tipo, fecha, total, estado, producto_ids in pedidos:
+            try:
+                segundos = segundos_epoca(fecha)
+            except (ValueError, TypeError):
+                rechazados.append(pedido_id)
+                continue
+            valores['pedido'].append(self.pedidos.internar(pedido_id))
+            valores['usuario'].append(self.usuarios.internar(usuario_id))
+            valores['tipo'].append(self.tipos.internar(tipo))
+            valores['fecha'].append(segundos)
+            valores['total'].append(total)
+            valores['estado'].append(self.estados.internar(estado))
+            lineas.extend(self.productos.internar(p) for p in producto_ids)
+            largos.append(len(producto_ids))
+            agregados.append(pedido_id)
+        cantidad = len(largos)
+        if cantidad:
+            self._reservar(cantidad, len(lineas))
+            inicio, fin = self._cantidad, self._cantidad + cantidad
+            for nombre, tipo in self._COLUMNAS:
+                self._columnas[nombre][inicio:fin] = np.asarray(valores[nombre], dtype=tipo)
+            self._lineas[self._cantidad_lineas:self._cantidad_lineas + len(lineas)] = lineas
+            self._inicio_lineas[inicio + 1:fin + 1] = self._cantidad_lineas + np.cumsum(largos)
+            self._cantidad = fin
+            self._cantidad_lineas += len(lineas)
+        return {'agregados': agregados, 'rechazados': rechazados}
+
+    def columna(self, nombre):
+        # Vista (sin copia) de la parte usada de una columna
+        if nombre == 'productos':
+            return self._lineas[:self._cantidad_lineas]
+        if nombre == 'inicio_lineas':
+            return self._inicio_lineas[:self._cantidad + 1]
+        return self._columnas[nombre][:self._cantidad]
+
+    def _mascara(self, desde=None, hasta=None, estado=None):
+        # Filtro por rango de fechas (inclusive) y estado; None = sin filtro
+        mascara = np.ones(self._cantidad, dtype=bool)
+        fechas = self.columna('fecha')
+        if desde is not None:
+            mascara &= fechas >= segundos_epoca(desde)
+        if hasta is not None:
+            mascara &= fechas <= segundos_epoca(hasta)
+        if estado is not None:
+            codigo = self.estados.indice_de(estado)
+            if codigo is None:
+                return np.zeros(self._cantidad, dtype=bool)
+            mascara &= self.columna('estado') == codigo
+        return mascara
+
+    def unidades_por_producto(self, desde=None, hasta=None, estado=None):
+        # {producto_id: unidades vendidas}
+        mascara = self._mascara(desde, hasta, estado)
+        largos = np.diff(self.columna('inicio_lineas'))
+        lineas = self.columna('productos')[np.repeat(mascara, largos)]
+        conteo = np.bincount(lineas, minlength=len(self.productos))
+        return {self.productos.simbolo(i): int(conteo[i]) for i in np.flatnonzero(conteo)}
+
+    def ventas_por_hora(self, desde=None, hasta=None, estado=None):
+        # (pedidos, total vendido) por hora del día, arreglos de 24 posiciones
+        mascara = self._mascara(desde, hasta, estado)
+        horas = (self.columna('fecha')[mascara] // 3600) % 24
+        pedidos = np.bincount(horas, minlength=24)
+        totales = np.bincount(horas, weights=self.columna('total')[mascara], minlength=24)
+        return pedidos, totales
+
+    def ventas_por_tipo(self, desde=None, hasta=None, estado=None):
+        # {tipo: {'pedidos', 'total'}}
+        mascara = self._mascara(desde, hasta, estado)
+        tipos = self.columna('tipo')[mascara]
+        pedidos = np.bincount(tipos, minlength=len(self.tipos))
+        totales = np.bincount(tipos, weights=self.columna('total')[mascara], minlength=len(self.tipos))
+        return {self.tipos.simbolo(i): {'pedidos': int(pedidos[i]), 'total': float(totales[i])}
+                for i in np.flatnonzero(pedidos)}
+
+    def ventas_por_dia(self, desde=None, hasta=None, estado=None):
+        # {'AAAA-MM-DD': {'pedidos', 'total'}} en orden cronológico
+        mascara = self._mascara(desde, hasta, estado)
+        dias = self.columna('fecha')[mascara] // 86400
+        if not len(dias):
+            return {}
+        primero = int(dias.min())
+        dias = dias - primero
+        pedidos = np.bincount(dias)
+        totales = np.bincount(dias, weights=self.columna('total')[mascara])
+        resultado = {}
+        for i in np.flatnonzero(pedidos):
+            fecha = (EPOCA + timedelta(days=primero + int(i))).strftime('%Y-%m-%d')
+            resultado[fecha] = {'pedidos': int(pedidos[i]), 'total': float(totales[i])}
+        return resultado
+
+    def total_ventas(self, desde=None, hasta=None, estado=None):
+        mascara = self._mascara(desde, hasta, estado)
+        return int(mascara.sum()), float(self.columna('total')[mascara].sum())
+
+    def cantidad_lineas(self):
+        return self._cantidad_lineas
+
+    def limpiar(self):
+        self._reiniciar(1024)
+
+    def __len__(self):
+        return self._cantidad
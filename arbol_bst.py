@@ -1,109 +1,407 @@
+from itertools import islice
+
+
 class NodoBST:
     def __init__(self, clave, valor):
         self.clave = clave
         self.valor = valor
         self.izquierdo = None
         self.derecho = None
+        self.altura = 1
+        # Cantidad de valores en el subárbol (estadísticos de orden)
+        self.peso = 1
 
 class ArbolBST:
-    def __init__(self):
+    def __init__(self, balanceado=False, claves_duplicadas=False):
         self.raiz = None
         self.tamano = 0
-    
+        self.balanceado = balanceado
+        # Con claves duplicadas cada nodo guarda una lista con todos los
+        # valores que comparten la clave en lugar de sobrescribir el anterior.
+        self.claves_duplicadas = claves_duplicadas
+
+    def _nuevo_nodo(self, clave, valor):
+        return NodoBST(clave, [valor] if self.claves_duplicadas else valor)
+
+    def _cantidad(self, nodo):
+        return len(nodo.valor) if self.claves_duplicadas else 1
+
+    def _valores(self, nodo):
+        return nodo.valor if self.claves_duplicadas else (nodo.valor,)
+
     def insertar(self, clave, valor):
         if self.raiz is None:
-            self.raiz = NodoBST(clave, valor)
+            self.raiz = self._nuevo_nodo(clave, valor)
             self.tamano += 1
-        else:
-            self._insertar_recursivo(self.raiz, clave, valor)
-    
-    def _insertar_recursivo(self, nodo, clave, valor):
-        if clave < nodo.clave:
-            if nodo.izquierdo is None:
-                nodo.izquierdo = NodoBST(clave, valor)
-                self.tamano += 1
-            else:
-                self._insertar_recursivo(nodo.izquierdo, clave, valor)
-        elif clave > nodo.clave:
-            if nodo.derecho is None:
-                nodo.derecho = NodoBST(clave, valor)
+            return
+
+        camino = []
+        nodo = self.raiz
+        while nodo:
+            camino.append(nodo)
+            if clave < nodo.clave:
+                nodo = nodo.izquierdo
+            elif clave > nodo.clave:
+                nodo = nodo.derecho
+            elif self.claves_duplicadas:
+                nodo.valor.append(valor)
                 self.tamano += 1
+                for ancestro in camino:
+                    ancestro.peso += 1
+                return
             else:
-                self._insertar_recursivo(nodo.derecho, clave, valor)
+                nodo.valor = valor
+                return
+
+        padre = camino[-1]
+        if clave < padre.clave:
+            padre.izquierdo = self._nuevo_nodo(clave, valor)
         else:
-            nodo.valor = valor
-    
-    def buscar(self, clave):
-        return self._buscar_recursivo(self.raiz, clave)
-    
-    def _buscar_recursivo(self, nodo, clave):
+            padre.derecho = self._nuevo_nodo(clave, valor)
+        self.tamano += 1
+        self._reequilibrar_camino(camino)
+
+    def eliminar(self, clave, valor=None):
+        # Con claves duplicadas y `valor` indicado solo se quita ese valor del
+        # grupo; sin `valor` se elimina la clave completa.
+        camino = []
+        nodo = self.raiz
+        while nodo and clave != nodo.clave:
+            camino.append(nodo)
+            nodo = nodo.izquierdo if clave < nodo.clave else nodo.derecho
         if nodo is None:
-            return None
-        if clave == nodo.clave:
-            return nodo.valor
-        elif clave < nodo.clave:
-            return self._buscar_recursivo(nodo.izquierdo, clave)
+            return False
+
+        if self.claves_duplicadas and valor is not None:
+            if valor not in nodo.valor:
+                return False
+            if len(nodo.valor) > 1:
+                nodo.valor.remove(valor)
+                self.tamano -= 1
+                for ancestro in camino:
+                    ancestro.peso -= 1
+                nodo.peso -= 1
+                return True
+        elif valor is not None and nodo.valor != valor:
+            return False
+
+        self.tamano -= self._cantidad(nodo)
+
+        if nodo.izquierdo and nodo.derecho:
+            # Se copia el sucesor en este nodo y se elimina el sucesor,
+            # que a lo sumo tiene hijo derecho.
+            camino.append(nodo)
+            sucesor = nodo.derecho
+            while sucesor.izquierdo:
+                camino.append(sucesor)
+                sucesor = sucesor.izquierdo
+            nodo.clave = sucesor.clave
+            nodo.valor = sucesor.valor
+            nodo = sucesor
+
+        hijo = nodo.izquierdo or nodo.derecho
+        if not camino:
+            self.raiz = hijo
+        elif camino[-1].izquierdo is nodo:
+            camino[-1].izquierdo = hijo
+        else:
+            camino[-1].derecho = hijo
+        self._reequilibrar_camino(camino)
+        return True
+
+    def actualizar_clave(self, clave_vieja, clave_nueva, valor):
+        # Mueve `valor` a otra clave en O(log n). Si no estaba en la vieja no
+        # se inserta nada y devuelve False.
+        if not self.eliminar(clave_vieja, valor):
+            return False
+        self.insertar(clave_nueva, valor)
+        return True
+
+    def construir_desde_ordenados(self, pares):
+        # Construye un árbol perfectamente balanceado en O(n) a partir de
+        # pares (clave, valor) ya ordenados por clave. Reemplaza el contenido.
+        claves = []
+        valores = []
+        for clave, valor in pares:
+            if claves and clave < claves[-1]:
+                raise ValueError("Los pares deben venir ordenados por clave")
+            if claves and clave == claves[-1]:
+                if self.claves_duplicadas:
+                    valores[-1].append(valor)
+                else:
+                    valores[-1] = valor
+                continue
+            claves.append(clave)
+            valores.append([valor] if self.claves_duplicadas else valor)
+
+        self.raiz = self._construir(claves, valores, 0, len(claves) - 1)
+        if self.claves_duplicadas:
+            self.tamano = sum(len(v) for v in valores)
         else:
-            return self._buscar_recursivo(nodo.derecho, clave)
-    
+            self.tamano = len(claves)
+
+    def _construir(self, claves, valores, inicio, fin):
+        # La profundidad de recursión es log2(n), no n.
+        if inicio > fin:
+            return None
+        medio = (inicio + fin) // 2
+        nodo = NodoBST(claves[medio], valores[medio])
+        nodo.izquierdo = self._construir(claves, valores, inicio, medio - 1)
+        nodo.derecho = self._construir(claves, valores, medio + 1, fin)
+        self._actualizar(nodo)
+        return nodo
+
+    def _reequilibrar_camino(self, camino):
+        # Recorre el camino de abajo hacia arriba actualizando alturas y,
+        # en modo balanceado, aplicando rotaciones AVL donde haga falta.
+        for i in range(len(camino) - 1, -1, -1):
+            nodo = camino[i]
+            self._actualizar(nodo)
+            if not self.balanceado:
+                continue
+            nuevo = self._balancear(nodo)
+            if nuevo is nodo:
+                continue
+            if i == 0:
+                self.raiz = nuevo
+            elif camino[i - 1].izquierdo is nodo:
+                camino[i - 1].izquierdo = nuevo
+            else:
+                camino[i - 1].derecho = nuevo
+
+    @staticmethod
+    def _altura(nodo):
+        return nodo.altura if nodo else 0
+
+    @staticmethod
+    def _peso(nodo):
+        return nodo.peso if nodo else 0
+
+    def _actualizar(self, nodo):
+        nodo.altura = 1 + max(self._altura(nodo.izquierdo), self._altura(nodo.derecho))
+        nodo.peso = self._cantidad(nodo) + self._peso(nodo.izquierdo) + self._peso(nodo.derecho)
+
+    def _rotar_derecha(self, nodo):
+        pivote = nodo.izquierdo
+        nodo.izquierdo = pivote.derecho
+        pivote.derecho = nodo
+        self._actualizar(nodo)
+        self._actualizar(pivote)
+        return pivote
+
+    def _rotar_izquierda(self, nodo):
+        pivote = nodo.derecho
+        nodo.derecho = pivote.izquierdo
+        pivote.izquierdo = nodo
+        self._actualizar(nodo)
+        self._actualizar(pivote)
+        return pivote
+
+    def _balancear(self, nodo):
+        factor = self._altura(nodo.izquierdo) - self._altura(nodo.derecho)
+        if factor > 1:
+            hijo = nodo.izquierdo
+            if self._altura(hijo.izquierdo) < self._altura(hijo.derecho):
+                nodo.izquierdo = self._rotar_izquierda(hijo)
+            return self._rotar_derecha(nodo)
+        if factor < -1:
+            hijo = nodo.derecho
+            if self._altura(hijo.derecho) < self._altura(hijo.izquierdo):
+                nodo.derecho = self._rotar_derecha(hijo)
+            return self._rotar_izquierda(nodo)
+        return nodo
+
+    def buscar(self, clave):
+        nodo = self.raiz
+        while nodo:
+            if clave == nodo.clave:
+                return list(nodo.valor) if self.claves_duplicadas else nodo.valor
+            nodo = nodo.izquierdo if clave < nodo.clave else nodo.derecho
+        return None
+
     def buscar_rango(self, min_clave, max_clave):
-        resultados = []
-        self._buscar_rango_recursivo(self.raiz, min_clave, max_clave, resultados)
-        return resultados
-    
-    def _buscar_rango_recursivo(self, nodo, min_clave, max_clave, resultados):
-        if nodo is None:
-            return
-        if min_clave <= nodo.clave <= max_clave:
-            resultados.append({'clave': nodo.clave, 'valor': nodo.valor})
-        if nodo.clave > min_clave:
-            self._buscar_rango_recursivo(nodo.izquierdo, min_clave, max_clave, resultados)
-        if nodo.clave < max_clave:
-            self._buscar_rango_recursivo(nodo.derecho, min_clave, max_clave, resultados)
-    
+        return [{'clave': clave, 'valor': valor}
+                for clave, valor in self.iter_rango(min_clave, max_clave)]
+
+    def iter_rango(self, min_clave=None, max_clave=None, desde=None, limite=None,
+                   desplazamiento=None):
+        # Generador perezoso en orden ascendente sobre una pila explícita.
+        # `desde` es un cursor exclusivo: se reanuda en la primera clave > desde.
+        # Con `desplazamiento` el cursor es (desde, desplazamiento): se reanuda
+        # dentro de la cubeta de `desde`, saltando los valores ya entregados.
+        # None en min/max deja ese extremo abierto.
+        inclusivo = desplazamiento is not None
+        pila = []
+        nodo = self.raiz
+        while nodo:
+            if self._antes_del_inicio(nodo.clave, min_clave, desde, inclusivo):
+                nodo = nodo.derecho
+            else:
+                pila.append(nodo)
+                nodo = nodo.izquierdo
+
+        entregados = 0
+        while pila:
+            nodo = pila.pop()
+            if max_clave is not None and nodo.clave > max_clave:
+                return
+            valores = self._valores(nodo)
+            if inclusivo and nodo.clave == desde:
+                valores = islice(valores, desplazamiento, None)
+            for valor in valores:
+                if limite is not None and entregados >= limite:
+                    return
+                yield nodo.clave, valor
+                entregados += 1
+            nodo = nodo.derecho
+            while nodo:
+                pila.append(nodo)
+                nodo = nodo.izquierdo
+
+    def iter_rango_inverso(self, min_clave=None, max_clave=None, desde=None, limite=None,
+                           desplazamiento=None):
+        # Igual que iter_rango pero en orden descendente; se reanuda en la
+        # primera clave < desde, o dentro de su cubeta con `desplazamiento`.
+        inclusivo = desplazamiento is not None
+        pila = []
+        nodo = self.raiz
+        while nodo:
+            if self._despues_del_inicio(nodo.clave, max_clave, desde, inclusivo):
+                nodo = nodo.izquierdo
+            else:
+                pila.append(nodo)
+                nodo = nodo.derecho
+
+        entregados = 0
+        while pila:
+            nodo = pila.pop()
+            if min_clave is not None and nodo.clave < min_clave:
+                return
+            valores = reversed(self._valores(nodo))
+            if inclusivo and nodo.clave == desde:
+                valores = islice(valores, desplazamiento, None)
+            for valor in valores:
+                if limite is not None and entregados >= limite:
+                    return
+                yield nodo.clave, valor
+                entregados += 1
+            nodo = nodo.izquierdo
+            while nodo:
+                pila.append(nodo)
+                nodo = nodo.derecho
+
+    def pagina_rango(self, min_clave=None, max_clave=None, cursor=None, limite=10, inverso=False):
+        # Una página de (clave, valor) y el cursor (clave, desplazamiento)
+        # para pedir la siguiente; el cursor es None cuando no quedan más.
+        # Sirve aunque la página termine a mitad de una cubeta de duplicados.
+        desde, desplazamiento = cursor if cursor is not None else (None, None)
+        recorrer = self.iter_rango_inverso if inverso else self.iter_rango
+        pagina = list(recorrer(min_clave, max_clave, desde, limite + 1, desplazamiento))
+        if len(pagina) <= limite:
+            return pagina, None
+        pagina.pop()
+        ultima = pagina[-1][0]
+        repetidos = 0
+        for clave, _ in reversed(pagina):
+            if clave != ultima:
+                break
+            repetidos += 1
+        if ultima == desde and repetidos == len(pagina):
+            repetidos += desplazamiento
+        return pagina, (ultima, repetidos)
+
+    @staticmethod
+    def _antes_del_inicio(clave, min_clave, desde, inclusivo=False):
+        if min_clave is not None and clave < min_clave:
+            return True
+        if desde is None:
+            return False
+        return clave < desde if inclusivo else clave <= desde
+
+    @staticmethod
+    def _despues_del_inicio(clave, max_clave, desde, inclusivo=False):
+        if max_clave is not None and clave > max_clave:
+            return True
+        if desde is None:
+            return False
+        return clave > desde if inclusivo else clave >= desde
+
+    def _contar_menores(self, clave, inclusivo=False):
+        cuenta = 0
+        nodo = self.raiz
+        while nodo:
+            if clave < nodo.clave or (clave == nodo.clave and not inclusivo):
+                nodo = nodo.izquierdo
+            else:
+                cuenta += self._peso(nodo.izquierdo) + self._cantidad(nodo)
+                nodo = nodo.derecho
+        return cuenta
+
+    def rango_de(self, clave):
+        # Cantidad de valores con clave estrictamente menor
+        return self._contar_menores(clave)
+
+    def contar_rango(self, min_clave, max_clave):
+        if min_clave > max_clave:
+            return 0
+        return self._contar_menores(max_clave, inclusivo=True) - self._contar_menores(min_clave)
+
+    def seleccionar(self, k):
+        # k-ésimo valor en orden (desde 0) sin recorrer el árbol completo
+        if k < 0 or k >= self.tamano:
+            return None
+        nodo = self.raiz
+        while nodo:
+            peso_izq = self._peso(nodo.izquierdo)
+            if k < peso_izq:
+                nodo = nodo.izquierdo
+                continue
+            k -= peso_izq
+            cantidad = self._cantidad(nodo)
+            if k < cantidad:
+                return {'clave': nodo.clave, 'valor': self._valores(nodo)[k]}
+            k -= cantidad
+            nodo = nodo.derecho
+        return None
+
+    def percentil(self, p):
+        # Percentil por rango más cercano, p entre 0 y 100
+        if self.tamano == 0 or not 0 <= p <= 100:
+            return None
+        k = -(-p * self.tamano // 100) - 1
+        return self.seleccionar(max(0, min(int(k), self.tamano - 1)))
+
     def obtener_minimo(self):
         if self.raiz is None:
             return None
         nodo = self.raiz
         while nodo.izquierdo:
             nodo = nodo.izquierdo
-        return {'clave': nodo.clave, 'valor': nodo.valor}
-    
+        return {'clave': nodo.clave, 'valor': self._valores(nodo)[0]}
+
     def obtener_maximo(self):
         if self.raiz is None:
             return None
         nodo = self.raiz
         while nodo.derecho:
             nodo = nodo.derecho
-        return {'clave': nodo.clave, 'valor': nodo.valor}
-    
+        return {'clave': nodo.clave, 'valor': self._valores(nodo)[-1]}
+
     def recorrido_inorden(self):
-        resultado = []
-        self._inorden_recursivo(self.raiz, resultado)
-        return resultado
-    
-    def _inorden_recursivo(self, nodo, resultado):
-        if nodo:
-            self._inorden_recursivo(nodo.izquierdo, resultado)
-            resultado.append({'clave': nodo.clave, 'valor': nodo.valor})
-            self._inorden_recursivo(nodo.derecho, resultado)
-    
+        return [{'clave': clave, 'valor': valor} for clave, valor in self.iter_rango()]
+
     def obtener_altura(self):
-        return self._calcular_altura(self.raiz)
-    
-    def _calcular_altura(self, nodo):
-        if nodo is None:
-            return 0
-        altura_izq = self._calcular_altura(nodo.izquierdo)
-        altura_der = self._calcular_altura(nodo.derecho)
-        return 1 + max(altura_izq, altura_der)
-    
+        return self._altura(self.raiz)
+
     def esta_vacio(self):
         return self.raiz is None
-    
+
     def limpiar(self):
         self.raiz = None
         self.tamano = 0
-    
+
     def __len__(self):
-        return self.tamano
\ No newline at end of file
+        return self.tamano
+
+    def __iter__(self):
+        return self.iter_rango()
@@ -0,0 +1,68 @@
+"""
+user-015: chequeo de alérgenos con sets, con máscaras por producto y con
+conjuntos de productos por ingrediente (ConjuntoBits).
+
+--usuarios usuarios con 0 a 3 alergias contra un catálogo de --productos
+productos armados con --ingredientes ingredientes distintos.
+"""
+import argparse
+import random
+
+import comun
+from estructuras.conjunto_bits import ConjuntoBits, TablaSimbolos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--usuarios', type=int, default=10000)
+    parser.add_argument('--productos', type=int, default=1000)
+    parser.add_argument('--ingredientes', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    nombres = [f'ingrediente{i}' for i in range(args.ingredientes)]
+    catalogo = {f'P{i:04d}': set(rng.sample(nombres, rng.randint(1, 8)))
+                for i in range(args.productos)}
+    alergias = [set(rng.sample(nombres, rng.randint(0, 3))) for _ in range(args.usuarios)]
+
+    simbolos_ingredientes = TablaSimbolos(nombres)
+    simbolos_productos = TablaSimbolos(catalogo)
+    mascaras = {pid: ConjuntoBits(simbolos_ingredientes, ings) for pid, ings in catalogo.items()}
+    por_ingrediente = {nombre: ConjuntoBits(simbolos_productos) for nombre in nombres}
+    for pid, ings in catalogo.items():
+        for nombre in ings:
+            por_ingrediente[nombre].agregar(pid)
+    todos = ConjuntoBits(simbolos_productos, catalogo)
+
+    def con_sets():
+        return sum(1 for alergia in alergias for ings in catalogo.values() if not alergia & ings)
+
+    def con_mascaras():
+        total = 0
+        for alergia in alergias:
+            mascara = ConjuntoBits(simbolos_ingredientes, alergia).mascara
+            total += sum(1 for ings in mascaras.values() if not mascara & ings.mascara)
+        return total
+
+    def por_ingredientes():
+        total = 0
+        for alergia in alergias:
+            aptos = todos
+            for nombre in alergia:
+                aptos = aptos.diferencia(por_ingrediente[nombre])
+            total += len(aptos)
+        return total
+
+    comun.imprimir_fila(f"{args.usuarios} usuarios x {args.productos} productos", 'tiempo (ms)')
+    esperado = None
+    for etiqueta, funcion in (('set & set por producto', con_sets),
+                              ('máscara & máscara por producto', con_mascaras),
+                              ('conjuntos por ingrediente', por_ingredientes)):
+        tiempo, aptos = comun.medir(funcion, repeticiones=1)
+        assert esperado is None or aptos == esperado
+        esperado = aptos
+        comun.imprimir_fila(etiqueta, f"{tiempo * 1e3:.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+user-024: reportes de ventas recorriendo un dict por pedido frente a
+AlmacenPedidos (columnas NumPy con bincount).
+
+--n pedidos repartidos en 2024 con 1 a 4 productos cada uno. Las fechas
+del recorrido ya son datetime: no se cuenta el costo de parsear cadenas.
+"""
+import argparse
+import random
+import sys
+from datetime import datetime, timedelta
+
+import comun
+from estructuras.almacen_pedidos import AlmacenPedidos, NUMPY_DISPONIBLE
+
+TIPOS = ('profesor', 'estudiante', 'staff')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--n', type=int, default=200000)
+    parser.add_argument('--productos', type=int, default=300)
+    args = parser.parse_args()
+    if not NUMPY_DISPONIBLE:
+        sys.exit("Este benchmark requiere NumPy (pip install numpy)")
+
+    rng = random.Random(1)
+    inicio = datetime(2024, 1, 1)
+    filas = []
+    for i in range(args.n):
+        fecha = inicio + timedelta(minutes=rng.randrange(366 * 24 * 60))
+        filas.append((f"PED{i:07d}", f"U{rng.randrange(5000):05d}", rng.choice(TIPOS),
+                      fecha, round(rng.uniform(0.5, 30), 2), 'entregado',
+                      [f"P{rng.randrange(args.productos):04d}" for _ in range(rng.randint(1, 4))]))
+    campos = ('id', 'usuario', 'tipo', 'fecha', 'total', 'estado', 'productos')
+
+    def cargar_dicts():
+        return [dict(zip(campos, fila)) for fila in filas]
+
+    def cargar_almacen():
+        almacen = AlmacenPedidos()
+        almacen.agregar_lote(filas)
+        return almacen
+
+    pedidos = cargar_dicts()
+    almacen = cargar_almacen()
+
+    def unidades(desde=None, hasta=None):
+        conteo = {}
+        for pedido in pedidos:
+            if (desde is None or pedido['fecha'] >= desde) and (hasta is None or pedido['fecha'] <= hasta):
+                for pid in pedido['productos']:
+                    conteo[pid] = conteo.get(pid, 0) + 1
+        return conteo
+
+    def por_hora():
+        cantidades = [0] * 24
+        for pedido in pedidos:
+            cantidades[pedido['fecha'].hour] += 1
+        return cantidades
+
+    def por_tipo():
+        conteo = {}
+        for pedido in pedidos:
+            conteo[pedido['tipo']] = conteo.get(pedido['tipo'], 0) + 1
+        return conteo
+
+    desde_q2, hasta_q2 = datetime(2024, 4, 1), datetime(2024, 6, 30, 23, 59)
+    casos = [
+        ('unidades por producto', unidades, almacen.unidades_por_producto),
+        ('pedidos por hora', por_hora, lambda: list(almacen.ventas_por_hora()[0])),
+        ('pedidos por tipo', por_tipo,
+         lambda: {t: d['pedidos'] for t, d in almacen.ventas_por_tipo().items()}),
+        ('unidades en Q2', lambda: unidades(desde_q2, hasta_q2),
+         lambda: almacen.unidades_por_producto(desde_q2, hasta_q2)),
+    ]
+
+    comun.imprimir_fila(f"n={args.n}", 'dicts (ms)', 'almacén (ms)', 'aceleración')
+    for etiqueta, lento_fn, rapido_fn in casos:
+        lento, esperado = comun.medir(lento_fn)
+        rapido, obtenido = comun.medir(rapido_fn)
+        assert obtenido == esperado
+        comun.imprimir_fila(etiqueta, f"{lento * 1e3:.2f}", f"{rapido * 1e3:.2f}",
+                            f"{lento / rapido:.1f}x")
+
+    lento, _ = comun.medir(cargar_dicts)
+    rapido, _ = comun.medir(cargar_almacen)
+    comun.imprimir_fila('carga en bloque', f"{lento * 1e3:.2f}", f"{rapido * 1e3:.2f}",
+                        f"{lento / rapido:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+user-001: ArbolBST sin balancear frente a AVL con inserciones ordenadas.
+
+Mide altura, tiempo de inserción y consultas de rango de 50 claves.
+El árbol sin balancear degenera en lista: con --n grande tarda minutos.
+"""
+import argparse
+import random
+
+import comun
+from estructuras.arbol_bst import ArbolBST
+
+
+def escenario(n, balanceado, ordenado, consultas=200):
+    claves = list(range(n))
+    if not ordenado:
+        random.Random(1).shuffle(claves)
+    arbol = ArbolBST(balanceado=balanceado)
+
+    def insertar():
+        for clave in claves:
+            arbol.insertar(clave, clave)
+
+    tiempo_insercion, _ = comun.medir(insertar, repeticiones=1)
+    inicios = [random.Random(2).randrange(max(1, n - 50)) for _ in range(consultas)]
+
+    def consultar():
+        for inicio in inicios:
+            arbol.buscar_rango(inicio, inicio + 49)
+
+    tiempo_consultas, _ = comun.medir(consultar)
+    return arbol.obtener_altura(), tiempo_insercion, tiempo_consultas / consultas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--n', type=int, default=10000)
+    parser.add_argument('--sin-balancear', action='store_true',
+                        help='incluye el árbol sin balancear (lento con n grande)')
+    args = parser.parse_args()
+
+    comun.imprimir_fila('escenario', 'altura', 'insertar (s)', 'rango (us)')
+    casos = [('AVL ordenado', True, True), ('AVL aleatorio', True, False)]
+    if args.sin_balancear:
+        casos.insert(0, ('sin balancear ordenado', False, True))
+    for etiqueta, balanceado, ordenado in casos:
+        altura, insercion, consulta = escenario(args.n, balanceado, ordenado)
+        comun.imprimir_fila(f"{etiqueta} n={args.n}", altura,
+                            f"{insercion:.3f}", f"{consulta * 1e6:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+user-020: listar productos de 1, 5 y 20 categorías (solo disponibles)
+recorriendo el catálogo frente a IndiceCategorias.
+
+--n productos repartidos en --categorias categorías, 80% disponibles.
+"""
+import argparse
+import random
+
+import comun
+from estructuras.indice_categorias import IndiceCategorias, normalizar_categoria
+
+
+class Producto:
+    __slots__ = ('id', 'categoria', 'disponible')
+
+    def __init__(self, producto_id, categoria, disponible):
+        self.id = producto_id
+        self.categoria = categoria
+        self.disponible = disponible
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--n', type=int, default=100000)
+    parser.add_argument('--categorias', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    nombres = [f'Categoría {i}' for i in range(args.categorias)]
+    catalogo = [Producto(f'P{i:06d}', rng.choice(nombres), rng.random() < 0.8)
+                for i in range(args.n)]
+    indice = IndiceCategorias()
+    for producto in catalogo:
+        indice.agregar(producto.id, producto.categoria, producto.disponible, producto)
+
+    def recorriendo(pedidas):
+        buscadas = {normalizar_categoria(c) for c in pedidas}
+        return [p for p in catalogo
+                if p.disponible and normalizar_categoria(p.categoria) in buscadas]
+
+    comun.imprimir_fila(f"n={args.n}", 'resultados', 'recorrido (ms)', 'índice (ms)')
+    for cantidad in (1, 5, 20):
+        pedidas = rng.sample(nombres, cantidad)
+        lento, esperado = comun.medir(lambda: recorriendo(pedidas))
+        rapido, obtenido = comun.medir(lambda: indice.buscar(pedidas, solo_disponibles=True))
+        assert obtenido == esperado
+        comun.imprimir_fila(f"{cantidad} categorías", len(obtenido),
+                            f"{lento * 1e3:.2f}", f"{rapido * 1e3:.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+user-006: cancelar/cambiar_prioridad con borrado perezoso frente a
+reconstruir el heap (filtrar + heapify) en cada operación.
+"""
+import argparse
+import heapq
+import random
+
+import comun
+from estructuras.cola_prioridad import ColaPrioridad
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--n', type=int, default=100000)
+    parser.add_argument('--operaciones', type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    ids = [f'id{i}' for i in range(args.n)]
+    objetivos = rng.sample(ids, args.operaciones)
+
+    def nueva_cola():
+        cola = ColaPrioridad()
+        cola.agregar_lote((rng.randint(1, 3), i, pedido_id) for i, pedido_id in enumerate(ids))
+        return cola
+
+    colas = [nueva_cola() for _ in range(3)]
+
+    def perezoso():
+        cola = colas.pop()
+        for i, pedido_id in enumerate(objetivos):
+            if i % 2:
+                cola.cancelar(pedido_id)
+            else:
+                cola.cambiar_prioridad(pedido_id, 1)
+        return cola
+
+    def reconstruir(heap, operaciones=20):
+        for pedido_id in objetivos[:operaciones]:
+            heap = [e for e in heap if e[2] != pedido_id]
+            heapq.heapify(heap)
+        return heap
+
+    tiempo, cola = comun.medir(perezoso)
+    heap = list(cola.heap)
+    tiempo_reconstruir, _ = comun.medir(lambda: reconstruir(heap), repeticiones=1)
+
+    comun.imprimir_fila(f"n={args.n}", 'por operación')
+    comun.imprimir_fila('cancelar/cambiar_prioridad', f"{tiempo / args.operaciones * 1e6:.1f} us")
+    comun.imprimir_fila('filtrar + heapify',
+                        f"{tiempo_reconstruir / 20 * 1e3:.1f} ms")
+    print(cola.obtener_estadisticas())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+user-009: agregar en un bucle frente a agregar_lote (heapify en O(n + m)).
+"""
+import argparse
+import random
+
+import comun
+from estructuras.cola_prioridad import ColaPrioridad
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--n', type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    pedidos = [(rng.randint(1, 3), i, f'id{i}') for i in range(args.n)]
+
+    def en_bucle():
+        cola = ColaPrioridad()
+        for prioridad, pedido, pedido_id in pedidos:
+            cola.agregar(prioridad, pedido, pedido_id)
+        return cola
+
+    def en_lote():
+        cola = ColaPrioridad()
+        cola.agregar_lote(pedidos)
+        return cola
+
+    def fusion():
+        destino = ColaPrioridad()
+        destino.agregar_lote(pedidos[:args.n // 2])
+        origen = ColaPrioridad()
+        origen.agregar_lote(pedidos[args.n // 2:])
+        return destino.fusionar(origen)
+
+    comun.imprimir_fila(f"n={args.n}", 'tiempo (ms)')
+    for etiqueta, funcion in (('agregar en bucle', en_bucle), ('agregar_lote', en_lote),
+                              ('dos lotes + fusionar', fusion)):
+        tiempo, _ = comun.medir(funcion)
+        comun.imprimir_fila(etiqueta, f"{tiempo * 1e3:.0f}")
+
+
+if __name__ == '__main__':
+    main()
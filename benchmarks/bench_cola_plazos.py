@@ -0,0 +1,73 @@
+"""
+user-007: prioridad estricta frente a plazos (earliest deadline first).
+
+Simula --ticks segundos con una cocina que atiende un pedido por tick.
+Cada cuarto bloque de --bloque ticks llega una ráfaga de profesores que
+por sí sola supera la capacidad. Imprime p50/p99/máx de espera por nivel.
+"""
+import argparse
+import random
+
+import comun
+from estructuras.cola_prioridad import ColaPrioridad
+
+NIVELES = {1: 'profesor', 2: 'staff', 3: 'estudiante'}
+
+
+class Reloj:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+def llegadas(ticks, bloque, semilla=1):
+    # Lista por tick de las prioridades que llegan; igual para ambos modos
+    rng = random.Random(semilla)
+    por_tick = []
+    for tick in range(ticks):
+        rafaga = (tick // bloque) % 4 == 3
+        llegan = []
+        if rng.random() < (0.9 if rafaga else 0.05):
+            llegan.append(1)
+        if rng.random() < 0.15:
+            llegan.append(2)
+        if rng.random() < 0.3:
+            llegan.append(3)
+        por_tick.append(llegan)
+    return por_tick
+
+
+def simular(por_tick, esperas_maximas):
+    reloj = Reloj()
+    cola = ColaPrioridad(esperas_maximas=esperas_maximas, reloj=reloj)
+    for tick, llegan in enumerate(por_tick):
+        reloj.ahora = tick
+        for prioridad in llegan:
+            cola.agregar(prioridad, None)
+        cola.atender_siguiente()
+    return cola.estadisticas_espera(), cola.tamanio()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--ticks', type=int, default=60000)
+    parser.add_argument('--bloque', type=int, default=200)
+    parser.add_argument('--plazos', type=int, nargs=3, default=[30, 60, 120],
+                        metavar=('PROFESOR', 'STAFF', 'ESTUDIANTE'))
+    args = parser.parse_args()
+
+    por_tick = llegadas(args.ticks, args.bloque)
+    modos = [('estricto', None), ('plazos', dict(zip((1, 2, 3), args.plazos)))]
+    comun.imprimir_fila('modo / nivel', 'p50 (s)', 'p99 (s)', 'máx (s)')
+    for modo, esperas_maximas in modos:
+        esperas, pendientes = simular(por_tick, esperas_maximas)
+        for prioridad, datos in esperas.items():
+            comun.imprimir_fila(f"{modo} {NIVELES[prioridad]}", f"{datos['p50']:.1f}",
+                                f"{datos['p99']:.1f}", f"{datos['max']:.1f}")
+        print(f"{modo}: {pendientes} pedidos sin atender al final")
+
+
+if __name__ == '__main__':
+    main()
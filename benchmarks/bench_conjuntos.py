@@ -0,0 +1,40 @@
+"""
+user-016: operaciones encadenadas (union/interseccion/diferencia, que
+materializan cada paso) frente a la expresión perezosa (a | b) & c - d.
+
+Cuatro conjuntos de --tamanio elementos sobre --universo valores; luego
+el mismo cálculo con c reducido a --chico elementos.
+"""
+import argparse
+import random
+
+import comun
+from estructuras.conjunto import ConjuntoPersonalizado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tamanio', type=int, default=50000)
+    parser.add_argument('--universo', type=int, default=200000)
+    parser.add_argument('--chico', type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+
+    def conjunto(tamanio):
+        return ConjuntoPersonalizado(rng.sample(range(args.universo), tamanio))
+
+    a, b, c, d = (conjunto(args.tamanio) for _ in range(4))
+    c_chico = conjunto(args.chico)
+
+    comun.imprimir_fila('escenario', 'encadenado (ms)', 'perezoso (ms)')
+    for etiqueta, tercero in ((f'c de {args.tamanio}', c), (f'c de {args.chico}', c_chico)):
+        encadenado, esperado = comun.medir(
+            lambda: a.union(b).interseccion(tercero).diferencia(d).tamanio())
+        perezoso, obtenido = comun.medir(lambda: len((a | b) & tercero - d))
+        assert esperado == obtenido
+        comun.imprimir_fila(etiqueta, f"{encadenado * 1e3:.2f}", f"{perezoso * 1e3:.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+user-004: buscar_rango completo frente al cursor perezoso iter_rango.
+
+Sobre un árbol balanceado de --n claves pide una página de 20 filas que
+cubre todo el árbol y mide tiempo y pico de memoria con tracemalloc.
+"""
+import argparse
+import time
+import tracemalloc
+from itertools import islice
+
+import comun
+from estructuras.arbol_bst import ArbolBST
+
+
+def medir_con_memoria(funcion):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    funcion()
+    transcurrido = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return transcurrido, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--n', type=int, default=1000000)
+    args = parser.parse_args()
+
+    arbol = ArbolBST(balanceado=True)
+    arbol.construir_desde_ordenados((i, i) for i in range(args.n))
+
+    casos = [
+        ('buscar_rango()[:20]', lambda: arbol.buscar_rango(0, args.n)[:20]),
+        ('iter_rango(limite=20)', lambda: list(arbol.iter_rango(0, args.n, limite=20))),
+        ('primer resultado', lambda: next(arbol.iter_rango(0, args.n))),
+        ('pagina_rango(limite=20)', lambda: arbol.pagina_rango(0, args.n, limite=20)),
+        ('islice(iter_rango(), 20)', lambda: list(islice(arbol.iter_rango(), 20))),
+    ]
+    comun.imprimir_fila(f"n={args.n}", 'tiempo (ms)', 'pico (KB)')
+    for etiqueta, funcion in casos:
+        tiempo, pico = medir_con_memoria(funcion)
+        comun.imprimir_fila(etiqueta, f"{tiempo * 1e3:.3f}", f"{pico / 1024:.1f}")
+
+
+if __name__ == '__main__':
+    main()
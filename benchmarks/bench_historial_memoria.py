@@ -0,0 +1,71 @@
+"""
+user-011: memoria de la estructura del historial con tracemalloc.
+
+--n entradas que comparten un mismo dict de carga, así que solo se mide
+la sobrecarga de la estructura: nodo con __dict__, nodo con __slots__
+(ListaEnlazada) y ListaDesenrollada. También mide obtener_en_posicion
+cerca del final.
+"""
+import argparse
+import tracemalloc
+
+import comun
+from estructuras.lista_desenrollada import ListaDesenrollada
+from estructuras.lista_enlazada import ListaEnlazada
+
+
+class NodoConDict:
+    def __init__(self, dato):
+        self.dato = dato
+        self.siguiente = None
+
+
+class ListaConDict:
+    def __init__(self):
+        self.cabeza = None
+        self.cola = None
+
+    def agregar_al_final(self, dato):
+        nodo = NodoConDict(dato)
+        if self.cola is None:
+            self.cabeza = nodo
+        else:
+            self.cola.siguiente = nodo
+        self.cola = nodo
+
+
+def memoria(fabrica, n, carga):
+    tracemalloc.start()
+    lista = fabrica()
+    for _ in range(n):
+        lista.agregar_al_final(carga)
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return actual, lista
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--n', type=int, default=1000000)
+    parser.add_argument('--bloque', type=int, default=64)
+    args = parser.parse_args()
+
+    carga = {'pedido_id': 'PED00001', 'total': 4.5, 'estado': 'entregado'}
+    casos = [
+        ('nodo con __dict__', ListaConDict),
+        ('ListaEnlazada (__slots__)', ListaEnlazada),
+        (f'ListaDesenrollada (B={args.bloque})', lambda: ListaDesenrollada(args.bloque)),
+    ]
+    comun.imprimir_fila(f"n={args.n}", 'memoria (MB)', 'posición (ms)')
+    for etiqueta, fabrica in casos:
+        bytes_usados, lista = memoria(fabrica, args.n, carga)
+        if hasattr(lista, 'obtener_en_posicion'):
+            tiempo, _ = comun.medir(lambda: lista.obtener_en_posicion(args.n - 10))
+            posicion = f"{tiempo * 1e3:.1f}"
+        else:
+            posicion = '-'
+        comun.imprimir_fila(etiqueta, f"{bytes_usados / 2 ** 20:.1f}", posicion)
+
+
+if __name__ == '__main__':
+    main()
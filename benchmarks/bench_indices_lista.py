@@ -0,0 +1,51 @@
+"""
+user-013: índices de fecha y de estado de ListaEnlazada frente a
+buscar(lambda) sobre una lista de --n pedidos.
+"""
+import argparse
+import random
+from datetime import date, timedelta
+
+import comun
+from estructuras.lista_enlazada import ListaEnlazada
+
+
+def pedidos(n, semilla=1):
+    rng = random.Random(semilla)
+    inicio = date(2026, 1, 1)
+    for i in range(n):
+        yield {
+            'id': f'PED{i:06d}',
+            'fecha': (inicio + timedelta(days=rng.randrange(365))).isoformat(),
+            'estado': rng.choice(['pendiente', 'preparando', 'listo', 'entregado'] + ['entregado'] * 6),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--n', type=int, default=100000)
+    args = parser.parse_args()
+
+    indexada = ListaEnlazada(campo_fecha='fecha', campos_indexados=('estado',))
+    simple = ListaEnlazada()
+    for pedido in pedidos(args.n):
+        indexada.agregar_al_final(pedido)
+        simple.agregar_al_final(pedido)
+
+    desde, hasta = '2026-06-01', '2026-06-03'
+    casos = [
+        ('rango de 3 días', lambda lista: lista.buscar_por_rango_fecha(desde, hasta),
+         lambda lista: lista.buscar(lambda p: desde <= p['fecha'] <= hasta)),
+        ("estado == 'pendiente'", lambda lista: lista.buscar_por_campo('estado', 'pendiente'),
+         lambda lista: lista.buscar(lambda p: p['estado'] == 'pendiente')),
+    ]
+    comun.imprimir_fila(f"n={args.n}", 'indexado (ms)', 'buscar (ms)')
+    for etiqueta, con_indice, recorriendo in casos:
+        rapido, encontrados = comun.medir(lambda: con_indice(indexada), repeticiones=5)
+        lento, esperados = comun.medir(lambda: recorriendo(simple))
+        assert len(encontrados) == len(esperados)
+        comun.imprimir_fila(etiqueta, f"{rapido * 1e3:.3f}", f"{lento * 1e3:.1f}")
+
+
+if __name__ == '__main__':
+    main()
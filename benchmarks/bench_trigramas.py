@@ -0,0 +1,59 @@
+"""
+user-017: búsqueda por subcadena con IndiceTrigramas frente a un
+recorrido lineal sobre --n nombres de producto generados.
+
+Consultas selectivas, de dos palabras y de una palabra común; reporta
+p50/p99 por tipo de consulta.
+"""
+import argparse
+import random
+import time
+
+import comun
+from estructuras.indice_trigramas import IndiceTrigramas, normalizar_texto
+
+BASES = ['Café', 'Té', 'Jugo', 'Sándwich', 'Torta', 'Medialuna', 'Muffin', 'Ensalada',
+         'Tostado', 'Licuado', 'Budín', 'Alfajor', 'Empanada', 'Pizza', 'Yogur']
+VARIANTES = ['de naranja', 'de jamón y queso', 'con leche', 'verde', 'de chocolate',
+             'integral', 'de frutilla', 'sin azúcar', 'de pollo', 'de vainilla',
+             'grande', 'chico', 'de manzana', 'de limón', 'doble']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--n', type=int, default=100000)
+    parser.add_argument('--repeticiones', type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    nombres = [f"{rng.choice(BASES)} {rng.choice(VARIANTES)} {rng.choice(VARIANTES)} #{i:06d}"
+               for i in range(args.n)]
+    indice = IndiceTrigramas()
+    for i, nombre in enumerate(nombres):
+        indice.agregar(i, nombre)
+    normalizados = [normalizar_texto(nombre) for nombre in nombres]
+
+    def lineal(consulta):
+        consulta = normalizar_texto(consulta)
+        return [i for i, texto in enumerate(normalizados) if consulta in texto]
+
+    consultas = [
+        ('selectiva (un resultado)', f"#{args.n // 2:06d}"),
+        ('dos palabras', 'budin de limon'),
+        ('palabra común', 'chocolate'),
+    ]
+    comun.imprimir_fila(f"n={args.n}", 'resultados', 'p50 (ms)', 'p99 (ms)')
+    for etiqueta, consulta in consultas:
+        for nombre_metodo, buscar in (('índice', indice.buscar), ('lineal', lineal)):
+            tiempos = []
+            for _ in range(args.repeticiones):
+                inicio = time.perf_counter()
+                resultados = buscar(consulta)
+                tiempos.append(time.perf_counter() - inicio)
+            p50, p99 = comun.percentiles(tiempos, 50, 99)
+            comun.imprimir_fila(f"{etiqueta} [{nombre_metodo}]", len(resultados),
+                                f"{p50 * 1e3:.2f}", f"{p99 * 1e3:.2f}")
+
+
+if __name__ == '__main__':
+    main()
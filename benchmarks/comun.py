@@ -0,0 +1,49 @@
+"""
+Utilidades compartidas por los scripts de benchmarks/.
+
+Cada script se ejecuta desde la raíz del repositorio, por ejemplo:
+
+    python benchmarks/bench_arbol_avl.py
+
+y acepta --n para reducir o ampliar el tamaño del escenario.
+"""
+import importlib.util
+import sys
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+# Igual que tests/conftest.py: los módulos se importan como `estructuras.*`
+if 'estructuras' not in sys.modules:
+    if RAIZ.name == 'estructuras':
+        sys.path.insert(0, str(RAIZ.parent))
+    else:
+        spec = importlib.util.spec_from_file_location(
+            'estructuras', RAIZ / '__init__.py', submodule_search_locations=[str(RAIZ)])
+        paquete = importlib.util.module_from_spec(spec)
+        sys.modules['estructuras'] = paquete
+        spec.loader.exec_module(paquete)
+
+
+def medir(funcion, repeticiones=3):
+    # Mejor tiempo (segundos) de varias ejecuciones y el último resultado
+    mejor = None
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        transcurrido = time.perf_counter() - inicio
+        if mejor is None or transcurrido < mejor:
+            mejor = transcurrido
+    return mejor, resultado
+
+
+def percentiles(tiempos, *ps):
+    ordenados = sorted(tiempos)
+    n = len(ordenados)
+    return [ordenados[(n - 1) * p // 100] for p in ps]
+
+
+def imprimir_fila(etiqueta, *columnas):
+    print(f"{etiqueta:<40}" + "".join(f"{c:>16}" for c in columnas))
@@ -0,0 +1,120 @@
+import threading
+
+from .cola_prioridad import ColaPrioridad
+
+
+class ColaPrioridadBloqueante:
+    # Envoltura thread-safe de ColaPrioridad: todas las operaciones pasan por
+    # la misma condición, y get() bloquea hasta que haya un pedido.
+    def __init__(self, cola=None):
+        self.cola = cola if cola is not None else ColaPrioridad()
+        self.condicion = threading.Condition()
+        self.cerrada = False
+
+    def put(self, prioridad, pedido, pedido_id=None):
+        with self.condicion:
+            if self.cerrada:
+                return None
+            pedido_id = self.cola.agregar(prioridad, pedido, pedido_id)
+            if pedido_id is not None:
+                self.condicion.notify()
+            return pedido_id
+
+    def put_lote(self, pedidos):
+        with self.condicion:
+            if self.cerrada:
+                return None
+            resultado = self.cola.agregar_lote(pedidos)
+            self.condicion.notify(len(resultado['agregados']))
+            return resultado
+
+    def get(self, timeout=None):
+        # Devuelve None si vence el timeout o si la cola se cerró y quedó vacía
+        with self.condicion:
+            self.condicion.wait_for(
+                lambda: not self.cola.esta_vacia() or self.cerrada,
+                timeout
+            )
+            return self.cola.atender_siguiente()
+
+    def cancelar(self, pedido_id):
+        with self.condicion:
+            return self.cola.cancelar(pedido_id)
+
+    def cambiar_prioridad(self, pedido_id, nueva_prioridad):
+        with self.condicion:
+            return self.cola.cambiar_prioridad(pedido_id, nueva_prioridad)
+
+    def cerrar(self):
+        with self.condicion:
+            self.cerrada = True
+            self.condicion.notify_all()
+
+    def tamanio(self):
+        with self.condicion:
+            return self.cola.tamanio()
+
+    def __len__(self):
+        return self.tamanio()
+
+
+class EstacionesCocina:
+    # Pool de estaciones (hilos) que consumen una ColaPrioridadBloqueante.
+    # `procesar(item, estacion)` recibe el dict de atender_siguiente y el
+    # nombre de la estación; debe sincronizar por su cuenta el estado compartido.
+    def __init__(self, cola, procesar, num_estaciones=3, intervalo_espera=0.5):
+        self.cola = cola
+        self.procesar = procesar
+        self.num_estaciones = num_estaciones
+        self.intervalo_espera = intervalo_espera
+        self.hilos = []
+        self.procesados = {}
+        self.errores = []
+        self._lock = threading.Lock()
+        self._detener = threading.Event()
+
+    def iniciar(self):
+        if self.hilos:
+            return False
+        self._detener.clear()
+        for i in range(1, self.num_estaciones + 1):
+            nombre = f"Estacion-{i}"
+            self.procesados[nombre] = 0
+            hilo = threading.Thread(target=self._trabajar, args=(nombre,), name=nombre, daemon=True)
+            self.hilos.append(hilo)
+            hilo.start()
+        return True
+
+    def _trabajar(self, estacion):
+        while not self._detener.is_set():
+            item = self.cola.get(timeout=self.intervalo_espera)
+            if item is None:
+                if self.cola.cerrada:
+                    return
+                continue
+            try:
+                self.procesar(item, estacion)
+            except Exception as e:
+                with self._lock:
+                    self.errores.append((item['id'], e))
+            else:
+                with self._lock:
+                    self.procesados[estacion] += 1
+
+    def detener(self, vaciar=True):
+        # Con vaciar=True se cierra la cola y se atiende lo pendiente antes
+        # de terminar; con vaciar=False las estaciones paran tras el pedido actual.
+        if vaciar:
+            self.cola.cerrar()
+        else:
+            self._detener.set()
+        for hilo in self.hilos:
+            hilo.join()
+        self.hilos = []
+
+    def esta_activo(self):
+        return bool(self.hilos)
+
+    def total_procesados(self):
+        with self._lock:
+            return sum(self.procesados.values())
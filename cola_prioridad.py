@@ -1,63 +1,236 @@
 import heapq
+import time
+from collections import deque
+from itertools import islice
+
+
+# Marca de entrada cancelada (borrado perezoso dentro del heap)
+_ELIMINADO = object()
 
 
 class ColaPrioridad:
-    def __init__(self):
+    # Cada entrada del heap es [orden, contador, id, pedido, prioridad, llegada].
+    # En modo estricto `orden` es la prioridad. Con `esperas_maximas`
+    # ({prioridad: segundos}) `orden` es el plazo llegada + espera máxima del
+    # nivel (earliest deadline first): un pedido envejece hasta adelantar a
+    # los de mayor prioridad llegados mucho después, sin reordenar el heap.
+    def __init__(self, esperas_maximas=None, reloj=time.monotonic, muestras_espera=10000):
         self.heap = []
         self.contador = 0
         self._id_map = {}
-    
-    def agregar(self, prioridad, pedido, pedido_id=None):
+        self._eliminados = 0
+        self._compactaciones = 0
+        self.esperas_maximas = esperas_maximas
+        self.reloj = reloj
+        self._esperas = {}
+        self._muestras_espera = muestras_espera
+
+    def _clave_orden(self, prioridad, llegada):
+        if not self.esperas_maximas:
+            return prioridad
+        espera = self.esperas_maximas.get(prioridad)
+        if espera is None:
+            espera = max(self.esperas_maximas.values())
+        return llegada + espera
+
+    def agregar(self, prioridad, pedido, pedido_id=None, llegada=None):
+        # Igual que en agregar_lote, un ID ya presente se rechaza (None)
         if pedido_id is None:
             pedido_id = f"P{self.contador}"
-        
-        entrada = [prioridad, self.contador, pedido_id, pedido]
-        heapq.heappush(self.heap, entrada)
+        if pedido_id in self._id_map:
+            return None
+        if llegada is None:
+            llegada = self.reloj()
+
+        heapq.heappush(self.heap, self._nueva_entrada(prioridad, pedido, pedido_id, llegada))
+        return pedido_id
+
+    def _nueva_entrada(self, prioridad, pedido, pedido_id, llegada):
+        entrada = [self._clave_orden(prioridad, llegada), self.contador,
+                   pedido_id, pedido, prioridad, llegada]
         self._id_map[pedido_id] = entrada
         self.contador += 1
-        
-        return pedido_id
-    
+        return entrada
+
+    def agregar_lote(self, pedidos):
+        # `pedidos` es un iterable de (prioridad, pedido) o
+        # (prioridad, pedido, pedido_id). Los IDs ya presentes (en la cola o
+        # antes en el mismo lote) se omiten y se informan en "rechazados".
+        llegada = self.reloj()
+        nuevas = []
+        rechazados = []
+        for item in pedidos:
+            prioridad, pedido = item[0], item[1]
+            pedido_id = item[2] if len(item) > 2 else None
+            if pedido_id is None:
+                pedido_id = f"P{self.contador}"
+            if pedido_id in self._id_map:
+                rechazados.append(pedido_id)
+                continue
+            nuevas.append(self._nueva_entrada(prioridad, pedido, pedido_id, llegada))
+
+        self._insertar_entradas(nuevas)
+        return {
+            'agregados': [entrada[2] for entrada in nuevas],
+            'rechazados': rechazados
+        }
+
+    def fusionar(self, otra_cola):
+        # Copia los pedidos vivos de otra cola conservando su orden de
+        # llegada relativo; `otra_cola` no se modifica.
+        vivas = sorted(
+            (e for e in otra_cola.heap if e[3] is not _ELIMINADO),
+            key=lambda e: e[1]
+        )
+        nuevas = []
+        rechazados = []
+        for _, _, pedido_id, pedido, prioridad, llegada in vivas:
+            if pedido_id in self._id_map:
+                rechazados.append(pedido_id)
+                continue
+            nuevas.append(self._nueva_entrada(prioridad, pedido, pedido_id, llegada))
+
+        self._insertar_entradas(nuevas)
+        return {
+            'agregados': [entrada[2] for entrada in nuevas],
+            'rechazados': rechazados
+        }
+
+    def _insertar_entradas(self, nuevas):
+        # heapify es O(n + m); para lotes pequeños frente a la cola resulta
+        # más barato hacer m inserciones de O(log n).
+        if len(nuevas) * 8 < len(self.heap):
+            for entrada in nuevas:
+                heapq.heappush(self.heap, entrada)
+        else:
+            self.heap.extend(nuevas)
+            heapq.heapify(self.heap)
+
     def atender_siguiente(self):
+        self._descartar_eliminados_del_tope()
         if self.esta_vacia():
             return None
-        
-        prioridad, _, pedido_id, pedido = heapq.heappop(self.heap)
+
+        _, _, pedido_id, pedido, prioridad, llegada = heapq.heappop(self.heap)
         self._id_map.pop(pedido_id, None)
-        
+        self._registrar_espera(prioridad, self.reloj() - llegada)
+
         return {
             'prioridad': prioridad,
             'id': pedido_id,
             'pedido': pedido
         }
-    
+
     def ver_siguiente(self):
+        self._descartar_eliminados_del_tope()
         if self.esta_vacia():
             return None
-        
-        prioridad, _, pedido_id, pedido = self.heap[0]
+
+        _, _, pedido_id, pedido, prioridad, _ = self.heap[0]
         return {
             'prioridad': prioridad,
             'id': pedido_id,
             'pedido': pedido
         }
-    
+
     def buscar_por_id(self, pedido_id):
         entrada = self._id_map.get(pedido_id)
         if entrada:
             return {
-                'prioridad': entrada[0],
+                'prioridad': entrada[4],
                 'id': entrada[2],
                 'pedido': entrada[3]
             }
         return None
-    
+
+    def cancelar(self, pedido_id):
+        # O(log n) amortizado: la entrada queda marcada y se descarta al
+        # llegar al tope o en la próxima compactación.
+        entrada = self._id_map.pop(pedido_id, None)
+        if entrada is None:
+            return None
+
+        cancelado = {
+            'prioridad': entrada[4],
+            'id': entrada[2],
+            'pedido': entrada[3]
+        }
+        entrada[3] = _ELIMINADO
+        self._eliminados += 1
+        self._compactar_si_conviene()
+        return cancelado
+
+    def cambiar_prioridad(self, pedido_id, nueva_prioridad):
+        # En modo estricto el pedido pasa al final de su nuevo nivel; con
+        # plazos conserva su hora de llegada original.
+        entrada = self._id_map.get(pedido_id)
+        if entrada is None:
+            return False
+        if entrada[4] == nueva_prioridad:
+            return True
+
+        pedido, llegada = entrada[3], entrada[5]
+        self.cancelar(pedido_id)
+        self.agregar(nueva_prioridad, pedido, pedido_id, llegada)
+        return True
+
+    def _descartar_eliminados_del_tope(self):
+        while self.heap and self.heap[0][3] is _ELIMINADO:
+            heapq.heappop(self.heap)
+            self._eliminados -= 1
+
+    def _compactar_si_conviene(self):
+        if self._eliminados > 32 and self._eliminados * 2 > len(self.heap):
+            self.heap = [e for e in self.heap if e[3] is not _ELIMINADO]
+            heapq.heapify(self.heap)
+            self._eliminados = 0
+            self._compactaciones += 1
+
+    def _registrar_espera(self, prioridad, espera):
+        muestras = self._esperas.get(prioridad)
+        if muestras is None:
+            muestras = self._esperas[prioridad] = deque(maxlen=self._muestras_espera)
+        muestras.append(espera)
+
+    def copiar_muestras_espera(self):
+        # Copia O(n) de las muestras por nivel: quien comparte la cola entre
+        # hilos la toma bajo el candado y ordena fuera de él.
+        return {prioridad: list(muestras) for prioridad, muestras in self._esperas.items()}
+
+    def estadisticas_espera(self, muestras_por_nivel=None):
+        # p50/p95/p99 de espera por nivel sobre las últimas muestras atendidas
+        # (o sobre una copia tomada antes con copiar_muestras_espera)
+        if muestras_por_nivel is None:
+            muestras_por_nivel = self._esperas
+        resultado = {}
+        for prioridad, muestras in sorted(muestras_por_nivel.items()):
+            ordenadas = sorted(muestras)
+            n = len(ordenadas)
+            resultado[prioridad] = {
+                'atendidos': n,
+                'p50': ordenadas[(n - 1) * 50 // 100],
+                'p95': ordenadas[(n - 1) * 95 // 100],
+                'p99': ordenadas[(n - 1) * 99 // 100],
+                'max': ordenadas[-1],
+                'espera_maxima': self.esperas_maximas.get(prioridad) if self.esperas_maximas else None
+            }
+        return resultado
+
+    def obtener_estadisticas(self):
+        total = len(self.heap)
+        return {
+            'activos': total - self._eliminados,
+            'eliminados': self._eliminados,
+            'ratio_eliminados': self._eliminados / total if total else 0.0,
+            'compactaciones': self._compactaciones
+        }
+
     def esta_vacia(self):
-        return len(self.heap) == 0
-    
+        return self.tamanio() == 0
+
     def tamanio(self):
-        return len(self.heap)
-    
+        return len(self.heap) - self._eliminados
+
     def ver_todos(self):
         return [
             {
@@ -65,16 +238,44 @@ class ColaPrioridad:
                 'id': pid,
                 'pedido': pedido
             }
-            for p, _, pid, pedido in sorted(self.heap)
+            for _, _, pid, pedido, p, _ in sorted(self.heap)
+            if pedido is not _ELIMINADO
         ]
-    
+
+    def iter_ordenado(self):
+        # Recorre la cola en orden de atención sin modificar el heap: un heap
+        # auxiliar de índices solo expande los hijos de lo ya entregado, así
+        # que los primeros k cuestan O(k log k). No agregar ni atender
+        # pedidos mientras se itera.
+        heap = self.heap
+        if not heap:
+            return
+        sombra = [(heap[0][0], heap[0][1], 0)]
+        while sombra:
+            _, _, i = heapq.heappop(sombra)
+            for hijo in (2 * i + 1, 2 * i + 2):
+                if hijo < len(heap):
+                    heapq.heappush(sombra, (heap[hijo][0], heap[hijo][1], hijo))
+            _, _, pedido_id, pedido, prioridad, _ = heap[i]
+            if pedido is not _ELIMINADO:
+                yield {
+                    'prioridad': prioridad,
+                    'id': pedido_id,
+                    'pedido': pedido
+                }
+
+    def ver_primeros(self, k):
+        return list(islice(self.iter_ordenado(), k))
+
     def limpiar(self):
         self.heap.clear()
         self._id_map.clear()
         self.contador = 0
-    
+        self._eliminados = 0
+        self._esperas.clear()
+
     def __len__(self):
-        return len(self.heap)
-    
+        return self.tamanio()
+
     def __str__(self):
-        return f"ColaPrioridad({len(self.heap)} pedidos)"
\ No newline at end of file
+        return f"ColaPrioridad({self.tamanio()} pedidos)"
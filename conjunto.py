@@ -1,6 +1,109 @@
-class ConjuntoPersonalizado:
+def _operando(otro):
+    if isinstance(otro, (ConjuntoPersonalizado, ExpresionConjunto)):
+        return otro
+    return ConjuntoPersonalizado(otro)
+
+
+class _AlgebraConjuntos:
+    # Operadores comunes: |, &, -, ^ devuelven una ExpresionConjunto perezosa
+    # que no crea conjuntos intermedios; se evalúa en una pasada al iterarla.
+    def __or__(self, otro):
+        return ExpresionConjunto('|', self, _operando(otro))
+    
+    def __and__(self, otro):
+        return ExpresionConjunto('&', self, _operando(otro))
+    
+    def __sub__(self, otro):
+        return ExpresionConjunto('-', self, _operando(otro))
+    
+    def __xor__(self, otro):
+        return ExpresionConjunto('^', self, _operando(otro))
+    
+    def es_subconjunto(self, otro_conjunto):
+        # Corta en el primer elemento que no está en el otro
+        otro = _operando(otro_conjunto)
+        for elemento in self:
+            if not otro.contiene(elemento):
+                return False
+        return True
+    
+    def es_disjunto(self, otro_conjunto):
+        # Recorre el lado más chico y corta en la primera coincidencia
+        otro = _operando(otro_conjunto)
+        chico, grande = (self, otro) if self.estimar_tamanio() <= otro.estimar_tamanio() else (otro, self)
+        for elemento in chico:
+            if grande.contiene(elemento):
+                return False
+        return True
+
+
+class ExpresionConjunto(_AlgebraConjuntos):
+    def __init__(self, operador, izquierdo, derecho):
+        self.operador = operador
+        self.izquierdo = izquierdo
+        self.derecho = derecho
+    
+    def contiene(self, elemento):
+        en_izq = self.izquierdo.contiene(elemento)
+        if self.operador == '|':
+            return en_izq or self.derecho.contiene(elemento)
+        if self.operador == '&':
+            return en_izq and self.derecho.contiene(elemento)
+        if self.operador == '-':
+            return en_izq and not self.derecho.contiene(elemento)
+        return en_izq != self.derecho.contiene(elemento)
+    
+    def estimar_tamanio(self):
+        # Cota superior barata, para elegir qué lado recorrer
+        izq = self.izquierdo.estimar_tamanio()
+        der = self.derecho.estimar_tamanio()
+        if self.operador == '&':
+            return min(izq, der)
+        if self.operador == '-':
+            return izq
+        return izq + der
+    
+    def __iter__(self):
+        izq, der = self.izquierdo, self.derecho
+        if self.operador == '|':
+            yield from izq
+            for elemento in der:
+                if not izq.contiene(elemento):
+                    yield elemento
+        elif self.operador == '&':
+            if der.estimar_tamanio() < izq.estimar_tamanio():
+                izq, der = der, izq
+            for elemento in izq:
+                if der.contiene(elemento):
+                    yield elemento
+        elif self.operador == '-':
+            for elemento in izq:
+                if not der.contiene(elemento):
+                    yield elemento
+        else:
+            for elemento in izq:
+                if not der.contiene(elemento):
+                    yield elemento
+            for elemento in der:
+                if not izq.contiene(elemento):
+                    yield elemento
+    
+    def tamanio(self):
+        return sum(1 for _ in self)
+    
+    def materializar(self):
+        return ConjuntoPersonalizado(self)
+    
+    def obtener_lista(self):
+        return list(self)
+    
+    def __len__(self):
+        return self.tamanio()
+
+
+class ConjuntoPersonalizado(_AlgebraConjuntos):
     def __init__(self, elementos=None):
-        self.elementos = set(elementos) if elementos else set()
+        self.elementos = set(elementos) if elementos is not None else set()
     
     def agregar(self, elemento):
         self.elementos.add(elemento)
@@ -30,6 +133,41 @@ class ConjuntoPersonalizado:
             return ConjuntoPersonalizado(self.elementos - otro_conjunto.elementos)
         return ConjuntoPersonalizado(self.elementos - set(otro_conjunto))
     
+    def __ior__(self, otro_conjunto):
+        self.elementos |= self._como_set(otro_conjunto)
+        return self
+    
+    def __iand__(self, otro_conjunto):
+        if isinstance(otro_conjunto, ExpresionConjunto):
+            self.elementos = {e for e in self.elementos if otro_conjunto.contiene(e)}
+        else:
+            self.elementos &= self._como_set(otro_conjunto)
+        return self
+    
+    def __isub__(self, otro_conjunto):
+        if isinstance(otro_conjunto, ExpresionConjunto):
+            # La expresión puede leer self.elementos: se arma el resultado
+            # antes de reemplazarlo (a -= a - b no debe mutar mientras itera)
+            self.elementos = {e for e in self.elementos if not otro_conjunto.contiene(e)}
+        else:
+            self.elementos -= self._como_set(otro_conjunto)
+        return self
+    
+    def __ixor__(self, otro_conjunto):
+        self.elementos ^= self._como_set(otro_conjunto)
+        return self
+    
+    @staticmethod
+    def _como_set(otro_conjunto):
+        if isinstance(otro_conjunto, ConjuntoPersonalizado):
+            return otro_conjunto.elementos
+        if isinstance(otro_conjunto, (set, frozenset)):
+            return otro_conjunto
+        return set(otro_conjunto)
+    
+    def estimar_tamanio(self):
+        return len(self.elementos)
+    
     def obtener_lista(self):
         return list(self.elementos)
     
@@ -0,0 +1,121 @@
+class TablaSimbolos:
+    # Universo internado: cada cadena (ingrediente, categoría, alérgeno)
+    # recibe un entero pequeño que es su posición de bit.
+    def __init__(self, simbolos=None):
+        self._indices = {}
+        self._simbolos = []
+        for simbolo in simbolos or ():
+            self.internar(simbolo)
+
+    def internar(self, simbolo):
+        indice = self._indices.get(simbolo)
+        if indice is None:
+            indice = len(self._simbolos)
+            self._indices[simbolo] = indice
+            self._simbolos.append(simbolo)
+        return indice
+
+    def indice_de(self, simbolo):
+        return self._indices.get(simbolo)
+
+    def simbolo(self, indice):
+        return self._simbolos[indice]
+
+    def mascara_de(self, simbolos):
+        mascara = 0
+        for simbolo in simbolos:
+            mascara |= 1 << self.internar(simbolo)
+        return mascara
+
+    def simbolos_de(self, mascara):
+        resultado = []
+        while mascara:
+            bit = mascara & -mascara
+            resultado.append(self._simbolos[bit.bit_length() - 1])
+            mascara ^= bit
+        return resultado
+
+    def __len__(self):
+        return len(self._simbolos)
+
+    def __contains__(self, simbolo):
+        return simbolo in self._indices
+
+
+class ConjuntoBits:
+    # Conjunto sobre un universo internado guardado como máscara de bits
+    # (int de Python): pertenencia, intersección y disyunción son operaciones
+    # enteras, sin crear sets intermedios.
+    def __init__(self, universo, elementos=None, mascara=0):
+        self.universo = universo
+        self.mascara = mascara
+        if elementos:
+            self.mascara |= universo.mascara_de(elementos)
+
+    def _mascara_de(self, otro):
+        if isinstance(otro, ConjuntoBits):
+            if otro.universo is not self.universo:
+                raise ValueError("Los conjuntos pertenecen a universos distintos")
+            return otro.mascara
+        return self.universo.mascara_de(otro)
+
+    def agregar(self, elemento):
+        self.mascara |= 1 << self.universo.internar(elemento)
+        return True
+
+    def eliminar(self, elemento):
+        indice = self.universo.indice_de(elemento)
+        if indice is None or not self.mascara >> indice & 1:
+            return False
+        self.mascara &= ~(1 << indice)
+        return True
+
+    def contiene(self, elemento):
+        indice = self.universo.indice_de(elemento)
+        return indice is not None and bool(self.mascara >> indice & 1)
+
+    def union(self, otro_conjunto):
+        return ConjuntoBits(self.universo, mascara=self.mascara | self._mascara_de(otro_conjunto))
+
+    def interseccion(self, otro_conjunto):
+        return ConjuntoBits(self.universo, mascara=self.mascara & self._mascara_de(otro_conjunto))
+
+    def diferencia(self, otro_conjunto):
+        return ConjuntoBits(self.universo, mascara=self.mascara & ~self._mascara_de(otro_conjunto))
+
+    def es_disjunto(self, otro_conjunto):
+        return not self.mascara & self._mascara_de(otro_conjunto)
+
+    def es_subconjunto(self, otro_conjunto):
+        return not self.mascara & ~self._mascara_de(otro_conjunto)
+
+    def obtener_lista(self):
+        return self.universo.simbolos_de(self.mascara)
+
+    def tamanio(self):
+        return bin(self.mascara).count('1')
+
+    def esta_vacio(self):
+        return self.mascara == 0
+
+    def limpiar(self):
+        self.mascara = 0
+
+    def __len__(self):
+        return self.tamanio()
+
+    def __eq__(self, otro):
+        return (isinstance(otro, ConjuntoBits) and otro.universo is self.universo
+                and otro.mascara == self.mascara)
+
+    def __str__(self):
+        if self.esta_vacio():
+            return "Conjunto(vacío)"
+        elementos = self.obtener_lista()
+        elementos_str = ', '.join(str(e) for e in elementos[:5])
+        if len(elementos) > 5:
+            elementos_str += f", ... (+{len(elementos) - 5} más)"
+        return f"Conjunto({{{elementos_str}}})"
+
+    def __iter__(self):
+        return iter(self.obtener_lista())
@@ -0,0 +1,102 @@
+import math
+
+
+class EstadisticasPorGrupo:
+    # Agregados materializados por grupo (p. ej. tipo de usuario): cantidad
+    # de miembros, total gastado y pedidos se actualizan en cada alta, baja
+    # o pedido, así que leer cualquier grupo es O(1).
+    def __init__(self):
+        self._miembros = {}    # clave -> [grupo, total, pedidos]
+        self._grupos = {}      # grupo -> {'cantidad', 'total', 'pedidos'}
+
+    def _grupo(self, grupo):
+        agregados = self._grupos.get(grupo)
+        if agregados is None:
+            agregados = self._grupos[grupo] = {'cantidad': 0, 'total': 0.0, 'pedidos': 0}
+        return agregados
+
+    def agregar(self, clave, grupo, total=0.0, pedidos=0):
+        if clave in self._miembros:
+            self.eliminar(clave)
+        self._miembros[clave] = [grupo, total, pedidos]
+        agregados = self._grupo(grupo)
+        agregados['cantidad'] += 1
+        agregados['total'] += total
+        agregados['pedidos'] += pedidos
+        return True
+
+    def eliminar(self, clave):
+        miembro = self._miembros.pop(clave, None)
+        if miembro is None:
+            return False
+        grupo, total, pedidos = miembro
+        agregados = self._grupos[grupo]
+        agregados['cantidad'] -= 1
+        agregados['total'] -= total
+        agregados['pedidos'] -= pedidos
+        if agregados['cantidad'] == 0:
+            del self._grupos[grupo]
+        return True
+
+    def registrar_pedido(self, clave, monto):
+        miembro = self._miembros.get(clave)
+        if miembro is None:
+            return False
+        miembro[1] += monto
+        miembro[2] += 1
+        agregados = self._grupos[miembro[0]]
+        agregados['total'] += monto
+        agregados['pedidos'] += 1
+        return True
+
+    @staticmethod
+    def _resumen(agregados):
+        cantidad, total, pedidos = agregados['cantidad'], agregados['total'], agregados['pedidos']
+        return {
+            'cantidad': cantidad,
+            'total_gastado': total,
+            'total_pedidos': pedidos,
+            'promedio_por_persona': total / cantidad if cantidad else 0.0,
+            'ticket_promedio': total / pedidos if pedidos else 0.0
+        }
+
+    def obtener(self, grupo):
+        return self._resumen(self._grupos.get(grupo, {'cantidad': 0, 'total': 0.0, 'pedidos': 0}))
+
+    def obtener_todos(self):
+        return {grupo: self._resumen(agregados) for grupo, agregados in self._grupos.items()}
+
+    def grupo_de(self, clave):
+        miembro = self._miembros.get(clave)
+        return miembro[0] if miembro is not None else None
+
+    def grupos(self):
+        return list(self._grupos)
+
+    def verificar(self, miembros):
+        # Recalcula desde cero con (clave, grupo, total, pedidos) y devuelve
+        # las diferencias con los agregados mantenidos (lista vacía = consistente)
+        esperado = {}
+        for _, grupo, total, pedidos in miembros:
+            agregados = esperado.setdefault(grupo, {'cantidad': 0, 'total': 0.0, 'pedidos': 0})
+            agregados['cantidad'] += 1
+            agregados['total'] += total
+            agregados['pedidos'] += pedidos
+        diferencias = []
+        for grupo in set(esperado) | set(self._grupos):
+            real = esperado.get(grupo, {'cantidad': 0, 'total': 0.0, 'pedidos': 0})
+            mantenido = self._grupos.get(grupo, {'cantidad': 0, 'total': 0.0, 'pedidos': 0})
+            for campo in ('cantidad', 'pedidos'):
+                if real[campo] != mantenido[campo]:
+                    diferencias.append(f"{grupo}.{campo}: {mantenido[campo]} != {real[campo]}")
+            # Las sumas acumuladas de floats pueden diferir en el redondeo
+            if not math.isclose(real['total'], mantenido['total'], rel_tol=1e-9, abs_tol=1e-6):
+                diferencias.append(f"{grupo}.total: {mantenido['total']:.2f} != {real['total']:.2f}")
+        return diferencias
+
+    def limpiar(self):
+        self._miembros.clear()
+        self._grupos.clear()
+
+    def __len__(self):
+        return len(self._miembros)
@@ -0,0 +1,127 @@
+import json
+import os
+from array import array
+
+
+class HistorialAcotado:
+    # Historial con los `capacidad` pedidos más recientes en un buffer
+    # circular en memoria; los más antiguos se vuelcan a un archivo JSON Lines
+    # de solo-anexar. Se guarda el desplazamiento de cada línea, así que leer
+    # cualquier posición del disco es un seek, no un recorrido del archivo.
+    # Orden lógico: posición 0 = pedido más reciente. El archivo se abre
+    # solo durante cada operación (no queda un descriptor abierto por
+    # historial) y cerrar() vuelca también el buffer.
+    def __init__(self, capacidad, ruta_archivo):
+        self.capacidad = capacidad
+        self.ruta_archivo = ruta_archivo
+        self._buffer = [None] * capacidad
+        self._inicio = 0
+        self._cantidad = 0
+        self._desplazamientos = array('q')
+        self._cargar_desplazamientos()
+
+    def _cargar_desplazamientos(self):
+        # Reabre un historial existente recorriendo el archivo una sola vez
+        if not os.path.exists(self.ruta_archivo):
+            return
+        with open(self.ruta_archivo, 'rb') as archivo:
+            posicion = 0
+            for linea in archivo:
+                self._desplazamientos.append(posicion)
+                posicion += len(linea)
+
+    def _volcar(self, *datos):
+        with open(self.ruta_archivo, 'ab') as archivo:
+            archivo.seek(0, os.SEEK_END)
+            for dato in datos:
+                self._desplazamientos.append(archivo.tell())
+                archivo.write(json.dumps(dato, ensure_ascii=False, default=str).encode('utf-8') + b'\n')
+
+    def _leer_disco(self, indice):
+        # indice 0 = línea más antigua del archivo
+        with open(self.ruta_archivo, 'rb') as archivo:
+            archivo.seek(self._desplazamientos[indice])
+            return json.loads(archivo.readline())
+
+    def esta_vacia(self):
+        return len(self) == 0
+
+    def agregar_al_inicio(self, dato):
+        # Agrega el pedido más reciente; si el buffer está lleno, el más
+        # antiguo en memoria pasa al archivo.
+        if self.capacidad == 0:
+            self._volcar(dato)
+            return True
+        if self._cantidad == self.capacidad:
+            self._volcar(self._buffer[self._inicio])
+            self._buffer[self._inicio] = dato
+            self._inicio = (self._inicio + 1) % self.capacidad
+        else:
+            self._buffer[(self._inicio + self._cantidad) % self.capacidad] = dato
+            self._cantidad += 1
+        return True
+
+    def obtener_ultimos_n(self, n):
+        # O(n) si n <= capacidad: solo toca el buffer en memoria
+        resultado = []
+        for i in range(min(n, self._cantidad)):
+            resultado.append(self._buffer[(self._inicio + self._cantidad - 1 - i) % self.capacidad])
+        if n > self._cantidad:
+            for dato in self.iter_antiguos(limite=n - self._cantidad):
+                resultado.append(dato)
+        return resultado
+
+    def obtener_en_posicion(self, indice):
+        if indice < 0 or indice >= len(self):
+            return None
+        if indice < self._cantidad:
+            return self._buffer[(self._inicio + self._cantidad - 1 - indice) % self.capacidad]
+        return self._leer_disco(len(self._desplazamientos) - 1 - (indice - self._cantidad))
+
+    def iter_antiguos(self, tamano_pagina=100, limite=None):
+        # Generador perezoso sobre los pedidos volcados a disco, del más
+        # reciente al más antiguo, leyendo de a `tamano_pagina` líneas.
+        restante = len(self._desplazamientos)
+        if limite is not None:
+            tope = max(0, restante - limite)
+        else:
+            tope = 0
+        while restante > tope:
+            desde = max(tope, restante - tamano_pagina)
+            with open(self.ruta_archivo, 'rb') as archivo:
+                archivo.seek(self._desplazamientos[desde])
+                pagina = [json.loads(archivo.readline()) for _ in range(restante - desde)]
+            yield from reversed(pagina)
+            restante = desde
+
+    def buscar(self, criterio):
+        return [dato for dato in self if criterio(dato)]
+
+    def obtener_todos(self):
+        return list(self)
+
+    def limpiar(self):
+        self._buffer = [None] * self.capacidad
+        self._inicio = 0
+        self._cantidad = 0
+        self._desplazamientos = array('q')
+        if os.path.exists(self.ruta_archivo):
+            os.remove(self.ruta_archivo)
+
+    def cerrar(self):
+        # Vuelca el buffer (del más antiguo al más reciente) para que al
+        # reabrir el archivo estén todos los pedidos; el historial sigue usable
+        if self._cantidad:
+            self._volcar(*(self._buffer[(self._inicio + i) % self.capacidad]
+                           for i in range(self._cantidad)))
+        self._buffer = [None] * self.capacidad
+        self._inicio = 0
+        self._cantidad = 0
+
+    def __len__(self):
+        return self._cantidad + len(self._desplazamientos)
+
+    def __iter__(self):
+        for i in range(self._cantidad):
+            yield self._buffer[(self._inicio + self._cantidad - 1 - i) % self.capacidad]
+        yield from self.iter_antiguos()
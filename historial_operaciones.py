@@ -0,0 +1,61 @@
+from datetime import datetime
+
+from .pila import Pila
+
+
+class HistorialOperaciones:
+    # Deshacer/rehacer basado en comandos: cada operación registrada lleva
+    # la función que la revierte y la que la vuelve a aplicar. Ambas deben
+    # devolver False si ya no es posible (p. ej. el pedido ya fue atendido).
+    def __init__(self, capacidad_maxima=20):
+        self.pila_deshacer = Pila(capacidad_maxima)
+        self.pila_rehacer = Pila(capacidad_maxima)
+
+    def registrar(self, tipo, deshacer, rehacer, **datos):
+        operacion = {
+            'tipo': tipo,
+            'timestamp': datetime.now(),
+            'deshacer': deshacer,
+            'rehacer': rehacer
+        }
+        operacion.update(datos)
+        self.pila_deshacer.apilar(operacion)
+        # Una operación nueva invalida lo que se podía rehacer
+        self.pila_rehacer.limpiar()
+        return operacion
+
+    def deshacer(self):
+        # Devuelve la operación con 'exito' indicando si se pudo revertir;
+        # las que fallan se descartan en lugar de pasar a rehacer.
+        operacion = self.pila_deshacer.desapilar()
+        if operacion is None:
+            return None
+        operacion['exito'] = operacion['deshacer']() is not False
+        if operacion['exito']:
+            self.pila_rehacer.apilar(operacion)
+        return operacion
+
+    def rehacer(self):
+        operacion = self.pila_rehacer.desapilar()
+        if operacion is None:
+            return None
+        operacion['exito'] = operacion['rehacer']() is not False
+        if operacion['exito']:
+            self.pila_deshacer.apilar(operacion)
+        return operacion
+
+    def puede_deshacer(self):
+        return not self.pila_deshacer.esta_vacia()
+
+    def puede_rehacer(self):
+        return not self.pila_rehacer.esta_vacia()
+
+    def tamanio(self):
+        return self.pila_deshacer.tamanio()
+
+    def limpiar(self):
+        self.pila_deshacer.limpiar()
+        self.pila_rehacer.limpiar()
+
+    def __len__(self):
+        return self.tamanio()
@@ -0,0 +1,115 @@
+def normalizar_categoria(categoria):
+    # "Bebidas" y " bebidas" son la misma categoría
+    return categoria.strip().lower()
+
+
+class IndiceCategorias:
+    # Índice categoría -> conjunto de claves, más el conjunto de claves
+    # disponibles. Listar varias categorías o filtrar "solo disponibles" son
+    # operaciones entre sets (en C) en lugar de filtrar el catálogo completo.
+    # Las categorías se comparan sin distinguir mayúsculas; para mostrarlas
+    # se conserva la primera grafía registrada de cada una.
+    def __init__(self):
+        self._por_categoria = {}
+        self._nombres = {}
+        self._categoria_de = {}
+        self._disponibles = set()
+        self._valores = {}
+        self._orden = {}
+        self._secuencia = 0
+
+    def agregar(self, clave, categoria, disponible=True, valor=None):
+        if clave in self._categoria_de:
+            self.eliminar(clave)
+        normalizada = self._registrar_categoria(categoria)
+        self._por_categoria[normalizada].add(clave)
+        self._categoria_de[clave] = normalizada
+        if disponible:
+            self._disponibles.add(clave)
+        self._valores[clave] = valor if valor is not None else clave
+        self._orden[clave] = self._secuencia
+        self._secuencia += 1
+        return True
+
+    def eliminar(self, clave):
+        categoria = self._categoria_de.pop(clave, None)
+        if categoria is None:
+            return False
+        self._quitar_de_categoria(clave, categoria)
+        self._disponibles.discard(clave)
+        self._valores.pop(clave)
+        self._orden.pop(clave)
+        return True
+
+    def _registrar_categoria(self, categoria):
+        normalizada = normalizar_categoria(categoria)
+        if normalizada not in self._por_categoria:
+            self._por_categoria[normalizada] = set()
+            self._nombres[normalizada] = categoria.strip()
+        return normalizada
+
+    def _quitar_de_categoria(self, clave, categoria):
+        claves = self._por_categoria[categoria]
+        claves.discard(clave)
+        if not claves:
+            del self._por_categoria[categoria]
+            del self._nombres[categoria]
+
+    def cambiar_categoria(self, clave, nueva_categoria):
+        anterior = self._categoria_de.get(clave)
+        if anterior is None:
+            return False
+        self._quitar_de_categoria(clave, anterior)
+        normalizada = self._registrar_categoria(nueva_categoria)
+        self._por_categoria[normalizada].add(clave)
+        self._categoria_de[clave] = normalizada
+        return True
+
+    def marcar_disponible(self, clave, disponible):
+        if clave not in self._categoria_de:
+            return False
+        if disponible:
+            self._disponibles.add(clave)
+        else:
+            self._disponibles.discard(clave)
+        return True
+
+    def claves_de(self, categorias, solo_disponibles=False):
+        # Unión de las categorías pedidas (set de claves)
+        grupos = [self._por_categoria.get(normalizar_categoria(c), set()) for c in categorias]
+        claves = set().union(*grupos)
+        if solo_disponibles:
+            claves &= self._disponibles
+        return claves
+
+    def buscar(self, categorias, solo_disponibles=False):
+        # Valores de las categorías pedidas, en orden de alta
+        claves = sorted(self.claves_de(categorias, solo_disponibles), key=self._orden.__getitem__)
+        return [self._valores[clave] for clave in claves]
+
+    def cantidad(self, categoria, solo_disponibles=False):
+        claves = self._por_categoria.get(normalizar_categoria(categoria), set())
+        if solo_disponibles:
+            return len(claves & self._disponibles)
+        return len(claves)
+
+    def categorias(self):
+        return list(self._por_categoria)
+
+    def nombre_de(self, categoria):
+        # Nombre para mostrar de una categoría (None si no tiene productos)
+        return self._nombres.get(normalizar_categoria(categoria))
+
+    def limpiar(self):
+        self._por_categoria.clear()
+        self._nombres.clear()
+        self._categoria_de.clear()
+        self._disponibles.clear()
+        self._valores.clear()
+        self._orden.clear()
+
+    def __contains__(self, categoria):
+        return normalizar_categoria(categoria) in self._por_categoria
+
+    def __len__(self):
+        return len(self._categoria_de)
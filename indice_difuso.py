@@ -0,0 +1,188 @@
+import heapq
+import re
+
+from .indice_trigramas import normalizar_texto
+
+
+def palabras(texto):
+    return re.findall(r'\w+', normalizar_texto(texto))
+
+
+def distancia_edicion(a, b, maximo):
+    # Levenshtein acotado: cualquier distancia mayor que `maximo` se informa
+    # como maximo + 1, y se corta en cuanto la fila entera lo supera
+    if abs(len(a) - len(b)) > maximo:
+        return maximo + 1
+    if len(a) > len(b):
+        a, b = b, a
+    previa = list(range(len(a) + 1))
+    for j, cb in enumerate(b, 1):
+        actual = [j]
+        minimo = j
+        for i, ca in enumerate(a, 1):
+            valor = min(previa[i] + 1, actual[i - 1] + 1, previa[i - 1] + (ca != cb))
+            actual.append(valor)
+            if valor < minimo:
+                minimo = valor
+        if minimo > maximo:
+            return maximo + 1
+        previa = actual
+    return min(previa[-1], maximo + 1)
+
+
+def borrados(palabra, distancia):
+    # La palabra y todas las variantes con hasta `distancia` letras borradas
+    resultado = {palabra}
+    frontera = {palabra}
+    for _ in range(distancia):
+        frontera = {p[:i] + p[i + 1:] for p in frontera for i in range(len(p))}
+        resultado |= frontera
+    return resultado
+
+
+class IndiceDifuso:
+    # Búsqueda tolerante a errores de tipeo por borrado simétrico: cada
+    # palabra del vocabulario se indexa junto con sus variantes de hasta
+    # `distancia_maxima` letras borradas (solo sobre los primeros
+    # `longitud_prefijo` caracteres, para acotar la memoria). Una consulta
+    # genera sus propias variantes y solo calcula la distancia de edición
+    # contra las palabras que comparten alguna.
+    def __init__(self, distancia_maxima=2, longitud_prefijo=7):
+        self.distancia_maxima = distancia_maxima
+        self.longitud_prefijo = longitud_prefijo
+        self._palabras = {}      # clave -> palabras normalizadas
+        self._valores = {}
+        self._orden = {}
+        self._claves_por_palabra = {}
+        self._variantes = {}     # variante -> palabras del vocabulario
+        self._secuencia = 0
+
+    def _tolerancia(self, palabra):
+        # Palabras cortas admiten menos errores: "te" no debe coincidir con "pan"
+        if len(palabra) < 3:
+            return 0
+        if len(palabra) < 6:
+            return min(1, self.distancia_maxima)
+        return self.distancia_maxima
+
+    def _variantes_de(self, palabra, distancia):
+        return borrados(palabra[:self.longitud_prefijo], distancia)
+
+    def agregar(self, clave, texto, valor=None):
+        if clave in self._palabras:
+            self.eliminar(clave)
+        tokens = tuple(palabras(texto))
+        self._palabras[clave] = tokens
+        self._valores[clave] = valor if valor is not None else clave
+        self._orden[clave] = self._secuencia
+        self._secuencia += 1
+        for palabra in set(tokens):
+            claves = self._claves_por_palabra.get(palabra)
+            if claves is None:
+                claves = self._claves_por_palabra[palabra] = set()
+                for variante in self._variantes_de(palabra, self.distancia_maxima):
+                    self._variantes.setdefault(variante, set()).add(palabra)
+            claves.add(clave)
+        return True
+
+    def eliminar(self, clave):
+        tokens = self._palabras.pop(clave, None)
+        if tokens is None:
+            return False
+        self._valores.pop(clave)
+        self._orden.pop(clave)
+        for palabra in set(tokens):
+            claves = self._claves_por_palabra[palabra]
+            claves.discard(clave)
+            if claves:
+                continue
+            # Última entrada con esta palabra: sale del vocabulario
+            del self._claves_por_palabra[palabra]
+            for variante in self._variantes_de(palabra, self.distancia_maxima):
+                grupo = self._variantes.get(variante)
+                if grupo is not None:
+                    grupo.discard(palabra)
+                    if not grupo:
+                        del self._variantes[variante]
+        return True
+
+    def palabras_similares(self, palabra):
+        # {palabra del vocabulario: distancia} dentro de la tolerancia
+        tolerancia = self._tolerancia(palabra)
+        candidatas = set()
+        for variante in self._variantes_de(palabra, tolerancia):
+            grupo = self._variantes.get(variante)
+            if grupo:
+                candidatas |= grupo
+        similares = {}
+        for candidata in candidatas:
+            distancia = distancia_edicion(palabra, candidata, tolerancia)
+            if distancia <= tolerancia:
+                similares[candidata] = distancia
+        return similares
+
+    def _niveles(self, similares):
+        # Claves que contienen alguna palabra similar, agrupadas por la menor
+        # distancia: [(distancia, claves)] en orden ascendente
+        niveles = []
+        vistas = set()
+        for distancia in sorted(set(similares.values())):
+            grupo = set().union(*(self._claves_por_palabra[p]
+                                  for p, d in similares.items() if d == distancia))
+            grupo -= vistas
+            vistas |= grupo
+            niveles.append((distancia, grupo))
+        return niveles, vistas
+
+    def buscar(self, termino, limite=10, popularidad=None):
+        # [(valor, distancia)] con todas las palabras de `termino` presentes
+        # (con errores); ordena por distancia total, luego por popularidad
+        # descendente y luego por orden de alta
+        por_palabra = []
+        for palabra in palabras(termino):
+            similares = self.palabras_similares(palabra)
+            if not similares:
+                return []
+            por_palabra.append(self._niveles(similares))
+        if not por_palabra:
+            return []
+
+        # Cada clave cae en un único nivel por palabra, así que combinar niveles
+        # con intersecciones de conjuntos (en C) da la partición por distancia total
+        por_palabra.sort(key=lambda niveles_vistas: len(niveles_vistas[1]))
+        acumulado = dict(por_palabra[0][0])
+        for niveles, _ in por_palabra[1:]:
+            siguiente = {}
+            for total, claves in acumulado.items():
+                for distancia, grupo in niveles:
+                    comunes = claves & grupo
+                    if comunes:
+                        siguiente.setdefault(total + distancia, set()).update(comunes)
+            acumulado = siguiente
+        grupos = sorted(acumulado.items())
+
+        if popularidad:
+            criterio = lambda clave: (-popularidad(self._valores[clave]), self._orden[clave])
+        else:
+            criterio = self._orden.__getitem__
+        resultados = []
+        for distancia, grupo in grupos:
+            # Solo se puntúan los grupos de menor distancia necesarios para el límite
+            for clave in heapq.nsmallest(limite - len(resultados), grupo, key=criterio):
+                resultados.append((self._valores[clave], distancia))
+            if len(resultados) >= limite:
+                break
+        return resultados
+
+    def contiene(self, clave):
+        return clave in self._palabras
+
+    def limpiar(self):
+        self._palabras.clear()
+        self._valores.clear()
+        self._orden.clear()
+        self._claves_por_palabra.clear()
+        self._variantes.clear()
+
+    def __len__(self):
+        return len(self._palabras)
@@ -0,0 +1,93 @@
+from bisect import bisect_left, bisect_right
+
+from .indice_trigramas import normalizar_texto
+
+
+class IndicePrefijos:
+    # Autocompletado sobre un arreglo ordenado de textos normalizados
+    # (claves + valores paralelos, con bisect): las k primeras completaciones
+    # de un prefijo cuestan O(log n + k). Con `por_palabras`, cada palabra
+    # del texto también es un punto de entrada ("lop" encuentra "Ana López").
+    # Un dict aparte resuelve la coincidencia exacta en O(1).
+    def __init__(self, por_palabras=False):
+        self.por_palabras = por_palabras
+        self._claves = []
+        self._valores = []
+        self._exactos = {}
+
+    def _entradas(self, texto):
+        normalizado = ' '.join(normalizar_texto(texto).split())
+        if not self.por_palabras:
+            return normalizado, [normalizado]
+        palabras = normalizado.split(' ')
+        return normalizado, [' '.join(palabras[i:]) for i in range(len(palabras))]
+
+    def agregar(self, texto, valor):
+        exacto, entradas = self._entradas(texto)
+        if not exacto:
+            return False
+        self._exactos.setdefault(exacto, []).append(valor)
+        for entrada in entradas:
+            pos = bisect_right(self._claves, entrada)
+            self._claves.insert(pos, entrada)
+            self._valores.insert(pos, valor)
+        return True
+
+    def agregar_lote(self, pares):
+        # Carga masiva: un solo ordenamiento en vez de n inserciones O(n)
+        nuevas = list(zip(self._claves, self._valores))
+        for texto, valor in pares:
+            exacto, entradas = self._entradas(texto)
+            if not exacto:
+                continue
+            self._exactos.setdefault(exacto, []).append(valor)
+            nuevas.extend((entrada, valor) for entrada in entradas)
+        nuevas.sort(key=lambda par: par[0])
+        self._claves = [clave for clave, _ in nuevas]
+        self._valores = [valor for _, valor in nuevas]
+
+    def eliminar(self, texto, valor):
+        exacto, entradas = self._entradas(texto)
+        grupo = self._exactos.get(exacto)
+        if not grupo or not any(v is valor for v in grupo):
+            return False
+        grupo[:] = [v for v in grupo if v is not valor]
+        if not grupo:
+            del self._exactos[exacto]
+        for entrada in entradas:
+            for pos in range(bisect_left(self._claves, entrada), bisect_right(self._claves, entrada)):
+                if self._valores[pos] is valor:
+                    del self._claves[pos]
+                    del self._valores[pos]
+                    break
+        return True
+
+    def buscar_exacto(self, texto):
+        # Valores cuyo texto normalizado es exactamente `texto`, en orden de alta
+        exacto, _ = self._entradas(texto)
+        return list(self._exactos.get(exacto, ()))
+
+    def completar(self, prefijo, limite=10):
+        # Primeros `limite` valores (sin repetir) cuyo texto, o alguna de sus
+        # palabras, empieza por `prefijo`; en orden alfabético
+        prefijo = ' '.join(normalizar_texto(prefijo).split())
+        resultados = []
+        vistos = set()
+        pos = bisect_left(self._claves, prefijo)
+        while pos < len(self._claves) and len(resultados) < limite:
+            if not self._claves[pos].startswith(prefijo):
+                break
+            valor = self._valores[pos]
+            if id(valor) not in vistos:
+                vistos.add(id(valor))
+                resultados.append(valor)
+            pos += 1
+        return resultados
+
+    def limpiar(self):
+        self._claves.clear()
+        self._valores.clear()
+        self._exactos.clear()
+
+    def __len__(self):
+        return sum(len(grupo) for grupo in self._exactos.values())
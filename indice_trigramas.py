@@ -0,0 +1,84 @@
+import unicodedata
+
+
+def normalizar_texto(texto):
+    # Minúsculas y sin acentos: "Café" y "cafe" se indexan igual
+    descompuesto = unicodedata.normalize('NFKD', texto.lower())
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+def trigramas(texto):
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class IndiceTrigramas:
+    # Índice invertido trigrama -> claves para búsqueda por subcadena.
+    # Una consulta intersecta las listas de sus trigramas empezando por la
+    # más corta y verifica la subcadena solo sobre los candidatos.
+    def __init__(self):
+        self._textos = {}
+        self._valores = {}
+        self._orden = {}
+        self._postings = {}
+        self._secuencia = 0
+
+    def agregar(self, clave, texto, valor=None):
+        if clave in self._textos:
+            self.eliminar(clave)
+        normalizado = normalizar_texto(texto)
+        self._textos[clave] = normalizado
+        self._valores[clave] = valor if valor is not None else clave
+        self._orden[clave] = self._secuencia
+        self._secuencia += 1
+        for trigrama in trigramas(normalizado):
+            self._postings.setdefault(trigrama, set()).add(clave)
+        return True
+
+    def eliminar(self, clave):
+        normalizado = self._textos.pop(clave, None)
+        if normalizado is None:
+            return False
+        self._valores.pop(clave)
+        self._orden.pop(clave)
+        for trigrama in trigramas(normalizado):
+            claves = self._postings.get(trigrama)
+            if claves is not None:
+                claves.discard(clave)
+                if not claves:
+                    del self._postings[trigrama]
+        return True
+
+    def buscar(self, termino):
+        # Valores cuyo texto contiene `termino`, en orden de alta
+        consulta = normalizar_texto(termino)
+        if len(consulta) < 3:
+            # Sin trigramas que intersectar: recorrido directo
+            candidatos = [c for c, texto in self._textos.items() if consulta in texto]
+        else:
+            listas = []
+            for trigrama in trigramas(consulta):
+                claves = self._postings.get(trigrama)
+                if not claves:
+                    return []
+                listas.append(claves)
+            listas.sort(key=len)
+            candidatos = set(listas[0])
+            for claves in listas[1:]:
+                candidatos &= claves
+                if not candidatos:
+                    return []
+            candidatos = [c for c in candidatos if consulta in self._textos[c]]
+            candidatos.sort(key=self._orden.__getitem__)
+        return [self._valores[c] for c in candidatos]
+
+    def contiene(self, clave):
+        return clave in self._textos
+
+    def limpiar(self):
+        self._textos.clear()
+        self._valores.clear()
+        self._orden.clear()
+        self._postings.clear()
+
+    def __len__(self):
+        return len(self._textos)
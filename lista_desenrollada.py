@@ -0,0 +1,96 @@
+class Bloque:
+    __slots__ = ('elementos', 'siguiente')
+
+    def __init__(self):
+        self.elementos = []
+        self.siguiente = None
+
+class ListaDesenrollada:
+    # Misma interfaz que ListaEnlazada, pero cada nodo guarda hasta
+    # `tamano_bloque` elementos contiguos: muchos menos objetos en memoria y
+    # acceso por posición en O(n / tamano_bloque).
+    def __init__(self, tamano_bloque=64):
+        self.tamano_bloque = tamano_bloque
+        self.cabeza = None
+        self.cola = None
+        self.tamano = 0
+
+    def esta_vacia(self):
+        return self.tamano == 0
+
+    def agregar_al_inicio(self, dato):
+        if self.cabeza is None or len(self.cabeza.elementos) >= self.tamano_bloque:
+            bloque = Bloque()
+            bloque.siguiente = self.cabeza
+            self.cabeza = bloque
+            if self.cola is None:
+                self.cola = bloque
+        self.cabeza.elementos.insert(0, dato)
+        self.tamano += 1
+        return True
+
+    def agregar_al_final(self, dato):
+        if self.cola is None or len(self.cola.elementos) >= self.tamano_bloque:
+            bloque = Bloque()
+            if self.cola is None:
+                self.cabeza = bloque
+            else:
+                self.cola.siguiente = bloque
+            self.cola = bloque
+        self.cola.elementos.append(dato)
+        self.tamano += 1
+        return True
+
+    def eliminar_primero(self):
+        if self.esta_vacia():
+            return None
+        dato = self.cabeza.elementos.pop(0)
+        if not self.cabeza.elementos:
+            self.cabeza = self.cabeza.siguiente
+            if self.cabeza is None:
+                self.cola = None
+        self.tamano -= 1
+        return dato
+
+    def buscar(self, criterio):
+        return [dato for dato in self if criterio(dato)]
+
+    def obtener_en_posicion(self, indice):
+        if indice < 0 or indice >= self.tamano:
+            return None
+        bloque = self.cabeza
+        while indice >= len(bloque.elementos):
+            indice -= len(bloque.elementos)
+            bloque = bloque.siguiente
+        return bloque.elementos[indice]
+
+    def obtener_todos(self):
+        elementos = []
+        bloque = self.cabeza
+        while bloque:
+            elementos.extend(bloque.elementos)
+            bloque = bloque.siguiente
+        return elementos
+
+    def obtener_ultimos_n(self, n):
+        # Igual que ListaEnlazada: los n primeros de la lista, sin copiar el resto
+        elementos = []
+        bloque = self.cabeza
+        while bloque and len(elementos) < n:
+            elementos.extend(bloque.elementos[:n - len(elementos)])
+            bloque = bloque.siguiente
+        return elementos
+
+    def limpiar(self):
+        self.cabeza = None
+        self.cola = None
+        self.tamano = 0
+
+    def __len__(self):
+        return self.tamano
+
+    def __iter__(self):
+        bloque = self.cabeza
+        while bloque:
+            yield from bloque.elementos
+            bloque = bloque.siguiente
@@ -1,13 +1,65 @@
+from bisect import bisect_left, bisect_right
+
+
 class Nodo:
+    # Sin __dict__ por nodo: el historial de cada usuario puede tener miles
+    __slots__ = ('dato', 'siguiente')
+
     def __init__(self, dato):
         self.dato = dato
         self.siguiente = None
 
 class ListaEnlazada:
-    def __init__(self):
+    # Índices secundarios opcionales sobre datos tipo dict:
+    #   campo_fecha: índice ordenado (claves + datos paralelos, con bisect)
+    #   campos_indexados: índices hash valor -> {id(dato): dato}
+    def __init__(self, campo_fecha=None, campos_indexados=()):
         self.cabeza = None
         self.cola = None
         self.tamano = 0
+        self.campo_fecha = campo_fecha
+        self._fechas = []
+        self._datos_por_fecha = []
+        self._indices = {campo: {} for campo in campos_indexados}
+    
+    @staticmethod
+    def _valor_campo(dato, campo):
+        try:
+            return dato[campo]
+        except (KeyError, TypeError, IndexError):
+            return None
+    
+    def _indexar(self, dato):
+        if self.campo_fecha is not None:
+            fecha = self._valor_campo(dato, self.campo_fecha)
+            if fecha is not None:
+                pos = bisect_right(self._fechas, fecha)
+                self._fechas.insert(pos, fecha)
+                self._datos_por_fecha.insert(pos, dato)
+        for campo, indice in self._indices.items():
+            valor = self._valor_campo(dato, campo)
+            if valor is not None:
+                indice.setdefault(valor, {})[id(dato)] = dato
+    
+    def _desindexar(self, dato, campo=None, valor=None):
+        # Con `campo` solo se quita del índice de ese campo (con su valor previo)
+        if campo is None and self.campo_fecha is not None:
+            fecha = self._valor_campo(dato, self.campo_fecha)
+            if fecha is not None:
+                for pos in range(bisect_left(self._fechas, fecha), bisect_right(self._fechas, fecha)):
+                    if self._datos_por_fecha[pos] is dato:
+                        del self._fechas[pos]
+                        del self._datos_por_fecha[pos]
+                        break
+        for nombre, indice in self._indices.items():
+            if campo is not None and nombre != campo:
+                continue
+            actual = valor if campo is not None else self._valor_campo(dato, nombre)
+            grupo = indice.get(actual)
+            if grupo is not None:
+                grupo.pop(id(dato), None)
+                if not grupo:
+                    del indice[actual]
     
     def esta_vacia(self):
         return self.cabeza is None
@@ -21,6 +73,7 @@ class ListaEnlazada:
             nuevo_nodo.siguiente = self.cabeza
             self.cabeza = nuevo_nodo
         self.tamano += 1
+        self._indexar(dato)
         return True
     
     def agregar_al_final(self, dato):
@@ -32,6 +85,7 @@ class ListaEnlazada:
             self.cola.siguiente = nuevo_nodo
             self.cola = nuevo_nodo
         self.tamano += 1
+        self._indexar(dato)
         return True
     
     def eliminar_primero(self):
@@ -42,6 +96,7 @@ class ListaEnlazada:
         if self.cabeza is None:
             self.cola = None
         self.tamano -= 1
+        self._desindexar(dato)
         return dato
     
     def buscar(self, criterio):
@@ -51,11 +106,44 @@ class ListaEnlazada:
             try:
                 if criterio(actual.dato):
                     resultados.append(actual.dato)
-            except:
+            except (KeyError, TypeError, AttributeError, IndexError):
+                # Datos a los que les falta el campo consultado
                 pass
             actual = actual.siguiente
         return resultados
     
+    def buscar_por_rango_fecha(self, desde, hasta):
+        # O(log n + k) con índice de fecha; si no hay, recorre la lista
+        if self.campo_fecha is None:
+            encontrados = self.buscar(lambda dato: desde <= dato['fecha'] <= hasta)
+            return sorted(encontrados, key=lambda dato: dato['fecha'])
+        inicio = bisect_left(self._fechas, desde)
+        fin = bisect_right(self._fechas, hasta)
+        return self._datos_por_fecha[inicio:fin]
+    
+    def buscar_por_campo(self, campo, valor):
+        # O(k) con índice hash sobre `campo`; si no hay, recorre la lista
+        indice = self._indices.get(campo)
+        if indice is None:
+            return self.buscar(lambda dato: dato[campo] == valor)
+        return list(indice.get(valor, {}).values())
+    
+    def actualizar_campo(self, dato, campo, valor):
+        # Cambia dato[campo] manteniendo los índices (p. ej. el estado de un pedido)
+        anterior = self._valor_campo(dato, campo)
+        if campo == self.campo_fecha:
+            self._desindexar(dato)
+            dato[campo] = valor
+            self._indexar(dato)
+            return
+        if campo in self._indices:
+            self._desindexar(dato, campo, anterior)
+            dato[campo] = valor
+            if valor is not None:
+                self._indices[campo].setdefault(valor, {})[id(dato)] = dato
+            return
+        dato[campo] = valor
+    
     def obtener_en_posicion(self, indice):
         if indice < 0 or indice >= self.tamano:
             return None
@@ -73,13 +161,21 @@ class ListaEnlazada:
         return elementos
     
     def obtener_ultimos_n(self, n):
-        todos = self.obtener_todos()
-        return todos[:n] if len(todos) >= n else todos
+        elementos = []
+        actual = self.cabeza
+        while actual and len(elementos) < n:
+            elementos.append(actual.dato)
+            actual = actual.siguiente
+        return elementos
     
     def limpiar(self):
         self.cabeza = None
         self.cola = None
         self.tamano = 0
+        self._fechas.clear()
+        self._datos_por_fecha.clear()
+        for indice in self._indices.values():
+            indice.clear()
     
     def __len__(self):
         return self.tamano
@@ -15,7 +15,8 @@ Estructuras de Datos Implementadas:
 
 import sys
 import os
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
 
 
 
@@ -24,10 +25,20 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Importar estructuras de datos
 from estructuras.cola_prioridad import ColaPrioridad
+from estructuras.cola_concurrente import ColaPrioridadBloqueante, EstacionesCocina
 from estructuras.lista_enlazada import ListaEnlazada
 from estructuras.arbol_bst import ArbolBST
 from estructuras.pila import Pila
+from estructuras.historial_operaciones import HistorialOperaciones
 from estructuras.conjunto import ConjuntoPersonalizado
+from estructuras.conjunto_bits import ConjuntoBits, TablaSimbolos
+from estructuras.indice_categorias import IndiceCategorias, normalizar_categoria
+from estructuras.estadisticas_grupo import EstadisticasPorGrupo
+from estructuras.almacen_pedidos import AlmacenPedidos, NUMPY_DISPONIBLE
+from estructuras.acumulador_temporal import AcumuladorTemporal
+from estructuras.indice_trigramas import IndiceTrigramas
+from estructuras.indice_difuso import IndiceDifuso
+from estructuras.indice_prefijos import IndicePrefijos
 
 # Importar modelos
 from modelos.usuario import Usuario, GestorUsuarios
@@ -41,28 +52,78 @@ from utils.carga_datos import CargadorDatos
 class SistemaCafeteria:
     """Sistema principal de gestión de la cafetería"""
     
+    TIPOS_USUARIO = ('profesor', 'estudiante', 'staff')
+    
     def __init__(self):
         # === MAPAS (Diccionarios) ===
         self.gestor_usuarios = GestorUsuarios()
         self.gestor_productos = GestorProductos()
         
         # === COLA DE PRIORIDAD ===
-        self.cola_pedidos = ColaPrioridad()
+        # Plazos por nivel (segundos): evitan que los estudiantes esperen
+        # indefinidamente cuando no dejan de llegar pedidos de profesores
+        self.cola_pedidos = ColaPrioridad(esperas_maximas={1: 300, 2: 600, 3: 900})
+        self.resumenes_cola = {}
+        # Envoltura thread-safe compartida por la consola y las estaciones
+        self.cola_concurrente = ColaPrioridadBloqueante(self.cola_pedidos)
+        self.estaciones = None
         
         # === ÁRBOL BST ===
-        self.arbol_precios = ArbolBST()
-        self.arbol_popularidad = ArbolBST()
+        self.arbol_precios = ArbolBST(balanceado=True, claves_duplicadas=True)
+        # Clave (unidades vendidas, producto.id): el recorrido inverso da el top-k
+        self.arbol_popularidad = ArbolBST(balanceado=True)
+        # Clave (total_gastado, usuario_id): ranking de gasto sin ordenar a todos
+        self.arbol_gastos = ArbolBST(balanceado=True)
         
         # === PILA ===
         self.historial_navegacion = Pila(capacidad_maxima=10)
-        self.operaciones_deshacer = Pila(capacidad_maxima=20)
+        self.operaciones_deshacer = HistorialOperaciones(capacidad_maxima=20)
+        # Altas revertidas con deshacer: los gestores no tienen bajas, así que
+        # quedan registrados pero fuera de índices, listados y búsquedas
+        self.usuarios_retirados = {}    # usuario_id -> usuario
+        self.productos_retirados = {}   # producto.id -> producto
+        # Pedidos realizados y aún no entregados (en cola o en una estación):
+        # deshacer un alta consulta un contador en O(1) en lugar de recorrer la cola
+        self.pedidos_pendientes = {}        # pedido.id -> pedido
+        self.pendientes_por_usuario = {}    # usuario_id -> pedidos sin entregar
+        self.pendientes_por_producto = {}   # producto.id -> pedidos sin entregar
         
         # === CONJUNTOS ===
+        # Nombres normalizados (minúsculas), como en el índice de categorías
         self.categorias_disponibles = ConjuntoPersonalizado()
+        # Categoría -> ids de productos (y ids disponibles): listar una o varias
+        # categorías es una operación entre sets, sin recorrer el catálogo
+        self.indice_categorias = IndiceCategorias()
+        # Ingredientes como máscaras de bits sobre un universo internado:
+        # el chequeo de alérgenos es un AND de enteros
+        self.simbolos_ingredientes = TablaSimbolos()
+        self.simbolos_productos = TablaSimbolos()
+        self.mascaras_ingredientes = {}       # producto.id -> ConjuntoBits de ingredientes
+        self.productos_por_ingrediente = {}   # ingrediente -> ConjuntoBits de productos
+        self.productos_disponibles = ConjuntoBits(self.simbolos_productos)
+        
+        # === ALGORITMOS DE CADENAS ===
+        # Índice de trigramas sobre nombres normalizados (búsqueda por subcadena)
+        self.indice_nombres_productos = IndiceTrigramas()
+        # Índices de borrado simétrico para búsqueda tolerante a errores de tipeo
+        self.indice_difuso_productos = IndiceDifuso()
+        self.indice_difuso_usuarios = IndiceDifuso()
+        # Arreglos ordenados para autocompletar usuarios por nombre (cualquier
+        # palabra) o email, con coincidencia exacta normalizada en O(1)
+        self.indice_nombres_usuarios = IndicePrefijos(por_palabras=True)
+        self.indice_emails_usuarios = IndicePrefijos()
         
         # Contadores y estadísticas
         self.total_pedidos_procesados = 0
         self.ventas_totales = 0.0
+        self.ventas_por_producto = {}   # producto.id -> unidades vendidas
+        # Cantidad, gasto y pedidos por tipo de usuario, mantenidos en cada alta y pedido
+        self.estadisticas_usuarios = EstadisticasPorGrupo()
+        # Pedidos en columnas NumPy para reportes vectorizados (solo si hay NumPy)
+        self.almacen_pedidos = AlmacenPedidos() if NUMPY_DISPONIBLE else None
+        # Pedidos e importe por minuto/hora/día en anillos de tamaño fijo
+        self.ventas_por_periodo = AcumuladorTemporal()
+        self._lock_ventas = threading.Lock()
         
         # Cargar datos iniciales
         self.cargar_datos_iniciales()
@@ -78,15 +139,23 @@ class SistemaCafeteria:
         
         # Cargar usuarios
         datos_usuarios = cargador.cargar_usuarios()
+        usuarios_cargados = []
         for dato in datos_usuarios:
-            self.gestor_usuarios.registrar_usuario(
+            usuario = self.gestor_usuarios.registrar_usuario(
                 nombre=dato['nombre'],
                 tipo=dato['tipo'],
                 email=dato.get('email', '')
             )
+            self.indice_difuso_usuarios.agregar(usuario.obtener_id(), usuario.nombre, usuario)
+            # El tipo se toma del usuario registrado: el gestor pudo normalizarlo
+            self.estadisticas_usuarios.agregar(usuario.obtener_id(), usuario.tipo)
+            usuarios_cargados.append(usuario)
+        self.indice_nombres_usuarios.agregar_lote((u.nombre, u) for u in usuarios_cargados)
+        self.indice_emails_usuarios.agregar_lote((u.email, u) for u in usuarios_cargados)
         
         # Cargar productos
         datos_productos = cargador.cargar_productos()
+        pares_precio = []
         for dato in datos_productos:
             producto = self.gestor_productos.registrar_producto(
                 nombre=dato['nombre'],
@@ -99,23 +168,44 @@ class SistemaCafeteria:
                 producto.agregar_ingrediente(ingrediente)
             
             producto.disponible = dato['disponible']
+            self.indice_categorias.agregar(producto.id, producto.categoria, producto.disponible, producto)
+            self.indexar_ingredientes(producto)
+            self.indice_nombres_productos.agregar(producto.id, producto.nombre, producto)
+            self.indice_difuso_productos.agregar(producto.id, producto.nombre, producto)
             
-            # Agregar al árbol BST por precio
-            self.arbol_precios.insertar(dato['precio'], producto)
+            # Se acumula para construir el árbol BST de una sola vez
+            pares_precio.append((dato['precio'], producto))
             
             # Agregar categoría al conjunto
-            self.categorias_disponibles.agregar(dato['categoria'])
+            self.categorias_disponibles.agregar(normalizar_categoria(dato['categoria']))
+        
+        # Árbol BST por precio construido en O(n) (sort estable: ya suele venir ordenado)
+        pares_precio.sort(key=lambda par: par[0])
+        self.arbol_precios.construir_desde_ordenados(pares_precio)
         
         # Cargar pedidos históricos
         datos_pedidos = cargador.cargar_pedidos_historicos()
+        filas_pedidos = []
+        fechas_invalidas = []
         for dato in datos_pedidos:
             usuario = self.gestor_usuarios.buscar_por_id(dato['usuario_id'])
             if usuario:
+                # La fecha se valida antes de sumar nada: una fila mal escrita
+                # se omite entera y la carga sigue con las demás
+                try:
+                    self.ventas_por_periodo.registrar(dato['fecha'], dato['total'])
+                except (ValueError, TypeError):
+                    fechas_invalidas.append(str(dato['id']))
+                    continue
+                
                 productos_nombres = []
+                productos_ids = []
                 for pid in dato['producto_ids']:
                     prod = self.gestor_productos.buscar_por_id(pid)
                     if prod:
                         productos_nombres.append(prod.nombre)
+                        productos_ids.append(pid)
+                        self.ventas_por_producto[pid] = self.ventas_por_producto.get(pid, 0) + 1
                 
                 pedido_info = {
                     'id': dato['id'],
@@ -126,8 +216,32 @@ class SistemaCafeteria:
                 }
                 
                 usuario.agregar_pedido_al_historial(pedido_info)
+                self.estadisticas_usuarios.registrar_pedido(usuario.obtener_id(), dato['total'])
                 self.total_pedidos_procesados += 1
                 self.ventas_totales += dato['total']
+                filas_pedidos.append((
+                    dato['id'], usuario.obtener_id(), usuario.tipo,
+                    dato['fecha'], dato['total'], dato['estado'], productos_ids
+                ))
+        
+        if self.almacen_pedidos is not None:
+            resultado = self.almacen_pedidos.agregar_lote(filas_pedidos)
+            fechas_invalidas.extend(resultado['rechazados'])
+        if fechas_invalidas:
+            print(f"⚠️  Pedidos históricos omitidos por fecha inválida: {', '.join(fechas_invalidas)}")
+        
+        # Árbol de popularidad construido en O(n) a partir de los contadores
+        pares_popularidad = sorted(
+            ((unidades, pid), self.gestor_productos.buscar_por_id(pid))
+            for pid, unidades in self.ventas_por_producto.items()
+        )
+        self.arbol_popularidad.construir_desde_ordenados(pares_popularidad)
+        
+        # Ranking de gasto con los totales ya acumulados
+        pares_gasto = sorted(
+            ((u.info['total_gastado'], u.obtener_id()), u) for u in usuarios_cargados
+        )
+        self.arbol_gastos.construir_desde_ordenados(pares_gasto)
         
         print("\n" + "=" * 70)
         print("  ✓ SISTEMA LISTO")
@@ -156,6 +270,8 @@ class SistemaCafeteria:
             print("  7. Búsqueda de Productos")
             print("  8. Operaciones con Conjuntos")
             print("  9. Deshacer Última Operación")
+            print("  10. Estaciones de Cocina (procesamiento concurrente)")
+            print("  11. Rehacer Operación")
             print("  0. Salir")
             print("\n" + "=" * 70)
             
@@ -179,7 +295,13 @@ class SistemaCafeteria:
                 self.menu_conjuntos()
             elif opcion == "9":
                 self.deshacer_operacion()
+            elif opcion == "10":
+                self.gestionar_estaciones_cocina()
+            elif opcion == "11":
+                self.rehacer_operacion()
             elif opcion == "0":
+                if self.estaciones and self.estaciones.esta_activo():
+                    self.estaciones.detener(vaciar=False)
                 print("\n¡Gracias por usar el sistema!")
                 print("Desarrollado para demostrar estructuras de datos\n")
                 break
@@ -245,17 +367,99 @@ class SistemaCafeteria:
         email = input("Email (opcional): ").strip()
         
         usuario = self.gestor_usuarios.registrar_usuario(nombre, tipo, email)
-        
-        self.operaciones_deshacer.apilar({
-            'tipo': 'registrar_usuario',
-            'usuario_id': usuario.obtener_id(),
-            'timestamp': datetime.now()
-        })
+        self.indexar_usuario(usuario)
+        # Las estaciones actualizan el ranking y los agregados bajo el mismo candado
+        with self._lock_ventas:
+            self.arbol_gastos.insertar(self.clave_gasto(usuario), usuario)
+            self.estadisticas_usuarios.agregar(usuario.obtener_id(), usuario.tipo)
+        
+        self.operaciones_deshacer.registrar(
+            'registrar_usuario',
+            deshacer=lambda: self.quitar_usuario(usuario),
+            rehacer=lambda: self.restaurar_usuario(usuario),
+            usuario_id=usuario.obtener_id()
+        )
         
         print(f"\n✓ Usuario registrado exitosamente:")
         print(f"  {usuario}")
         print(f"  Prioridad en cola: {usuario.obtener_prioridad()}")
     
+    def indexar_usuario(self, usuario):
+        """Agrega el usuario a los índices de nombre, email y búsqueda aproximada"""
+        self.indice_nombres_usuarios.agregar(usuario.nombre, usuario)
+        self.indice_emails_usuarios.agregar(usuario.email, usuario)
+        self.indice_difuso_usuarios.agregar(usuario.obtener_id(), usuario.nombre, usuario)
+    
+    def desindexar_usuario(self, usuario):
+        """Quita el usuario de los índices de nombre, email y búsqueda aproximada"""
+        self.indice_nombres_usuarios.eliminar(usuario.nombre, usuario)
+        self.indice_emails_usuarios.eliminar(usuario.email, usuario)
+        self.indice_difuso_usuarios.eliminar(usuario.obtener_id())
+    
+    def obtener_usuario(self, usuario_id):
+        """Usuario por ID, salvo que su alta se haya deshecho"""
+        if usuario_id in self.usuarios_retirados:
+            return None
+        return self.gestor_usuarios.buscar_por_id(usuario_id)
+    
+    def usuarios_activos(self, tipo=None):
+        """Usuarios del gestor (todos o de un tipo) sin los retirados por deshacer"""
+        if tipo is None:
+            usuarios = self.gestor_usuarios.listar_todos()
+        else:
+            usuarios = self.gestor_usuarios.listar_por_tipo(tipo)
+        if not self.usuarios_retirados:
+            return usuarios
+        return [u for u in usuarios if u.obtener_id() not in self.usuarios_retirados]
+    
+    def buscar_usuario_por_nombre(self, nombre):
+        """Usuario con ese nombre exacto (sin distinguir mayúsculas ni acentos)"""
+        encontrados = self.indice_nombres_usuarios.buscar_exacto(nombre)
+        return encontrados[0] if encontrados else None
+    
+    def buscar_usuario_por_email(self, email):
+        """Usuario con ese email exacto (sin distinguir mayúsculas)"""
+        encontrados = self.indice_emails_usuarios.buscar_exacto(email)
+        return encontrados[0] if encontrados else None
+    
+    def autocompletar_usuarios(self, prefijo, limite=10):
+        """Usuarios cuyo nombre (o alguna de sus palabras) o email empieza por `prefijo`"""
+        usuarios = self.indice_nombres_usuarios.completar(prefijo, limite)
+        if len(usuarios) < limite:
+            for usuario in self.indice_emails_usuarios.completar(prefijo, limite):
+                if len(usuarios) >= limite:
+                    break
+                if all(usuario is not u for u in usuarios):
+                    usuarios.append(usuario)
+        return usuarios
+    
+    def elegir_opcion(self, opciones, encabezado, siempre=False):
+        """Devuelve la única opción o pide elegir una por número (None si no es válida)"""
+        if not opciones:
+            return None
+        if len(opciones) == 1 and not siempre:
+            return opciones[0]
+        
+        print(f"\n{encabezado}")
+        for i, opcion in enumerate(opciones, 1):
+            print(f"  {i}. {opcion}")
+        try:
+            indice = int(input("Seleccione número: ")) - 1
+            elegida = opciones[indice] if indice >= 0 else None
+        except (ValueError, IndexError):
+            elegida = None
+        if elegida is None:
+            print("❌ Selección inválida")
+        return elegida
+    
+    def seleccionar_usuario(self, texto):
+        """Usuario por nombre o email exacto; si no hay, deja elegir entre las completaciones"""
+        usuario = self.buscar_usuario_por_nombre(texto) or self.buscar_usuario_por_email(texto)
+        if usuario or not texto:
+            return usuario
+        
+        return self.elegir_opcion(self.autocompletar_usuarios(texto), "Coincidencias:")
+    
     def buscar_usuario(self):
         """Busca un usuario"""
         print("\n--- BUSCAR USUARIO ---")
@@ -268,13 +472,13 @@ class SistemaCafeteria:
         usuario = None
         if opcion == "1":
             user_id = input("ID del usuario: ").strip()
-            usuario = self.gestor_usuarios.buscar_por_id(user_id)
+            usuario = self.obtener_usuario(user_id)
         elif opcion == "2":
             nombre = input("Nombre: ").strip()
-            usuario = self.gestor_usuarios.buscar_por_nombre(nombre)
+            usuario = self.seleccionar_usuario(nombre)
         elif opcion == "3":
             email = input("Email: ").strip()
-            usuario = self.gestor_usuarios.buscar_por_email(email)
+            usuario = self.buscar_usuario_por_email(email)
         
         if usuario:
             print(f"\n✓ Usuario encontrado:")
@@ -284,6 +488,7 @@ class SistemaCafeteria:
             print(f"  Total gastado: ${info['total_gastado']:.2f}")
             print(f"  Total pedidos: {info['total_pedidos']}")
             print(f"  Promedio por pedido: ${usuario.calcular_promedio_gasto():.2f}")
+            print(f"  Posición por gasto: {self.posicion_por_gasto(usuario)} de {len(self.arbol_gastos)}")
             
             if usuario.preferencias:
                 print(f"  Preferencias: {', '.join(usuario.obtener_preferencias())}")
@@ -295,7 +500,7 @@ class SistemaCafeteria:
     def listar_usuarios(self):
         """Lista todos los usuarios"""
         print("\n--- TODOS LOS USUARIOS ---")
-        usuarios = self.gestor_usuarios.listar_todos()
+        usuarios = self.usuarios_activos()
         
         if not usuarios:
             print("No hay usuarios registrados")
@@ -319,7 +524,7 @@ class SistemaCafeteria:
             print("❌ Tipo inválido")
             return
         
-        usuarios = self.gestor_usuarios.listar_por_tipo(tipo)
+        usuarios = self.usuarios_activos(tipo)
         print(f"\n{tipo.upper()}S ({len(usuarios)}):")
         for usuario in usuarios:
             print(f"  {usuario}")
@@ -329,7 +534,7 @@ class SistemaCafeteria:
         print("\n--- HISTORIAL DE USUARIO (Lista Enlazada) ---")
         
         nombre = input("Nombre del usuario: ").strip()
-        usuario = self.gestor_usuarios.buscar_por_nombre(nombre)
+        usuario = self.seleccionar_usuario(nombre)
         
         if not usuario:
             print("❌ Usuario no encontrado")
@@ -358,7 +563,7 @@ class SistemaCafeteria:
         print("\n--- PREFERENCIAS Y ALERGIAS (Conjuntos) ---")
         
         nombre = input("Nombre del usuario: ").strip()
-        usuario = self.gestor_usuarios.buscar_por_nombre(nombre)
+        usuario = self.seleccionar_usuario(nombre)
         
         if not usuario:
             print("❌ Usuario no encontrado")
@@ -373,6 +578,7 @@ class SistemaCafeteria:
             print("2. Eliminar preferencia")
             print("3. Agregar alergia")
             print("4. Eliminar alergia")
+            print("5. Ver productos aptos según alergias")
             print("0. Volver")
             
             opcion = input("\nOpción: ").strip()
@@ -397,6 +603,11 @@ class SistemaCafeteria:
                     print(f"✓ Eliminado de alergias")
                 else:
                     print("❌ No estaba en alergias")
+            elif opcion == "5":
+                aptos = self.productos_aptos_para(usuario)
+                print(f"\nProductos aptos ({len(aptos)}):")
+                for prod in aptos:
+                    print(f"  {prod}")
             elif opcion == "0":
                 break
     
@@ -415,6 +626,9 @@ class SistemaCafeteria:
             print("  5. Ver productos por rango de precios (Árbol BST)")
             print("  6. Producto más barato/caro (Árbol BST)")
             print("  7. Modificar disponibilidad")
+            print("  8. Estadísticas de precios (Árbol BST)")
+            print("  9. Actualizar precio")
+            print("  10. Cambiar categoría")
             print("  0. Volver")
             print("\n" + "=" * 70)
             
@@ -434,6 +648,12 @@ class SistemaCafeteria:
                 self.productos_extremos()
             elif opcion == "7":
                 self.modificar_disponibilidad()
+            elif opcion == "8":
+                self.estadisticas_precios()
+            elif opcion == "9":
+                self.actualizar_precio_producto()
+            elif opcion == "10":
+                self.actualizar_categoria_producto()
             elif opcion == "0":
                 break
             else:
@@ -457,21 +677,26 @@ class SistemaCafeteria:
         categoria = input("Categoría: ").strip()
         
         producto = self.gestor_productos.registrar_producto(nombre, precio, categoria)
+        self.indice_nombres_productos.agregar(producto.id, producto.nombre, producto)
+        self.indice_difuso_productos.agregar(producto.id, producto.nombre, producto)
         
         print("\nIngredientes (separados por coma, o Enter para omitir):")
         ingredientes_str = input().strip()
         if ingredientes_str:
             for ing in ingredientes_str.split(','):
                 producto.agregar_ingrediente(ing.strip())
+        self.indexar_ingredientes(producto)
         
         self.arbol_precios.insertar(precio, producto)
-        self.categorias_disponibles.agregar(categoria)
-        
-        self.operaciones_deshacer.apilar({
-            'tipo': 'registrar_producto',
-            'producto_id': producto.id,
-            'timestamp': datetime.now()
-        })
+        self.categorias_disponibles.agregar(normalizar_categoria(categoria))
+        self.indice_categorias.agregar(producto.id, categoria, producto.disponible, producto)
+        
+        self.operaciones_deshacer.registrar(
+            'registrar_producto',
+            deshacer=lambda: self.quitar_producto(producto),
+            rehacer=lambda: self.restaurar_producto(producto),
+            producto_id=producto.id
+        )
         
         print(f"\n✓ Producto registrado: {producto}")
     
@@ -480,7 +705,7 @@ class SistemaCafeteria:
         print("\n--- BUSCAR PRODUCTO ---")
         termino = input("Nombre o parte del nombre: ").strip()
         
-        resultados = self.gestor_productos.buscar_por_nombre(termino)
+        resultados = self.buscar_productos(termino)
         
         if resultados:
             print(f"\n✓ Encontrados {len(resultados)} productos:")
@@ -492,27 +717,56 @@ class SistemaCafeteria:
         else:
             print("\n❌ No se encontraron productos")
     
+    def buscar_productos(self, termino):
+        """Productos cuyo nombre contiene `termino` (sin distinguir mayúsculas ni acentos)"""
+        return self.indice_nombres_productos.buscar(termino)
+    
+    def sugerir_productos(self, termino, limite=5):
+        """Productos con nombre parecido a `termino` (tolera errores de tipeo), más vendidos primero"""
+        resultados = self.indice_difuso_productos.buscar(
+            termino, limite, popularidad=lambda p: self.ventas_por_producto.get(p.id, 0))
+        return [producto for producto, _ in resultados]
+    
+    def sugerir_usuarios(self, termino, limite=5):
+        """Usuarios con nombre parecido a `termino`, los de más pedidos primero"""
+        resultados = self.indice_difuso_usuarios.buscar(
+            termino, limite, popularidad=lambda u: u.info['total_pedidos'])
+        return [usuario for usuario, _ in resultados]
+    
+    def productos_activos(self):
+        """Productos del gestor sin los retirados por deshacer"""
+        productos = self.gestor_productos.listar_todos()
+        if not self.productos_retirados:
+            return productos
+        return [p for p in productos if p.id not in self.productos_retirados]
+    
     def listar_productos(self):
         """Lista todos los productos"""
         print("\n--- TODOS LOS PRODUCTOS ---")
-        productos = self.gestor_productos.listar_todos()
+        productos = self.productos_activos()
         
         for prod in productos:
             estado = "✓" if prod.disponible else "✗"
             print(f"  {estado} {prod}")
     
+    def nombres_de_categorias(self):
+        """Categorías con su grafía original (el conjunto guarda las claves normalizadas)"""
+        return [self.indice_categorias.nombre_de(cat) or cat for cat in self.categorias_disponibles]
+    
     def listar_productos_por_categoria(self):
         """Lista productos por categoría"""
         print("\n--- CATEGORÍAS DISPONIBLES ---")
-        categorias = self.categorias_disponibles.obtener_lista()
+        categorias = self.nombres_de_categorias()
         
         for i, cat in enumerate(categorias, 1):
             print(f"  {i}. {cat}")
         
         categoria = input("\nCategoria: ").strip()
         
-        productos = self.gestor_productos.listar_por_categoria(categoria)
-        print(f"\n{categoria} ({len(productos)} productos):")
+        productos = self.indice_categorias.buscar([categoria])
+        disponibles = self.indice_categorias.cantidad(categoria, solo_disponibles=True)
+        nombre = self.indice_categorias.nombre_de(categoria) or categoria
+        print(f"\n{nombre} ({len(productos)} productos, {disponibles} disponibles):")
         for prod in productos:
             print(f"  {prod}")
     
@@ -527,14 +781,20 @@ class SistemaCafeteria:
             print("❌ Precios inválidos")
             return
         
-        resultados = self.arbol_precios.buscar_rango(min_precio, max_precio)
-        
         print(f"\nProductos entre ${min_precio:.2f} y ${max_precio:.2f}:")
         print(f"(Búsqueda eficiente con Árbol BST)\n")
         
-        for item in resultados:
-            producto = item['valor']
-            print(f"  ${item['clave']:.2f} - {producto.nombre}")
+        # Cada página se pide con el cursor (precio, desplazamiento) de la
+        # anterior, así no se pierden productos con el mismo precio
+        cursor = None
+        while True:
+            pagina, cursor = self.arbol_precios.pagina_rango(min_precio, max_precio, cursor, limite=20)
+            for precio, producto in pagina:
+                print(f"  ${precio:.2f} - {producto.nombre}")
+            if cursor is None:
+                break
+            if input("\nEnter para ver más, 'q' para terminar: ").strip().lower() == 'q':
+                break
     
     def productos_extremos(self):
         """Muestra productos más baratos y más caros"""
@@ -549,32 +809,124 @@ class SistemaCafeteria:
         if maximo:
             print(f"Más caro: ${maximo['clave']:.2f} - {maximo['valor'].nombre}")
     
+    def estadisticas_precios(self):
+        """Mediana, percentiles y productos más baratos (Árbol BST con tamaños)"""
+        print("\n--- ESTADÍSTICAS DE PRECIOS (Árbol BST) ---")
+        
+        if self.arbol_precios.esta_vacio():
+            print("No hay productos registrados")
+            return
+        
+        for etiqueta, p in (("P25", 25), ("Mediana", 50), ("P75", 75)):
+            item = self.arbol_precios.percentil(p)
+            print(f"  {etiqueta}: ${item['clave']:.2f} - {item['valor'].nombre}")
+        
+        print("\n20 productos disponibles más baratos:")
+        encontrados = 0
+        k = 0
+        while encontrados < 20:
+            item = self.arbol_precios.seleccionar(k)
+            if item is None:
+                break
+            k += 1
+            if item['valor'].disponible:
+                encontrados += 1
+                print(f"  {encontrados}. ${item['clave']:.2f} - {item['valor'].nombre}")
+        
+        nombre = input("\nPercentil de un producto (Enter para omitir): ").strip()
+        if not nombre:
+            return
+        resultados = self.buscar_productos(nombre)
+        if not resultados:
+            print("❌ Producto no encontrado")
+            return
+        total = len(self.arbol_precios)
+        for prod in resultados:
+            percentil = 100 * self.arbol_precios.rango_de(prod.precio) / total
+            print(f"  {prod.nombre}: más caro que el {percentil:.1f}% del menú")
+    
+    def seleccionar_producto(self, resultados, encabezado="Varios productos encontrados:", siempre=False):
+        """Devuelve el único resultado o pide elegir uno por número (None si no es válido)"""
+        return self.elegir_opcion(resultados, encabezado, siempre)
+    
     def modificar_disponibilidad(self):
         """Modifica disponibilidad de un producto"""
         nombre = input("\nNombre del producto: ").strip()
-        resultados = self.gestor_productos.buscar_por_nombre(nombre)
+        resultados = self.buscar_productos(nombre)
         
         if not resultados:
             print("❌ Producto no encontrado")
             return
         
-        if len(resultados) > 1:
-            print("\nVarios productos encontrados:")
-            for i, prod in enumerate(resultados, 1):
-                print(f"  {i}. {prod}")
-            try:
-                idx = int(input("Seleccione número: ")) - 1
-                producto = resultados[idx]
-            except:
-                print("❌ Selección inválida")
-                return
-        else:
-            producto = resultados[0]
+        producto = self.seleccionar_producto(resultados)
+        if not producto:
+            return
         
         producto.disponible = not producto.disponible
+        self.indice_categorias.marcar_disponible(producto.id, producto.disponible)
+        if producto.id in self.mascaras_ingredientes:
+            self.marcar_disponible_para_alergias(producto)
         estado = "disponible" if producto.disponible else "no disponible"
         print(f"\n✓ Producto ahora está: {estado}")
     
+    def actualizar_precio_producto(self):
+        """Cambia el precio de un producto manteniendo el Árbol BST"""
+        nombre = input("\nNombre del producto: ").strip()
+        resultados = self.buscar_productos(nombre)
+        
+        if not resultados:
+            print("❌ Producto no encontrado")
+            return
+        
+        producto = self.seleccionar_producto(resultados)
+        if not producto:
+            return
+        
+        try:
+            nuevo_precio = float(input(f"Nuevo precio (actual ${producto.precio:.2f}): $").strip())
+        except ValueError:
+            print("❌ Precio inválido")
+            return
+        
+        self.cambiar_precio_producto(producto, nuevo_precio)
+        print(f"\n✓ Precio actualizado: {producto}")
+    
+    def cambiar_precio_producto(self, producto, nuevo_precio):
+        """Actualiza Producto.precio y re-ubica el producto en el árbol en O(log n)"""
+        precio_anterior = producto.precio
+        producto.precio = nuevo_precio
+        self.arbol_precios.actualizar_clave(precio_anterior, nuevo_precio, producto)
+    
+    def actualizar_categoria_producto(self):
+        """Mueve un producto a otra categoría manteniendo el índice de categorías"""
+        nombre = input("\nNombre del producto: ").strip()
+        resultados = self.buscar_productos(nombre)
+        
+        if not resultados:
+            print("❌ Producto no encontrado")
+            return
+        
+        producto = self.seleccionar_producto(resultados)
+        if not producto:
+            return
+        
+        categoria = input(f"Nueva categoría (actual {producto.categoria}): ").strip()
+        if not categoria:
+            print("❌ Categoría no puede estar vacía")
+            return
+        
+        self.cambiar_categoria_producto(producto, categoria)
+        print(f"\n✓ {producto.nombre} ahora está en {producto.categoria}")
+    
+    def cambiar_categoria_producto(self, producto, nueva_categoria):
+        """Actualiza Producto.categoria, el índice y el conjunto de categorías"""
+        anterior = producto.categoria
+        producto.categoria = nueva_categoria
+        self.indice_categorias.cambiar_categoria(producto.id, nueva_categoria)
+        self.categorias_disponibles.agregar(normalizar_categoria(nueva_categoria))
+        if anterior not in self.indice_categorias:
+            self.categorias_disponibles.eliminar(normalizar_categoria(anterior))
+    
     def realizar_pedido(self):
         """Crea un nuevo pedido"""
         print("\n" + "=" * 70)
@@ -582,7 +934,7 @@ class SistemaCafeteria:
         print("=" * 70)
         
         nombre_usuario = input("\nNombre del usuario: ").strip()
-        usuario = self.gestor_usuarios.buscar_por_nombre(nombre_usuario)
+        usuario = self.seleccionar_usuario(nombre_usuario)
         
         if not usuario:
             print("❌ Usuario no encontrado")
@@ -609,30 +961,27 @@ class SistemaCafeteria:
             if nombre_prod.lower() == 'fin':
                 break
             
-            resultados = self.gestor_productos.buscar_por_nombre(nombre_prod)
+            resultados = self.buscar_productos(nombre_prod)
+            aproximados = not resultados
+            if aproximados:
+                resultados = self.sugerir_productos(nombre_prod)
             
             if not resultados:
                 print("❌ Producto no encontrado")
                 continue
             
-            if len(resultados) > 1:
-                print("\nVarios productos encontrados:")
-                for i, prod in enumerate(resultados, 1):
-                    print(f"  {i}. {prod}")
-                try:
-                    idx = int(input("Seleccione número: ")) - 1
-                    producto = resultados[idx]
-                except:
-                    print("❌ Selección inválida")
-                    continue
+            if aproximados:
+                producto = self.seleccionar_producto(resultados, "¿Quiso decir...?", siempre=True)
             else:
-                producto = resultados[0]
+                producto = self.seleccionar_producto(resultados)
+            if not producto:
+                continue
             
             if not producto.disponible:
                 print(f"❌ {producto.nombre} no está disponible")
                 continue
             
-            puede_consumir, alergenos = usuario.puede_consumir_producto(producto)
+            puede_consumir, alergenos = self.verificar_alergenos(usuario, producto)
             if not puede_consumir:
                 print(f"⚠️  ADVERTENCIA: Este producto contiene: {', '.join(alergenos)}")
                 confirmar = input("¿Continuar de todos modos? (s/n): ")
@@ -650,17 +999,17 @@ class SistemaCafeteria:
         
         pedido = Pedido(usuario, productos_pedido)
         
-        pedido_id = self.cola_pedidos.agregar(
-            pedido.prioridad,
-            pedido,
-            pedido.id
-        )
+        pedido_id = self.encolar_pedido(pedido)
+        if pedido_id is None:
+            print("\n❌ No se pudo encolar el pedido")
+            return
         
-        self.operaciones_deshacer.apilar({
-            'tipo': 'realizar_pedido',
-            'pedido_id': pedido_id,
-            'timestamp': datetime.now()
-        })
+        self.operaciones_deshacer.registrar(
+            'realizar_pedido',
+            deshacer=lambda: self.retirar_pedido_de_cola(pedido.id),
+            rehacer=lambda: self.encolar_pedido(pedido) is not None,
+            pedido_id=pedido_id
+        )
         
         print("\n" + "=" * 70)
         print("  ✓ PEDIDO CREADO EXITOSAMENTE")
@@ -685,41 +1034,108 @@ class SistemaCafeteria:
             print("\n  No hay pedidos en cola")
             return
         
-        pedidos = self.cola_pedidos.ver_todos()
-        
-        print(f"\nTotal de pedidos en cola: {len(pedidos)}\n")
+        # Solo se ordenan los primeros: O(k log k) en lugar de ordenar todo el heap.
+        # La foto se toma bajo el candado por si hay estaciones atendiendo; los
+        # resúmenes también, para no cachear uno que una estación ya descartó.
+        limite = 20
+        with self.cola_concurrente.condicion:
+            pedidos = self.cola_pedidos.ver_primeros(limite)
+            resumenes = [self.obtener_resumen_pedido(item['pedido']) for item in pedidos]
+            total_en_cola = self.cola_pedidos.tamanio()
+            siguiente = self.cola_pedidos.ver_siguiente()
+            muestras_espera = self.cola_pedidos.copiar_muestras_espera()
+        # Ordenar hasta 10k muestras por nivel fuera del candado
+        esperas = self.cola_pedidos.estadisticas_espera(muestras_espera)
+        
+        print(f"\nTotal de pedidos en cola: {total_en_cola}\n")
         print("Orden de atención (por prioridad):\n")
         
-        for i, item in enumerate(pedidos, 1):
-            pedido = item['pedido']
-            prioridad = item['prioridad']
+        tipo_emoji = {1: "🎓 PROFESOR", 2: "👔 STAFF", 3: "👤 ESTUDIANTE"}
+        for i, (item, resumen) in enumerate(zip(pedidos, resumenes), 1):
+            tipo = tipo_emoji.get(item['prioridad'], "👤 CLIENTE")
             
-            tipo_emoji = {1: "🎓 PROFESOR", 2: "👔 STAFF", 3: "👤 ESTUDIANTE"}
-            tipo = tipo_emoji.get(prioridad, "👤 CLIENTE")
-            
-            print(f"{i}. [{tipo}] {pedido.id}")
-            print(f"   Usuario: {pedido.usuario.obtener_nombre()}")
-            print(f"   Total: ${pedido.calcular_total():.2f}")
-            print(f"   Productos: {len(pedido.productos)}")
+            print(f"{i}. [{tipo}] {item['id']}")
+            print(f"   Usuario: {resumen['usuario']}")
+            print(f"   Total: ${resumen['total']:.2f}")
+            print(f"   Productos: {resumen['productos']}")
             print()
         
+        if total_en_cola > limite:
+            print(f"... y {total_en_cola - limite} pedidos más\n")
+        
         print("=" * 70)
         
-        siguiente = self.cola_pedidos.ver_siguiente()
         if siguiente:
             pedido_sig = siguiente['pedido']
             print(f"\n→ SIGUIENTE A ATENDER: {pedido_sig.id} - {pedido_sig.usuario.obtener_nombre()}")
+        
+        if esperas:
+            print("\nEspera por nivel (segundos):")
+            for prioridad, datos in esperas.items():
+                print(f"  Nivel {prioridad}: p50 {datos['p50']:.0f}  p95 {datos['p95']:.0f}  "
+                      f"p99 {datos['p99']:.0f}  (máx. garantizado {datos['espera_maxima']})")
+        
+        self.gestionar_pedido_en_cola()
+    
+    def obtener_resumen_pedido(self, pedido):
+        """Resumen cacheado de un pedido en cola (llamar con el candado de la cola)"""
+        resumen = self.resumenes_cola.get(pedido.id)
+        if resumen is None:
+            resumen = {
+                'usuario': pedido.usuario.obtener_nombre(),
+                'total': pedido.calcular_total(),
+                'productos': len(pedido.productos)
+            }
+            self.resumenes_cola[pedido.id] = resumen
+        return resumen
+    
+    def gestionar_pedido_en_cola(self):
+        """Cancela o cambia la prioridad de un pedido en espera (O(log n))"""
+        print("\nc. Cancelar pedido   p. Cambiar prioridad   Enter. Volver")
+        accion = input("Acción: ").strip().lower()
+        if accion not in ("c", "p"):
+            return
+        
+        pedido_id = input("ID del pedido: ").strip()
+        
+        if accion == "c":
+            if self.retirar_pedido_de_cola(pedido_id):
+                print(f"✓ Pedido {pedido_id} cancelado")
+            else:
+                print("❌ Pedido no encontrado en la cola")
+            return
+        
+        try:
+            nueva = int(input("Nueva prioridad (1=alta, 2=media, 3=normal): ").strip())
+        except ValueError:
+            nueva = None
+        if nueva not in (1, 2, 3):
+            print("❌ Prioridad inválida")
+            return
+        
+        # Buscar y actualizar el pedido bajo el mismo candado: si no, una
+        # estación podría atenderlo entre el cambio y la búsqueda
+        with self.cola_concurrente.condicion:
+            cambiado = self.cola_pedidos.cambiar_prioridad(pedido_id, nueva)
+            if cambiado:
+                self.cola_pedidos.buscar_por_id(pedido_id)['pedido'].prioridad = nueva
+        
+        if cambiado:
+            print(f"✓ Pedido {pedido_id} ahora tiene prioridad {nueva}")
+        else:
+            print("❌ Pedido no encontrado en la cola")
     
     def procesar_siguiente_pedido(self):
         """Procesa el siguiente pedido"""
         print("\n--- PROCESAR SIGUIENTE PEDIDO ---")
         
-        if self.cola_pedidos.esta_vacia():
+        item = self.cola_concurrente.get(timeout=0)
+        if item is None:
             print("❌ No hay pedidos en cola")
             return
         
-        item = self.cola_pedidos.atender_siguiente()
         pedido = item['pedido']
+        self.resumenes_cola.pop(pedido.id, None)
         
         print(f"\n→ Atendiendo pedido: {pedido.id}")
         print(f"  Usuario: {pedido.usuario.obtener_nombre()}")
@@ -734,6 +1150,13 @@ class SistemaCafeteria:
         input("Presione Enter para entregar...")
         pedido.cambiar_estado("entregado")
         
+        self.completar_pedido(pedido)
+        
+        print(f"\n✓ Pedido {pedido.id} completado")
+        print(f"\nPedidos restantes en cola: {self.cola_concurrente.tamanio()}")
+    
+    def completar_pedido(self, pedido):
+        """Registra un pedido entregado en el historial y los totales (thread-safe)"""
         pedido_info = {
             'id': pedido.id,
             'productos': [p.nombre for p in pedido.productos],
@@ -741,234 +1164,610 @@ class SistemaCafeteria:
             'fecha': datetime.now().strftime('%Y-%m-%d %H:%M'),
             'estado': 'entregado'
         }
-        pedido.usuario.agregar_pedido_al_historial(pedido_info)
-        self.total_pedidos_procesados += 1
-        self.ventas_totales += pedido.calcular_total()
+        with self._lock_ventas:
+            self.liberar_pendiente(pedido)
+            usuario = pedido.usuario
+            gasto_anterior = usuario.info['total_gastado']
+            usuario.agregar_pedido_al_historial(pedido_info)
+            # Un usuario retirado vuelve al ranking con su gasto al restaurarlo
+            if usuario.obtener_id() not in self.usuarios_retirados:
+                self.arbol_gastos.actualizar_clave(
+                    (gasto_anterior, usuario.obtener_id()),
+                    (usuario.info['total_gastado'], usuario.obtener_id()),
+                    usuario
+                )
+            self.estadisticas_usuarios.registrar_pedido(usuario.obtener_id(), pedido_info['total'])
+            if self.almacen_pedidos is not None:
+                self.almacen_pedidos.agregar(
+                    pedido.id, usuario.obtener_id(), usuario.tipo,
+                    pedido_info['fecha'], pedido_info['total'], pedido_info['estado'],
+                    [p.id for p in pedido.productos]
+                )
+            self.total_pedidos_procesados += 1
+            self.ventas_totales += pedido_info['total']
+            self.ventas_por_periodo.registrar(pedido_info['fecha'], pedido_info['total'])
+            for producto in pedido.productos:
+                self.registrar_venta_producto(producto)
+        return pedido_info
+    
+    def registrar_venta_producto(self, producto, unidades=1):
+        """Suma ventas al contador del producto y lo re-ubica en el árbol de popularidad (con _lock_ventas)"""
+        anteriores = self.ventas_por_producto.get(producto.id, 0)
+        nuevas = anteriores + unidades
+        self.ventas_por_producto[producto.id] = nuevas
+        if producto.id in self.productos_retirados:
+            # Fuera del catálogo: la venta se cuenta, pero vuelve al ranking al restaurarlo
+            return
+        if anteriores:
+            self.arbol_popularidad.actualizar_clave((anteriores, producto.id), (nuevas, producto.id), producto)
+        else:
+            self.arbol_popularidad.insertar((nuevas, producto.id), producto)
+    
+    def clave_gasto(self, usuario):
+        """Clave del usuario en arbol_gastos"""
+        return (usuario.info['total_gastado'], usuario.obtener_id())
+    
+    def usuarios_top_gasto(self, k=10):
+        """Los k usuarios de mayor gasto en O(log n + k)"""
+        with self._lock_ventas:
+            return [usuario for _, usuario in self.arbol_gastos.iter_rango_inverso(limite=k)]
+    
+    def posicion_por_gasto(self, usuario):
+        """Puesto del usuario en el ranking de gasto (1 = el que más gastó)"""
+        with self._lock_ventas:
+            return len(self.arbol_gastos) - self.arbol_gastos.rango_de(self.clave_gasto(usuario))
+    
+    def usuarios_con_gasto_desde(self, monto, limite=None):
+        """(cantidad, usuarios) con total_gastado >= monto, de mayor a menor gasto"""
+        # (monto,) es menor que cualquier (monto, usuario_id)
+        with self._lock_ventas:
+            cantidad = len(self.arbol_gastos) - self.arbol_gastos.rango_de((monto,))
+            usuarios = [usuario for _, usuario in
+                        self.arbol_gastos.iter_rango_inverso(min_clave=(monto,), limite=limite)]
+        return cantidad, usuarios
+    
+    def productos_populares(self, k=10):
+        """[(producto, unidades)] de los k más vendidos en O(log n + k)"""
+        with self._lock_ventas:
+            return [(producto, clave[0])
+                    for clave, producto in self.arbol_popularidad.iter_rango_inverso(limite=k)]
+    
+    def preparar_en_estacion(self, item, estacion):
+        """Ciclo completo de un pedido en una estación de cocina"""
+        pedido = item['pedido']
+        self.resumenes_cola.pop(pedido.id, None)
+        pedido.cambiar_estado("preparando")
+        pedido.cambiar_estado("listo")
+        pedido.cambiar_estado("entregado")
+        self.completar_pedido(pedido)
+    
+    def gestionar_estaciones_cocina(self):
+        """Inicia o detiene el pool de estaciones que atienden la cola"""
+        print("\n--- ESTACIONES DE COCINA ---")
+        
+        if self.estaciones and self.estaciones.esta_activo():
+            print(f"Estaciones activas: {self.estaciones.num_estaciones}")
+            for estacion, cantidad in self.estaciones.procesados.items():
+                print(f"  {estacion}: {cantidad} pedidos")
+            if self.estaciones.errores:
+                print(f"  Errores: {len(self.estaciones.errores)}")
+            print(f"Pedidos en cola: {self.cola_concurrente.tamanio()}")
+            if input("\n¿Detener estaciones? (s/n): ").strip().lower() == 's':
+                self.estaciones.detener(vaciar=False)
+                print("✓ Estaciones detenidas")
+            return
         
-        print(f"\n✓ Pedido {pedido.id} completado")
-        print(f"\nPedidos restantes en cola: {self.cola_pedidos.tamanio()}")
+        try:
+            cantidad = int(input("Número de estaciones: ").strip())
+        except ValueError:
+            print("❌ Número inválido")
+            return
+        if cantidad < 1:
+            print("❌ Debe haber al menos una estación")
+            return
+        
+        self.estaciones = EstacionesCocina(
+            self.cola_concurrente,
+            self.preparar_en_estacion,
+            num_estaciones=cantidad
+        )
+        self.estaciones.iniciar()
+        print(f"✓ {cantidad} estaciones atendiendo la cola de pedidos")
     
-        def menu_historial_estadisticas(self):  
-            """Menú de historial y estadísticas"""
-    self.historial_navegacion.apilar("Historial y Estadisticas")
+    def menu_historial_estadisticas(self):
+        """Menú de historial y estadísticas"""
+        self.historial_navegacion.apilar("Historial y Estadisticas")
     
-    while True:
-        print("\n" + "=" * 70)
-        print("  HISTORIAL Y ESTADÍSTICAS")
-        print("=" * 70)
-        print("\n  1. Estadísticas generales del sistema")
-        print("  2. Ver historial de navegación (Pila)")
-        print("  3. Top usuarios por gasto")
-        print("  4. Productos más vendidos")
-        print("  5. Estadísticas por tipo de usuario")
-        print("  0. Volver")
-        print("\n" + "=" * 70)
+        while True:
+            print("\n" + "=" * 70)
+            print("  HISTORIAL Y ESTADÍSTICAS")
+            print("=" * 70)
+            print("\n  1. Estadísticas generales del sistema")
+            print("  2. Ver historial de navegación (Pila)")
+            print("  3. Top usuarios por gasto")
+            print("  4. Productos más vendidos")
+            print("  5. Estadísticas por tipo de usuario")
+            print("  6. Verificar consistencia de estadísticas")
+            print("  7. Reporte de ventas por período (NumPy)")
+            print("  8. Ritmo de ventas (últimos minutos, horas y días)")
+            print("  0. Volver")
+            print("\n" + "=" * 70)
         
-        opcion = input("\nSeleccione una opción: ").strip()
+            opcion = input("\nSeleccione una opción: ").strip()
         
-        if opcion == "1":
-            self.estadisticas_generales()
-        elif opcion == "2":
-            self.ver_historial_navegacion()
-        elif opcion == "3":
-            self.top_usuarios()
-        elif opcion == "4":
-            self.productos_mas_vendidos()
-        elif opcion == "5":
-            self.estadisticas_por_tipo()
-        elif opcion == "0":
-            break
-        else:
-            print("\n❌ Opción inválida")
-
-def estadisticas_generales(self):
-    """Estadísticas generales"""
-    print("\n" + "=" * 70)
-    print("  ESTADÍSTICAS GENERALES DEL SISTEMA")
-    print("=" * 70)
-    
-    stats_usuarios = self.gestor_usuarios.obtener_estadisticas()
-    
-    print(f"\n📊 USUARIOS:")
-    print(f"  Total registrados: {stats_usuarios['total_usuarios']}")
-    print(f"  Por tipo:")
-    for tipo, cantidad in stats_usuarios['por_tipo'].items():
-        print(f"    - {tipo.capitalize()}: {cantidad}")
-    
-    print(f"\n💰 VENTAS:")
-    print(f"  Total de pedidos procesados: {self.total_pedidos_procesados}")
-    print(f"  Ventas totales: ${self.ventas_totales:.2f}")
-    if self.total_pedidos_procesados > 0:
-        promedio = self.ventas_totales / self.total_pedidos_procesados
-        print(f"  Ticket promedio: ${promedio:.2f}")
-    
-    print(f"\n📦 PRODUCTOS:")
-    print(f"  Total en catálogo: {len(self.gestor_productos)}")
-    print(f"  Categorías: {self.categorias_disponibles.tamanio()}")
-    
-    print(f"\n⏳ COLA ACTUAL:")
-    print(f"  Pedidos en espera: {self.cola_pedidos.tamanio()}")
-    
-    print("\n" + "=" * 70)
+            if opcion == "1":
+                self.estadisticas_generales()
+            elif opcion == "2":
+                self.ver_historial_navegacion()
+            elif opcion == "3":
+                self.top_usuarios()
+            elif opcion == "4":
+                self.productos_mas_vendidos()
+            elif opcion == "5":
+                self.estadisticas_por_tipo()
+            elif opcion == "6":
+                diferencias = self.verificar_estadisticas()
+                if diferencias:
+                    print("\n❌ Estadísticas inconsistentes:")
+                    for diferencia in diferencias:
+                        print(f"  - {diferencia}")
+                else:
+                    print("\n✓ Estadísticas consistentes con los datos")
+            elif opcion == "7":
+                self.reporte_ventas()
+            elif opcion == "8":
+                self.ritmo_ventas()
+            elif opcion == "0":
+                break
+            else:
+                print("\n❌ Opción inválida")
 
-def ver_historial_navegacion(self):
-    """Historial de navegación"""
-    print("\n--- HISTORIAL DE NAVEGACIÓN (Pila - LIFO) ---")
+    def estadisticas_generales(self):
+        """Estadísticas generales"""
+        print("\n" + "=" * 70)
+        print("  ESTADÍSTICAS GENERALES DEL SISTEMA")
+        print("=" * 70)
     
-    if self.historial_navegacion.esta_vacia():
-        print("Sin historial")
-        return
+        por_tipo = self.estadisticas_usuarios.obtener_todos()
     
-    print(f"\nÚltimas {len(self.historial_navegacion)} pantallas visitadas:\n")
+        print(f"\n📊 USUARIOS:")
+        print(f"  Total registrados: {len(self.estadisticas_usuarios)}")
+        print(f"  Por tipo:")
+        for tipo, stats in por_tipo.items():
+            print(f"    - {tipo.capitalize()}: {stats['cantidad']}")
     
-    for i, pantalla in enumerate(self.historial_navegacion.ver_todos(), 1):
-        print(f"  {i}. {pantalla}")
+        print(f"\n💰 VENTAS:")
+        print(f"  Total de pedidos procesados: {self.total_pedidos_procesados}")
+        print(f"  Ventas totales: ${self.ventas_totales:.2f}")
+        if self.total_pedidos_procesados > 0:
+            promedio = self.ventas_totales / self.total_pedidos_procesados
+            print(f"  Ticket promedio: ${promedio:.2f}")
     
-    print(f"\nPantalla actual (tope de la pila): {self.historial_navegacion.ver_tope()}")
-
-def top_usuarios(self):
-    """Top usuarios"""
-    print("\n--- TOP USUARIOS POR GASTO ---")
-    
-    usuarios = self.gestor_usuarios.listar_todos()
-    usuarios_ordenados = sorted(
-        usuarios,
-        key=lambda u: u.info['total_gastado'],
-        reverse=True
-    )
-    
-    print("\nTop 10 usuarios:\n")
-    for i, usuario in enumerate(usuarios_ordenados[:10], 1):
-        print(f"{i}. {usuario.obtener_nombre()}")
-        print(f"   Total gastado: ${usuario.info['total_gastado']:.2f}")
-        print(f"   Pedidos: {usuario.info['total_pedidos']}")
-        print(f"   Promedio: ${usuario.calcular_promedio_gasto():.2f}")
-        print()
+        print(f"\n📦 PRODUCTOS:")
+        print(f"  Total en catálogo: {len(self.gestor_productos) - len(self.productos_retirados)}")
+        print(f"  Categorías: {self.categorias_disponibles.tamanio()}")
+    
+        print(f"\n⏳ COLA ACTUAL:")
+        print(f"  Pedidos en espera: {self.cola_pedidos.tamanio()}")
+    
+        print("\n" + "=" * 70)
 
-def productos_mas_vendidos(self):
-    """Productos más vendidos"""
-    print("\n--- PRODUCTOS MÁS POPULARES ---")
-    print("(Basado en historial de pedidos)\n")
+    def ver_historial_navegacion(self):
+        """Historial de navegación"""
+        print("\n--- HISTORIAL DE NAVEGACIÓN (Pila - LIFO) ---")
     
-    conteo = {}
+        if self.historial_navegacion.esta_vacia():
+            print("Sin historial")
+            return
     
-    for usuario in self.gestor_usuarios.listar_todos():
-        for pedido in usuario.obtener_historial_completo():
-            for prod_nombre in pedido['productos']:
-                conteo[prod_nombre] = conteo.get(prod_nombre, 0) + 1
+        print(f"\nÚltimas {len(self.historial_navegacion)} pantallas visitadas:\n")
     
-    ordenados = sorted(conteo.items(), key=lambda x: x[1], reverse=True)
+        for i, pantalla in enumerate(self.historial_navegacion.ver_todos(), 1):
+            print(f"  {i}. {pantalla}")
     
-    for i, (producto, cantidad) in enumerate(ordenados[:10], 1):
-        print(f"{i}. {producto}: {cantidad} veces")
+        print(f"\nPantalla actual (tope de la pila): {self.historial_navegacion.ver_tope()}")
 
-def estadisticas_por_tipo(self):
-    """Estadísticas por tipo"""
-    print("\n--- ESTADÍSTICAS POR TIPO DE USUARIO ---")
+    def top_usuarios(self):
+        """Top usuarios"""
+        print("\n--- TOP USUARIOS POR GASTO ---")
     
-    for tipo in ['profesor', 'estudiante', 'staff']:
-        usuarios = self.gestor_usuarios.listar_por_tipo(tipo)
+        print("\nTop 10 usuarios:\n")
+        for i, usuario in enumerate(self.usuarios_top_gasto(10), 1):
+            print(f"{i}. {usuario.obtener_nombre()}")
+            print(f"   Total gastado: ${usuario.info['total_gastado']:.2f}")
+            print(f"   Pedidos: {usuario.info['total_pedidos']}")
+            print(f"   Promedio: ${usuario.calcular_promedio_gasto():.2f}")
+            print()
         
-        if not usuarios:
-            continue
-        
-        total_gastado = sum(u.info['total_gastado'] for u in usuarios)
-        total_pedidos = sum(u.info['total_pedidos'] for u in usuarios)
-        
-        print(f"\n{tipo.upper()}S:")
-        print(f"  Cantidad: {len(usuarios)}")
-        print(f"  Total gastado: ${total_gastado:.2f}")
-        print(f"  Total pedidos: {total_pedidos}")
-        if usuarios:
-            promedio = total_gastado / len(usuarios)
-            print(f"  Promedio por persona: ${promedio:.2f}")
+        monto = input("Contar usuarios con gasto de al menos $ (Enter para omitir): ").strip()
+        if monto:
+            try:
+                cantidad, _ = self.usuarios_con_gasto_desde(float(monto))
+            except ValueError:
+                print("❌ Monto inválido")
+                return
+            print(f"\n{cantidad} usuarios gastaron al menos ${float(monto):.2f}")
 
-def menu_busqueda(self):
-    """Menú de búsqueda"""
-    print("\n--- BÚSQUEDA (Algoritmos de Cadenas) ---")
-    print("1. Buscar productos")
-    print("2. Buscar usuarios")
+    def productos_mas_vendidos(self):
+        """Productos más vendidos"""
+        print("\n--- PRODUCTOS MÁS POPULARES ---")
+        print("(Basado en historial de pedidos)\n")
     
-    opcion = input("\nOpción: ").strip()
+        for i, (producto, cantidad) in enumerate(self.productos_populares(10), 1):
+            print(f"{i}. {producto.nombre}: {cantidad} veces")
+
+    def estadisticas_por_tipo(self):
+        """Estadísticas por tipo"""
+        print("\n--- ESTADÍSTICAS POR TIPO DE USUARIO ---")
     
-    if opcion == "1":
-        termino = input("Término de búsqueda: ").strip().lower()
-        resultados = self.gestor_productos.buscar_por_nombre(termino)
+        for tipo in self.TIPOS_USUARIO:
+            stats = self.estadisticas_usuarios.obtener(tipo)
         
-        print(f"\nEncontrados {len(resultados)} productos:")
-        for prod in resultados:
-            print(f"  {prod}")
+            if not stats['cantidad']:
+                continue
+        
+            print(f"\n{tipo.upper()}S:")
+            print(f"  Cantidad: {stats['cantidad']}")
+            print(f"  Total gastado: ${stats['total_gastado']:.2f}")
+            print(f"  Total pedidos: {stats['total_pedidos']}")
+            print(f"  Promedio por persona: ${stats['promedio_por_persona']:.2f}")
+            print(f"  Ticket promedio: ${stats['ticket_promedio']:.2f}")
     
-    elif opcion == "2":
-        termino = input("Nombre: ").strip()
-        usuario = self.gestor_usuarios.buscar_por_nombre(termino)
+    def reporte_ventas(self):
+        """Ventas por tipo, hora y producto en un rango de fechas (almacén columnar)"""
+        print("\n--- REPORTE DE VENTAS (Almacén columnar) ---")
         
-        if usuario:
-            print(f"\n✓ {usuario}")
-        else:
-            print("\n❌ No encontrado")
+        if self.almacen_pedidos is None:
+            print("❌ Este reporte requiere NumPy (pip install numpy)")
+            return
+        
+        desde = input("Desde (AAAA-MM-DD, Enter = inicio): ").strip() or None
+        hasta = input("Hasta (AAAA-MM-DD, Enter = hoy): ").strip() or None
+        try:
+            if hasta is not None:
+                hasta = f"{hasta} 23:59"
+            with self._lock_ventas:
+                pedidos, total = self.almacen_pedidos.total_ventas(desde, hasta)
+                por_tipo = self.almacen_pedidos.ventas_por_tipo(desde, hasta)
+                por_hora, totales_hora = self.almacen_pedidos.ventas_por_hora(desde, hasta)
+                por_producto = self.almacen_pedidos.unidades_por_producto(desde, hasta)
+        except ValueError:
+            print("❌ Fecha inválida")
+            return
+        
+        print(f"\nPedidos: {pedidos}  Ventas: ${total:.2f}")
+        
+        print("\nPor tipo de usuario:")
+        for tipo, datos in por_tipo.items():
+            print(f"  {tipo}: {datos['pedidos']} pedidos, ${datos['total']:.2f}")
+        
+        print("\nPor hora del día:")
+        for hora in range(24):
+            if por_hora[hora]:
+                print(f"  {hora:02d}:00  {por_hora[hora]:>6} pedidos  ${totales_hora[hora]:.2f}")
+        
+        print("\nProductos más vendidos en el período:")
+        mas_vendidos = sorted(por_producto.items(), key=lambda x: x[1], reverse=True)[:10]
+        for i, (pid, unidades) in enumerate(mas_vendidos, 1):
+            producto = self.gestor_productos.buscar_por_id(pid)
+            nombre = producto.nombre if producto else pid
+            print(f"  {i}. {nombre}: {unidades} unidades")
+    
+    def ritmo_ventas(self):
+        """Ventanas deslizantes de pedidos e importe (rollups por minuto, hora y día)"""
+        print("\n--- RITMO DE VENTAS ---")
+        
+        with self._lock_ventas:
+            pedidos_5, total_5 = self.ventas_por_periodo.ventana('minuto', 5)
+            pedidos_60, total_60 = self.ventas_por_periodo.ventana('minuto', 60)
+            (pedidos_hora, total_hora), (pedidos_semana, total_semana) = \
+                self.ventas_por_periodo.comparar('hora', timedelta(days=7))
+            ultimas_horas = self.ventas_por_periodo.serie('hora', 12)
+            ultimos_dias = self.ventas_por_periodo.serie('dia', 7)
+        
+        print(f"\nÚltimos 5 minutos: {pedidos_5} pedidos (${total_5:.2f}), "
+              f"{pedidos_5 / 5:.1f} pedidos/min")
+        print(f"Últimos 60 minutos: {pedidos_60} pedidos (${total_60:.2f})")
+        
+        print(f"\nEsta hora: {pedidos_hora} pedidos, ${total_hora:.2f}")
+        print(f"Misma hora hace una semana: {pedidos_semana} pedidos, ${total_semana:.2f}")
+        if total_semana > 0:
+            variacion = (total_hora - total_semana) / total_semana * 100
+            print(f"Variación: {variacion:+.1f}%")
+        
+        print("\nÚltimas 12 horas:")
+        for inicio, pedidos, total in ultimas_horas:
+            print(f"  {inicio.strftime('%d/%m %H:00')}  {pedidos:>5} pedidos  ${total:.2f}")
+        
+        print("\nÚltimos 7 días:")
+        for inicio, pedidos, total in ultimos_dias:
+            print(f"  {inicio.strftime('%Y-%m-%d')}  {pedidos:>5} pedidos  ${total:.2f}")
+    
+    def verificar_estadisticas(self):
+        """Recalcula los agregados por tipo desde los usuarios y devuelve las diferencias"""
+        miembros = (
+            (u.obtener_id(), tipo, u.info['total_gastado'], u.info['total_pedidos'])
+            for tipo in self.TIPOS_USUARIO
+            for u in self.usuarios_activos(tipo)
+        )
+        with self._lock_ventas:
+            return self.estadisticas_usuarios.verificar(miembros)
 
-def menu_conjuntos(self):
-    """Operaciones con conjuntos"""
-    print("\n--- OPERACIONES CON CONJUNTOS ---")
-    print("\nCategorías disponibles:")
-    print(self.categorias_disponibles)
-    
-    print("\n1. Ver todas las categorías")
-    print("2. Buscar productos de múltiples categorías")
-    
-    opcion = input("\nOpción: ").strip()
-    
-    if opcion == "1":
-        print("\nCategorías:")
-        for cat in self.categorias_disponibles:
-            print(f"  - {cat}")
-    
-    elif opcion == "2":
-        print("\nIngrese categorías separadas por coma:")
-        cats_str = input().strip()
-        categorias = [c.strip() for c in cats_str.split(',')]
-        
-        productos_totales = []
-        for cat in categorias:
-            productos_totales.extend(
-                self.gestor_productos.listar_por_categoria(cat)
-            )
+    def menu_busqueda(self):
+        """Menú de búsqueda"""
+        print("\n--- BÚSQUEDA (Algoritmos de Cadenas) ---")
+        print("1. Buscar productos")
+        print("2. Buscar usuarios")
+    
+        opcion = input("\nOpción: ").strip()
+    
+        if opcion == "1":
+            termino = input("Término de búsqueda: ").strip().lower()
+            resultados = self.buscar_productos(termino)
         
-        productos_unicos = list(set(productos_totales))
+            print(f"\nEncontrados {len(resultados)} productos:")
+            for prod in resultados:
+                print(f"  {prod}")
+            if not resultados:
+                sugerencias = self.sugerir_productos(termino)
+                if sugerencias:
+                    print("\n¿Quiso decir...?")
+                    for prod in sugerencias:
+                        print(f"  {prod}")
+    
+        elif opcion == "2":
+            termino = input("Nombre: ").strip()
+            usuario = self.buscar_usuario_por_nombre(termino)
         
-        print(f"\nProductos en {' o '.join(categorias)}:")
-        for prod in productos_unicos:
-            print(f"  {prod}")
+            if usuario:
+                print(f"\n✓ {usuario}")
+            else:
+                sugerencias = self.autocompletar_usuarios(termino) or self.sugerir_usuarios(termino)
+                if sugerencias:
+                    print("\n¿Quiso decir...?")
+                    for usuario in sugerencias:
+                        print(f"  {usuario}")
+                else:
+                    print("\n❌ No encontrado")
 
-def deshacer_operacion(self):
-    """Deshace operación"""
-    print("\n--- DESHACER ÚLTIMA OPERACIÓN (Pila) ---")
+    def menu_conjuntos(self):
+        """Operaciones con conjuntos"""
+        print("\n--- OPERACIONES CON CONJUNTOS ---")
+        nombres = self.nombres_de_categorias()
+        print("\nCategorías disponibles:")
+        print(', '.join(nombres) if nombres else "(ninguna)")
     
-    if self.operaciones_deshacer.esta_vacia():
-        print("❌ No hay operaciones para deshacer")
-        return
+        print("\n1. Ver todas las categorías")
+        print("2. Buscar productos de múltiples categorías")
     
-    operacion = self.operaciones_deshacer.desapilar()
+        opcion = input("\nOpción: ").strip()
     
-    print(f"\nDeshaciendo: {operacion['tipo']}")
-    print(f"Timestamp: {operacion['timestamp']}")
+        if opcion == "1":
+            print("\nCategorías:")
+            for cat in nombres:
+                print(f"  - {cat}")
+    
+        elif opcion == "2":
+            print("\nIngrese categorías separadas por coma:")
+            cats_str = input().strip()
+            categorias = [c.strip() for c in cats_str.split(',')]
+            solo_disponibles = input("¿Solo disponibles? (s/n): ").strip().lower() == 's'
+        
+            # Unión de los sets de cada categoría (e intersección con disponibles)
+            productos_unicos = self.indice_categorias.buscar(categorias, solo_disponibles)
+        
+            print(f"\nProductos en {' o '.join(categorias)}:")
+            for prod in productos_unicos:
+                print(f"  {prod}")
+
+    def deshacer_operacion(self):
+        """Deshace operación"""
+        print("\n--- DESHACER ÚLTIMA OPERACIÓN (Pila) ---")
+        
+        operacion = self.operaciones_deshacer.deshacer()
+        if operacion is None:
+            print("❌ No hay operaciones para deshacer")
+            return
+        
+        print(f"\nDeshaciendo: {operacion['tipo']}")
+        print(f"Timestamp: {operacion['timestamp']}")
+        
+        if operacion['exito']:
+            print(f"\n✓ Operación deshecha")
+        else:
+            print(f"\n❌ Ya no se puede deshacer (ya tiene pedidos atendidos o ventas)")
+        print(f"Operaciones restantes en pila: {self.operaciones_deshacer.tamanio()}")
     
-    print(f"\n✓ Operación deshecha")
-    print(f"Operaciones restantes en pila: {self.operaciones_deshacer.tamanio()}")
+    def rehacer_operacion(self):
+        """Rehace la última operación deshecha"""
+        print("\n--- REHACER OPERACIÓN (Pila) ---")
+        
+        operacion = self.operaciones_deshacer.rehacer()
+        if operacion is None:
+            print("❌ No hay operaciones para rehacer")
+            return
+        
+        if operacion['exito']:
+            print(f"\n✓ Operación rehecha: {operacion['tipo']}")
+        else:
+            print(f"\n❌ No se pudo rehacer: {operacion['tipo']}")
+    
+    def quitar_usuario(self, usuario):
+        """Revierte el registro de un usuario; False si ya tiene pedidos atendidos o sin entregar"""
+        with self._lock_ventas:
+            if usuario.info['total_pedidos'] > 0 or self.pendientes_por_usuario.get(usuario.obtener_id()):
+                return False
+            # Retiro y salida del ranking juntos: un pedido entregado en el
+            # medio dejaría al usuario en el árbol con una clave vieja
+            self.usuarios_retirados[usuario.obtener_id()] = usuario
+            self.arbol_gastos.eliminar(self.clave_gasto(usuario), usuario)
+            self.estadisticas_usuarios.eliminar(usuario.obtener_id())
+        self.desindexar_usuario(usuario)
+        return True
+    
+    def restaurar_usuario(self, usuario):
+        """Vuelve a activar un usuario retirado con el mismo objeto e ID"""
+        with self._lock_ventas:
+            if self.usuarios_retirados.pop(usuario.obtener_id(), None) is None:
+                return False
+            self.arbol_gastos.insertar(self.clave_gasto(usuario), usuario)
+            self.estadisticas_usuarios.agregar(
+                usuario.obtener_id(), usuario.tipo,
+                usuario.info['total_gastado'], usuario.info['total_pedidos']
+            )
+        self.indexar_usuario(usuario)
+        return True
+    
+    def quitar_producto(self, producto):
+        """Revierte el registro de un producto; False si ya tiene ventas o está en un pedido sin entregar"""
+        with self._lock_ventas:
+            if self.ventas_por_producto.get(producto.id, 0) or self.pendientes_por_producto.get(producto.id):
+                return False
+            self.productos_retirados[producto.id] = producto
+        self.arbol_precios.eliminar(producto.precio, producto)
+        self.desindexar_ingredientes(producto)
+        self.indice_nombres_productos.eliminar(producto.id)
+        self.indice_difuso_productos.eliminar(producto.id)
+        self.indice_categorias.eliminar(producto.id)
+        if producto.categoria not in self.indice_categorias:
+            self.categorias_disponibles.eliminar(normalizar_categoria(producto.categoria))
+        return True
+    
+    def restaurar_producto(self, producto):
+        """Vuelve a activar un producto retirado con el mismo objeto e ID"""
+        with self._lock_ventas:
+            if self.productos_retirados.pop(producto.id, None) is None:
+                return False
+            ventas = self.ventas_por_producto.get(producto.id, 0)
+            if ventas:
+                self.arbol_popularidad.insertar((ventas, producto.id), producto)
+        self.arbol_precios.insertar(producto.precio, producto)
+        self.indexar_ingredientes(producto)
+        self.indice_nombres_productos.agregar(producto.id, producto.nombre, producto)
+        self.indice_difuso_productos.agregar(producto.id, producto.nombre, producto)
+        self.categorias_disponibles.agregar(normalizar_categoria(producto.categoria))
+        self.indice_categorias.agregar(producto.id, producto.categoria, producto.disponible, producto)
+        return True
+    
+    @staticmethod
+    def normalizar_ingrediente(ingrediente):
+        return ingrediente.strip().lower()
+    
+    def indexar_ingredientes(self, producto):
+        """Registra los ingredientes del producto como conjunto de bits"""
+        ingredientes = ConjuntoBits(
+            self.simbolos_ingredientes,
+            [self.normalizar_ingrediente(ing) for ing in producto.ingredientes]
+        )
+        self.mascaras_ingredientes[producto.id] = ingredientes
+        for ingrediente in ingredientes:
+            productos = self.productos_por_ingrediente.get(ingrediente)
+            if productos is None:
+                productos = self.productos_por_ingrediente[ingrediente] = ConjuntoBits(self.simbolos_productos)
+            productos.agregar(producto.id)
+        self.marcar_disponible_para_alergias(producto)
+    
+    def desindexar_ingredientes(self, producto):
+        ingredientes = self.mascaras_ingredientes.pop(producto.id, None)
+        if ingredientes is None:
+            return
+        for ingrediente in ingredientes:
+            self.productos_por_ingrediente[ingrediente].eliminar(producto.id)
+        self.productos_disponibles.eliminar(producto.id)
+    
+    def marcar_disponible_para_alergias(self, producto):
+        if producto.disponible:
+            self.productos_disponibles.agregar(producto.id)
+        else:
+            self.productos_disponibles.eliminar(producto.id)
+    
+    def alergias_conocidas(self, usuario):
+        """Alergias del usuario como ConjuntoBits (ignora ingredientes que nadie usa)"""
+        alergias = (self.normalizar_ingrediente(a) for a in usuario.obtener_alergias())
+        return ConjuntoBits(
+            self.simbolos_ingredientes,
+            [alergia for alergia in alergias if alergia in self.simbolos_ingredientes]
+        )
+    
+    def verificar_alergenos(self, usuario, producto):
+        """(puede_consumir, alérgenos presentes) con un AND de máscaras"""
+        ingredientes = self.mascaras_ingredientes.get(producto.id)
+        if ingredientes is None:
+            # Producto fuera del índice (p. ej. retirado): no se lo vuelve a indexar
+            ingredientes = ConjuntoBits(
+                self.simbolos_ingredientes,
+                [self.normalizar_ingrediente(ing) for ing in producto.ingredientes]
+            )
+        conflicto = self.alergias_conocidas(usuario).interseccion(ingredientes)
+        if conflicto.esta_vacio():
+            return True, []
+        return False, conflicto.obtener_lista()
+    
+    def productos_aptos_para(self, usuario):
+        """Productos disponibles sin alérgenos del usuario: un OR por alergia, no un recorrido por producto"""
+        aptos = self.productos_disponibles
+        for alergia in self.alergias_conocidas(usuario):
+            aptos = aptos.diferencia(self.productos_por_ingrediente[alergia])
+        return [self.gestor_productos.buscar_por_id(producto_id) for producto_id in aptos]
+    
+    def encolar_pedido(self, pedido):
+        """Pone el pedido en cola y lo cuenta como pendiente; None si no se pudo encolar"""
+        # Se cuenta antes del put: una estación podría entregarlo enseguida
+        with self._lock_ventas:
+            self.registrar_pendiente(pedido)
+        pedido_id = self.cola_concurrente.put(pedido.prioridad, pedido, pedido.id)
+        if pedido_id is None:
+            with self._lock_ventas:
+                self.liberar_pendiente(pedido)
+        return pedido_id
+    
+    def retirar_pedido_de_cola(self, pedido_id):
+        """Revierte un pedido mientras siga en cola; False si ya fue atendido"""
+        cancelado = self.cola_concurrente.cancelar(pedido_id)
+        self.resumenes_cola.pop(pedido_id, None)
+        if cancelado is None:
+            return False
+        with self._lock_ventas:
+            self.liberar_pendiente(cancelado['pedido'])
+        return True
+    
+    def registrar_pendiente(self, pedido):
+        """Cuenta un pedido sin entregar para su usuario y productos (con _lock_ventas)"""
+        if pedido.id in self.pedidos_pendientes:
+            return
+        self.pedidos_pendientes[pedido.id] = pedido
+        self._sumar_pendientes(pedido, 1)
+    
+    def liberar_pendiente(self, pedido):
+        """Descuenta un pedido entregado o cancelado (con _lock_ventas)"""
+        if self.pedidos_pendientes.pop(pedido.id, None) is None:
+            return
+        self._sumar_pendientes(pedido, -1)
+    
+    def _sumar_pendientes(self, pedido, delta):
+        claves = [(self.pendientes_por_usuario, pedido.usuario.obtener_id())]
+        claves += [(self.pendientes_por_producto, producto_id)
+                   for producto_id in {p.id for p in pedido.productos}]
+        for contadores, clave in claves:
+            cantidad = contadores.get(clave, 0) + delta
+            if cantidad:
+                contadores[clave] = cantidad
+            else:
+                del contadores[clave]
+
 
-def main():  # Sin indentación (función global)
-     """Función principal"""
-try:
+def main():
+    """Función principal"""
+    try:
         sistema = SistemaCafeteria()
         sistema.menu_principal()
-except KeyboardInterrupt:
+    except KeyboardInterrupt:
         print("\n\nSistema interrumpido por el usuario")
-except Exception as e:
+    except Exception as e:
         print(f"\n❌ Error inesperado: {e}")
         import traceback
         traceback.print_exc()
 
 
-if __name__ == "__main__":  # Sin indentación
+if __name__ == "__main__":
     main()
\ No newline at end of file
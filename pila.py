@@ -1,11 +1,13 @@
+from collections import deque
+
+
 class Pila:
     def __init__(self, capacidad_maxima=None):
-        self.items = []
+        # Buffer circular: al llenarse, append descarta el más antiguo en O(1)
+        self.items = deque(maxlen=capacidad_maxima or None)
         self.capacidad_maxima = capacidad_maxima
     
     def apilar(self, item):
-        if self.capacidad_maxima and len(self.items) >= self.capacidad_maxima:
-            self.items.pop(0)
         self.items.append(item)
         return True
     
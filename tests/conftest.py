@@ -0,0 +1,66 @@
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+# Los módulos se importan como `estructuras.<modulo>`. Si la carpeta del
+# repositorio no se llama así, se registra el paquete con ese nombre.
+if 'estructuras' not in sys.modules:
+    if RAIZ.name == 'estructuras':
+        sys.path.insert(0, str(RAIZ.parent))
+    else:
+        spec = importlib.util.spec_from_file_location(
+            'estructuras', RAIZ / '__init__.py', submodule_search_locations=[str(RAIZ)])
+        paquete = importlib.util.module_from_spec(spec)
+        sys.modules['estructuras'] = paquete
+        spec.loader.exec_module(paquete)
+
+
+def _cargar_main():
+    # main.py importa modelos/ y utils/, que no están en este árbol: si no
+    # se pueden importar se usan los dobles de dobles_modelos.py
+    if 'main' in sys.modules:
+        return sys.modules['main']
+    try:
+        importlib.import_module('modelos.usuario')
+    except ImportError:
+        import types
+        import dobles_modelos
+        modulos = {
+            'modelos.usuario': ('Usuario', 'GestorUsuarios'),
+            'modelos.producto': ('Producto', 'GestorProductos'),
+            'modelos.pedido': ('Pedido',),
+            'utils.carga_datos': ('CargadorDatos',),
+        }
+        for nombre, clases in modulos.items():
+            paquete = nombre.split('.')[0]
+            sys.modules.setdefault(paquete, types.ModuleType(paquete))
+            modulo = types.ModuleType(nombre)
+            for clase in clases:
+                setattr(modulo, clase, getattr(dobles_modelos, clase))
+            sys.modules[nombre] = modulo
+    spec = importlib.util.spec_from_file_location('main', RAIZ / 'main.py')
+    main = importlib.util.module_from_spec(spec)
+    sys.modules['main'] = main
+    spec.loader.exec_module(main)
+    return main
+
+
+@pytest.fixture
+def sistema(capsys):
+    sistema = _cargar_main().SistemaCafeteria()
+    capsys.readouterr()
+    return sistema
+
+
+@pytest.fixture
+def entradas(monkeypatch):
+    # entradas('Ana', '1', '') responde en orden a los input() del sistema
+    def responder(*respuestas):
+        pendientes = iter(respuestas)
+        monkeypatch.setattr('builtins.input', lambda *_: next(pendientes))
+    return responder
@@ -0,0 +1,178 @@
+"""
+Dobles mínimos de modelos/ y utils/ para probar SistemaCafeteria.
+
+Solo implementan la API que main.py ya usaba en la versión original
+(registrar, buscar_por_id, listar_todos, listar_por_tipo, ...): no tienen
+bajas, así que las pruebas fallan si el sistema vuelve a depender de ellas.
+"""
+from itertools import count
+
+from estructuras.lista_enlazada import ListaEnlazada
+
+PRIORIDADES = {'profesor': 1, 'staff': 2, 'estudiante': 3}
+
+
+class Usuario:
+    def __init__(self, usuario_id, nombre, tipo, email=''):
+        self.id = usuario_id
+        self.nombre = nombre
+        self.tipo = tipo
+        self.email = email
+        self.historial = ListaEnlazada()
+        self.preferencias = set()
+        self.alergias = set()
+        self.info = {'nombre': nombre, 'tipo': tipo, 'email': email,
+                     'total_gastado': 0.0, 'total_pedidos': 0}
+
+    def obtener_id(self):
+        return self.id
+
+    def obtener_nombre(self):
+        return self.nombre
+
+    def obtener_prioridad(self):
+        return PRIORIDADES.get(self.tipo, 3)
+
+    def agregar_pedido_al_historial(self, pedido_info):
+        self.historial.agregar_al_inicio(pedido_info)
+        self.info['total_gastado'] += pedido_info['total']
+        self.info['total_pedidos'] += 1
+
+    def obtener_historial_completo(self):
+        return self.historial.obtener_todos()
+
+    def calcular_promedio_gasto(self):
+        pedidos = self.info['total_pedidos']
+        return self.info['total_gastado'] / pedidos if pedidos else 0.0
+
+    def agregar_alergia(self, alergia):
+        self.alergias.add(alergia)
+        return True
+
+    def eliminar_alergia(self, alergia):
+        if alergia not in self.alergias:
+            return False
+        self.alergias.discard(alergia)
+        return True
+
+    def obtener_alergias(self):
+        return list(self.alergias)
+
+    def agregar_preferencia(self, preferencia):
+        self.preferencias.add(preferencia)
+        return True
+
+    def eliminar_preferencia(self, preferencia):
+        if preferencia not in self.preferencias:
+            return False
+        self.preferencias.discard(preferencia)
+        return True
+
+    def obtener_preferencias(self):
+        return list(self.preferencias)
+
+    def obtener_info_completa(self):
+        return self.info
+
+    def __str__(self):
+        return f"{self.id} - {self.nombre} ({self.tipo})"
+
+
+class GestorUsuarios:
+    def __init__(self):
+        self.usuarios = {}
+        self._ids = count(1)
+
+    def registrar_usuario(self, nombre, tipo, email=''):
+        usuario = Usuario(f"U{next(self._ids):03d}", nombre, tipo, email)
+        self.usuarios[usuario.id] = usuario
+        return usuario
+
+    def buscar_por_id(self, usuario_id):
+        return self.usuarios.get(usuario_id)
+
+    def buscar_por_nombre(self, nombre):
+        return next((u for u in self.usuarios.values() if u.nombre.lower() == nombre.lower()), None)
+
+    def buscar_por_email(self, email):
+        return next((u for u in self.usuarios.values() if u.email == email), None)
+
+    def listar_todos(self):
+        return list(self.usuarios.values())
+
+    def listar_por_tipo(self, tipo):
+        return [u for u in self.usuarios.values() if u.tipo == tipo]
+
+    def __len__(self):
+        return len(self.usuarios)
+
+
+class Producto:
+    def __init__(self, producto_id, nombre, precio, categoria):
+        self.id = producto_id
+        self.nombre = nombre
+        self.precio = precio
+        self.categoria = categoria
+        self.ingredientes = []
+        self.disponible = True
+
+    def agregar_ingrediente(self, ingrediente):
+        self.ingredientes.append(ingrediente)
+
+    def __str__(self):
+        return f"{self.nombre} - ${self.precio:.2f}"
+
+
+class GestorProductos:
+    def __init__(self):
+        self.productos = {}
+        self._ids = count(1)
+
+    def registrar_producto(self, nombre, precio, categoria):
+        producto = Producto(f"P{next(self._ids):03d}", nombre, precio, categoria)
+        self.productos[producto.id] = producto
+        return producto
+
+    def buscar_por_id(self, producto_id):
+        return self.productos.get(producto_id)
+
+    def buscar_por_nombre(self, termino):
+        return [p for p in self.productos.values() if termino.lower() in p.nombre.lower()]
+
+    def listar_todos(self):
+        return list(self.productos.values())
+
+    def listar_por_categoria(self, categoria):
+        return [p for p in self.productos.values() if p.categoria == categoria]
+
+    def __len__(self):
+        return len(self.productos)
+
+
+class Pedido:
+    _ids = count(1)
+
+    def __init__(self, usuario, productos):
+        self.id = f"PED{next(Pedido._ids):05d}"
+        self.usuario = usuario
+        self.productos = list(productos)
+        self.prioridad = usuario.obtener_prioridad()
+        self.estado = 'pendiente'
+
+    def calcular_total(self):
+        return sum(p.precio for p in self.productos)
+
+    def cambiar_estado(self, estado):
+        self.estado = estado
+
+
+class CargadorDatos:
+    # Sin datos iniciales: cada prueba arma su propio escenario
+    def cargar_usuarios(self):
+        return []
+
+    def cargar_productos(self):
+        return []
+
+    def cargar_pedidos_historicos(self):
+        return []
@@ -0,0 +1,76 @@
+import random
+
+from test_deshacer import registrar_producto, registrar_usuario
+
+
+def test_verificar_alergenos_normaliza_ingredientes(sistema, entradas):
+    usuario = registrar_usuario(sistema, entradas, 'Hugo Vera')
+    usuario.agregar_alergia(' Maní ')
+    usuario.agregar_alergia('mariscos')   # ningún producto lo usa
+    alfajor = registrar_producto(sistema, entradas, 'Alfajor', 1.8, 'Postres', 'harina, MANÍ, azúcar')
+    jugo = registrar_producto(sistema, entradas, 'Jugo', 2.0, 'Bebidas', 'naranja')
+
+    assert sistema.verificar_alergenos(usuario, alfajor) == (False, ['maní'])
+    assert sistema.verificar_alergenos(usuario, jugo) == (True, [])
+    assert 'mariscos' not in sistema.simbolos_ingredientes
+    assert sistema.productos_aptos_para(usuario) == [jugo]
+
+
+def test_productos_aptos_excluye_no_disponibles(sistema, entradas):
+    usuario = registrar_usuario(sistema, entradas, 'Inés Mora')
+    cafe = registrar_producto(sistema, entradas, 'Café', 1.5, 'Bebidas', 'café')
+    te = registrar_producto(sistema, entradas, 'Té', 1.2, 'Bebidas', 'té')
+    assert sistema.productos_aptos_para(usuario) == [cafe, te]
+
+    entradas('café')
+    sistema.modificar_disponibilidad()
+    assert not cafe.disponible
+    assert sistema.productos_aptos_para(usuario) == [te]
+
+    entradas('café')
+    sistema.modificar_disponibilidad()
+    assert sistema.productos_aptos_para(usuario) == [cafe, te]
+
+
+def test_productos_retirados_no_son_aptos(sistema, entradas):
+    usuario = registrar_usuario(sistema, entradas, 'Juan Gil')
+    usuario.agregar_alergia('huevo')
+    registrar_producto(sistema, entradas, 'Budín', 2.5, 'Postres', 'huevo, harina')
+    assert sistema.operaciones_deshacer.deshacer()['exito']
+    budin = next(iter(sistema.productos_retirados.values()))
+    assert sistema.productos_aptos_para(usuario) == []
+    # Verificar un producto retirado no lo vuelve a indexar
+    assert sistema.verificar_alergenos(usuario, budin) == (False, ['huevo'])
+    assert budin.id not in sistema.mascaras_ingredientes
+    usuario.eliminar_alergia('huevo')
+    assert sistema.productos_aptos_para(usuario) == []
+
+    assert sistema.operaciones_deshacer.rehacer()['exito']
+    assert sistema.productos_aptos_para(usuario) == [budin]
+
+
+def test_productos_aptos_contra_sets(sistema, entradas):
+    rng = random.Random(15)
+    ingredientes = [f'ing{i}' for i in range(12)]
+    productos = []
+    for i in range(40):
+        elegidos = rng.sample(ingredientes, rng.randint(0, 3))
+        productos.append(registrar_producto(
+            sistema, entradas, f'Combo{i:02d}x', 1 + i, 'Varios', ', '.join(elegidos)))
+    for producto in rng.sample(productos, 10):
+        entradas(producto.nombre)
+        sistema.modificar_disponibilidad()
+
+    usuario = registrar_usuario(sistema, entradas, 'Karen Díaz')
+    for _ in range(20):
+        for alergia in usuario.obtener_alergias():
+            usuario.eliminar_alergia(alergia)
+        for alergia in rng.sample(ingredientes, rng.randint(0, 3)):
+            usuario.agregar_alergia(alergia)
+        alergias = set(usuario.obtener_alergias())
+        esperados = [p for p in productos if p.disponible and not alergias & set(p.ingredientes)]
+        assert sistema.productos_aptos_para(usuario) == esperados
+        for producto in productos:
+            puede, presentes = sistema.verificar_alergenos(usuario, producto)
+            assert puede == (not alergias & set(producto.ingredientes))
+            assert sorted(presentes) == sorted(alergias & set(producto.ingredientes))
@@ -0,0 +1,124 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from estructuras.almacen_pedidos import AlmacenPedidos
+from estructuras.tiempo import como_fecha
+
+TIPOS = ('profesor', 'estudiante', 'staff')
+ESTADOS = ('entregado', 'cancelado')
+
+
+def _pedidos(rng, cantidad=600):
+    inicio = datetime(2024, 11, 1)
+    for i in range(cantidad):
+        fecha = inicio + timedelta(minutes=rng.randrange(20 * 24 * 60))
+        yield (f"PED{i:05d}", f"U{rng.randrange(40):03d}", rng.choice(TIPOS),
+               fecha.strftime('%Y-%m-%d %H:%M'), round(rng.uniform(0.5, 30), 2),
+               rng.choice(ESTADOS), [f"P{rng.randrange(25):03d}" for _ in range(rng.randint(0, 4))])
+
+
+def _filtrar(filas, desde=None, hasta=None, estado=None):
+    # Referencia: recorrer un dict por pedido, como antes del almacén
+    pedidos = [dict(zip(('id', 'usuario', 'tipo', 'fecha', 'total', 'estado', 'productos'), fila))
+               for fila in filas]
+    return [p for p in pedidos
+            if (desde is None or como_fecha(p['fecha']) >= como_fecha(desde))
+            and (hasta is None or como_fecha(p['fecha']) <= como_fecha(hasta))
+            and (estado is None or p['estado'] == estado)]
+
+
+@pytest.mark.parametrize('desde, hasta, estado', [
+    (None, None, None),
+    ('2024-11-05', '2024-11-12 23:59', None),
+    ('2024-11-03 08:30', None, 'entregado'),
+    (None, '2024-11-10', 'cancelado'),
+    (None, None, 'pendiente'),
+])
+def test_reportes_coinciden_con_recorrer_los_pedidos(desde, hasta, estado):
+    filas = list(_pedidos(random.Random(24)))
+    almacen = AlmacenPedidos(capacidad_inicial=8)
+    almacen.agregar_lote(filas[:300])
+    for fila in filas[300:]:
+        almacen.agregar(*fila)
+    elegidos = _filtrar(filas, desde, hasta, estado)
+
+    unidades = {}
+    horas = [0] * 24
+    totales_hora = [0.0] * 24
+    por_tipo = {}
+    for pedido in elegidos:
+        for pid in pedido['productos']:
+            unidades[pid] = unidades.get(pid, 0) + 1
+        hora = como_fecha(pedido['fecha']).hour
+        horas[hora] += 1
+        totales_hora[hora] += pedido['total']
+        datos = por_tipo.setdefault(pedido['tipo'], {'pedidos': 0, 'total': 0.0})
+        datos['pedidos'] += 1
+        datos['total'] += pedido['total']
+
+    assert almacen.unidades_por_producto(desde, hasta, estado) == unidades
+    pedidos_hora, montos_hora = almacen.ventas_por_hora(desde, hasta, estado)
+    assert list(pedidos_hora) == horas
+    assert list(montos_hora) == pytest.approx(totales_hora)
+    resultado = almacen.ventas_por_tipo(desde, hasta, estado)
+    assert resultado.keys() == por_tipo.keys()
+    for tipo, datos in por_tipo.items():
+        assert resultado[tipo]['pedidos'] == datos['pedidos']
+        assert resultado[tipo]['total'] == pytest.approx(datos['total'])
+    pedidos, total = almacen.total_ventas(desde, hasta, estado)
+    assert pedidos == len(elegidos)
+    assert total == pytest.approx(sum(p['total'] for p in elegidos))
+
+
+def test_lote_omite_las_filas_con_fecha_invalida():
+    filas = list(_pedidos(random.Random(3), 20))
+    filas[4] = filas[4][:3] + ('01/11/2024 10:00',) + filas[4][4:]
+    filas[11] = filas[11][:3] + (None,) + filas[11][4:]
+    almacen = AlmacenPedidos()
+
+    resultado = almacen.agregar_lote(filas)
+    assert resultado['rechazados'] == ['PED00004', 'PED00011']
+    assert resultado['agregados'] == [f[0] for i, f in enumerate(filas) if i not in (4, 11)]
+    validas = [f for i, f in enumerate(filas) if i not in (4, 11)]
+    assert len(almacen) == 18
+    assert almacen.cantidad_lineas() == sum(len(f[6]) for f in validas)
+    assert almacen.total_ventas()[1] == pytest.approx(sum(f[4] for f in validas))
+
+    # Una fila suelta inválida tampoco deja el almacén a medias
+    with pytest.raises(ValueError):
+        almacen.agregar('PED99999', 'U999', 'visitante', 'ayer', 5.0, 'entregado', ['P999'])
+    assert len(almacen) == 18 and 'visitante' not in almacen.ventas_por_tipo()
+
+
+def test_reporte_ventas_coincide_con_recorrer_los_pedidos(sistema, entradas, capsys):
+    filas = list(_pedidos(random.Random(11), 200))
+    sistema.almacen_pedidos.agregar_lote(filas)
+    elegidos = _filtrar(filas, '2024-11-04', '2024-11-09 23:59')
+
+    entradas('2024-11-04', '2024-11-09')
+    sistema.reporte_ventas()
+    salida = capsys.readouterr().out
+
+    total = sum(p['total'] for p in elegidos)
+    assert f"Pedidos: {len(elegidos)}  Ventas: ${total:.2f}" in salida
+    for tipo in TIPOS:
+        del_tipo = [p['total'] for p in elegidos if p['tipo'] == tipo]
+        if del_tipo:
+            assert f"  {tipo}: {len(del_tipo)} pedidos, ${sum(del_tipo):.2f}" in salida
+    for hora in range(24):
+        de_la_hora = [p for p in elegidos if como_fecha(p['fecha']).hour == hora]
+        if de_la_hora:
+            assert f"  {hora:02d}:00  {len(de_la_hora):>6} pedidos" in salida
+    unidades = {}
+    for pedido in elegidos:
+        for pid in pedido['productos']:
+            unidades[pid] = unidades.get(pid, 0) + 1
+    # Sin productos en el catálogo se listan por ID; los empates pueden salir en cualquier orden
+    listados = salida.split("Productos más vendidos en el período:\n")[1].splitlines()
+    vendidos = [linea.split('. ', 1)[1].rsplit(' unidades', 1)[0].split(': ') for linea in listados]
+    assert all(unidades[pid] == int(cantidad) for pid, cantidad in vendidos)
+    assert [int(c) for _, c in vendidos] == sorted(unidades.values(), reverse=True)[:10]
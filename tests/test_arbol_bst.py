@@ -0,0 +1,265 @@
+import random
+
+import pytest
+
+from estructuras.arbol_bst import ArbolBST
+
+
+def _verificar_invariantes(arbol):
+    # Recorre el árbol comprobando orden, altura, peso y balance AVL;
+    # devuelve la cantidad de valores.
+    def revisar(nodo, minimo, maximo):
+        if nodo is None:
+            return 0, 0
+        assert minimo is None or nodo.clave > minimo
+        assert maximo is None or nodo.clave < maximo
+        altura_izq, peso_izq = revisar(nodo.izquierdo, minimo, nodo.clave)
+        altura_der, peso_der = revisar(nodo.derecho, nodo.clave, maximo)
+        assert nodo.altura == 1 + max(altura_izq, altura_der)
+        assert nodo.peso == peso_izq + peso_der + arbol._cantidad(nodo)
+        if arbol.balanceado:
+            assert abs(altura_izq - altura_der) <= 1
+        return nodo.altura, nodo.peso
+
+    _, peso = revisar(arbol.raiz, None, None)
+    assert peso == len(arbol)
+    return peso
+
+
+def test_avl_con_inserciones_ordenadas_largas():
+    for claves in (range(5000), range(5000, 0, -1)):
+        arbol = ArbolBST(balanceado=True)
+        for clave in claves:
+            arbol.insertar(clave, clave)
+        assert _verificar_invariantes(arbol) == 5000
+        # Un AVL de n nodos mide a lo sumo 1.44 log2(n)
+        assert arbol.obtener_altura() <= 18
+        assert [c for c, _ in arbol.iter_rango()] == sorted(claves)
+
+
+def test_avl_aleatorio_contra_lista_ordenada():
+    rng = random.Random(1)
+    arbol = ArbolBST(balanceado=True)
+    referencia = {}
+    for paso in range(4000):
+        clave = rng.randint(0, 500)
+        if rng.random() < 0.6:
+            arbol.insertar(clave, f'v{paso}')
+            referencia[clave] = f'v{paso}'
+        else:
+            assert arbol.eliminar(clave) == (clave in referencia)
+            referencia.pop(clave, None)
+        if paso % 200 == 0:
+            _verificar_invariantes(arbol)
+    _verificar_invariantes(arbol)
+    assert list(arbol.iter_rango()) == sorted(referencia.items())
+    for clave in range(0, 501, 7):
+        assert arbol.buscar(clave) == referencia.get(clave)
+    assert list(arbol.iter_rango(100, 200)) == [
+        (c, v) for c, v in sorted(referencia.items()) if 100 <= c <= 200]
+
+
+def _arbol_con_duplicados():
+    arbol = ArbolBST(balanceado=True, claves_duplicadas=True)
+    arbol.insertar(0.5, 'p0')
+    for i in range(1, 6):
+        arbol.insertar(1.0, f'p{i}')
+    arbol.insertar(2.0, 'p6')
+    return arbol
+
+
+def test_cursor_reanuda_dentro_de_una_cubeta():
+    arbol = _arbol_con_duplicados()
+    primera = list(arbol.iter_rango(min_clave=1.0, limite=3))
+    assert [v for _, v in primera] == ['p1', 'p2', 'p3']
+    resto = list(arbol.iter_rango(min_clave=1.0, desde=1.0, desplazamiento=3))
+    assert [v for _, v in resto] == ['p4', 'p5', 'p6']
+
+
+def test_cursor_exclusivo_sin_desplazamiento():
+    arbol = _arbol_con_duplicados()
+    assert [v for _, v in arbol.iter_rango(desde=1.0)] == ['p6']
+    assert [v for _, v in arbol.iter_rango_inverso(desde=1.0)] == ['p0']
+
+
+def test_cursor_inverso_reanuda_dentro_de_una_cubeta():
+    arbol = _arbol_con_duplicados()
+    resto = list(arbol.iter_rango_inverso(desde=1.0, desplazamiento=2))
+    assert [v for _, v in resto] == ['p3', 'p2', 'p1', 'p0']
+
+
+def _todas_las_paginas(arbol, limite, **kwargs):
+    vistos = []
+    cursor = None
+    while True:
+        pagina, cursor = arbol.pagina_rango(cursor=cursor, limite=limite, **kwargs)
+        vistos.extend(pagina)
+        if cursor is None:
+            return vistos
+
+
+def test_paginas_cubren_todo_con_duplicados():
+    rng = random.Random(4)
+    arbol = ArbolBST(balanceado=True, claves_duplicadas=True)
+    pares = [(rng.randint(0, 20), f'v{i}') for i in range(300)]
+    for clave, valor in pares:
+        arbol.insertar(clave, valor)
+    completo = list(arbol.iter_rango())
+    for limite in (1, 2, 3, 7, 50):
+        assert _todas_las_paginas(arbol, limite) == completo
+        assert _todas_las_paginas(arbol, limite, inverso=True) == list(arbol.iter_rango_inverso())
+        assert (_todas_las_paginas(arbol, limite, min_clave=5, max_clave=12)
+                == list(arbol.iter_rango(5, 12)))
+
+
+def test_paginas_sin_duplicados():
+    arbol = ArbolBST(balanceado=True)
+    for i in range(25):
+        arbol.insertar(i, str(i))
+    pagina, cursor = arbol.pagina_rango(limite=10)
+    assert [c for c, _ in pagina] == list(range(10)) and cursor == (9, 1)
+    assert [c for c, _ in _todas_las_paginas(arbol, 10)] == list(range(25))
+
+
+def test_duplicados_conservan_todos_los_valores():
+    arbol = ArbolBST(balanceado=True, claves_duplicadas=True)
+    for i, clave in enumerate([3, 1, 3, 2, 3, 1]):
+        arbol.insertar(clave, f'v{i}')
+    assert len(arbol) == 6
+    assert arbol.buscar(3) == ['v0', 'v2', 'v4']
+    assert arbol.buscar(1) == ['v1', 'v5']
+    assert arbol.buscar(7) is None
+    # buscar devuelve una copia de la cubeta
+    arbol.buscar(3).append('otro')
+    assert arbol.buscar(3) == ['v0', 'v2', 'v4']
+    assert [v for _, v in arbol.iter_rango()] == ['v1', 'v5', 'v3', 'v0', 'v2', 'v4']
+    assert arbol.obtener_maximo() == {'clave': 3, 'valor': 'v4'}
+    _verificar_invariantes(arbol)
+
+
+def test_construir_desde_ordenados():
+    rng = random.Random(2)
+    pares = sorted((rng.randint(0, 300), f'v{i}') for i in range(2000))
+    arbol = ArbolBST(balanceado=True, claves_duplicadas=True)
+    arbol.insertar(-1, 'se reemplaza')
+    arbol.construir_desde_ordenados(pares)
+    assert _verificar_invariantes(arbol) == 2000
+    assert list(arbol.iter_rango()) == pares
+    assert arbol.obtener_altura() <= 9
+
+    # Sin duplicados gana el último valor de cada clave
+    unico = ArbolBST(balanceado=True)
+    unico.construir_desde_ordenados([(1, 'a'), (1, 'b'), (2, 'c')])
+    assert list(unico.iter_rango()) == [(1, 'b'), (2, 'c')] and len(unico) == 2
+
+    # El árbol construido sigue aceptando inserciones balanceadas
+    for clave in range(301, 1301):
+        arbol.insertar(clave, clave)
+    _verificar_invariantes(arbol)
+
+
+def test_construir_desde_ordenados_rechaza_desorden():
+    arbol = ArbolBST()
+    with pytest.raises(ValueError):
+        arbol.construir_desde_ordenados([(2, 'a'), (1, 'b')])
+
+
+def test_estadisticos_de_orden_contra_lista_ordenada():
+    rng = random.Random(3)
+    arbol = ArbolBST(balanceado=True, claves_duplicadas=True)
+    valores = []
+    for i in range(1500):
+        clave = rng.randint(0, 200)
+        arbol.insertar(clave, i)
+        valores.append((clave, i))
+    for clave, valor in rng.sample(valores, 500):
+        assert arbol.eliminar(clave, valor)
+        valores.remove((clave, valor))
+    # La referencia conserva el orden de inserción dentro de cada clave
+    referencia = sorted(valores, key=lambda par: par[0])
+    claves = [clave for clave, _ in referencia]
+    n = len(referencia)
+
+    for k in (0, 1, n // 2, n - 1):
+        clave, valor = referencia[k]
+        assert arbol.seleccionar(k) == {'clave': clave, 'valor': valor}
+    assert arbol.seleccionar(-1) is None and arbol.seleccionar(n) is None
+
+    for clave in range(-1, 203, 5):
+        assert arbol.rango_de(clave) == sum(1 for c in claves if c < clave)
+        for ancho in (0, 10, 60):
+            assert arbol.contar_rango(clave, clave + ancho) == sum(
+                1 for c in claves if clave <= c <= clave + ancho)
+    assert arbol.contar_rango(50, 10) == 0
+
+    for p in (0, 1, 50, 95, 99, 100):
+        k = max(0, -(-p * n // 100) - 1)
+        assert arbol.percentil(p)['clave'] == referencia[k][0]
+    assert arbol.percentil(101) is None
+    assert ArbolBST().percentil(50) is None
+
+
+def test_pagina_rango_contra_lista_ordenada():
+    rng = random.Random(5)
+    arbol = ArbolBST(balanceado=True, claves_duplicadas=True)
+    for i in range(400):
+        arbol.insertar(rng.randint(0, 30) / 2, i)
+    referencia = list(arbol.iter_rango())
+    pagina, cursor = arbol.pagina_rango(min_clave=3, max_clave=9, limite=25)
+    esperado = [par for par in referencia if 3 <= par[0] <= 9]
+    assert pagina == esperado[:25]
+    assert cursor == (pagina[-1][0], sum(1 for c, _ in pagina if c == pagina[-1][0]))
+    siguiente, _ = arbol.pagina_rango(min_clave=3, max_clave=9, cursor=cursor, limite=25)
+    assert siguiente == esperado[25:50]
+    assert arbol.pagina_rango(min_clave=100) == ([], None)
+
+
+def test_eliminar_un_valor_de_la_cubeta():
+    arbol = _arbol_con_duplicados()
+    assert arbol.eliminar(1.0, 'p3')
+    assert arbol.buscar(1.0) == ['p1', 'p2', 'p4', 'p5']
+    assert not arbol.eliminar(1.0, 'p3')
+    assert not arbol.eliminar(1.5, 'p3')
+    assert len(arbol) == 6
+    _verificar_invariantes(arbol)
+
+    # Al quitar el último valor desaparece la clave
+    assert arbol.eliminar(0.5, 'p0')
+    assert arbol.buscar(0.5) is None
+    assert arbol.obtener_minimo() == {'clave': 1.0, 'valor': 'p1'}
+    assert arbol.eliminar(1.0)
+    assert [v for _, v in arbol.iter_rango()] == ['p6']
+    _verificar_invariantes(arbol)
+
+
+def test_eliminar_con_valor_sin_duplicados():
+    arbol = ArbolBST(balanceado=True)
+    arbol.insertar(1, 'a')
+    assert not arbol.eliminar(1, 'b')
+    assert arbol.buscar(1) == 'a'
+    assert arbol.eliminar(1, 'a') and arbol.esta_vacio()
+
+
+def test_actualizar_clave_mueve_el_valor():
+    rng = random.Random(6)
+    arbol = ArbolBST(balanceado=True, claves_duplicadas=True)
+    saldos = {f'u{i}': 0 for i in range(200)}
+    for usuario in saldos:
+        arbol.insertar(0, usuario)
+    for _ in range(2000):
+        usuario = rng.choice(list(saldos))
+        nuevo = saldos[usuario] + rng.randint(1, 10)
+        assert arbol.actualizar_clave(saldos[usuario], nuevo, usuario)
+        saldos[usuario] = nuevo
+    assert _verificar_invariantes(arbol) == 200
+    assert sorted(arbol.iter_rango(), key=lambda par: (par[0], par[1])) == sorted(
+        ((saldo, usuario) for usuario, saldo in saldos.items()))
+
+
+def test_actualizar_clave_sin_la_clave_vieja_no_inserta():
+    arbol = ArbolBST(balanceado=True, claves_duplicadas=True)
+    arbol.insertar(5, 'a')
+    assert not arbol.actualizar_clave(3, 9, 'a')
+    assert not arbol.actualizar_clave(5, 9, 'b')
+    assert list(arbol.iter_rango()) == [(5, 'a')]
+    assert _verificar_invariantes(arbol) == 1
@@ -0,0 +1,65 @@
+from estructuras.indice_categorias import IndiceCategorias, normalizar_categoria
+
+from test_deshacer import registrar_producto
+
+
+def test_categorias_se_normalizan_como_en_el_indice(sistema, entradas):
+    cafe = registrar_producto(sistema, entradas, 'Café', 1.5, 'Bebidas')
+    te = registrar_producto(sistema, entradas, 'Té', 1.2, ' bebidas ')
+    assert sistema.categorias_disponibles.obtener_lista() == ['bebidas']
+
+    sistema.cambiar_categoria_producto(cafe, 'Calientes')
+    assert sorted(sistema.categorias_disponibles.obtener_lista()) == ['bebidas', 'calientes']
+    sistema.cambiar_categoria_producto(te, 'CALIENTES')
+    assert sistema.categorias_disponibles.obtener_lista() == ['calientes']
+    assert sistema.indice_categorias.categorias() == ['calientes']
+
+
+def test_actualizar_categoria_con_varios_resultados(sistema, entradas):
+    registrar_producto(sistema, entradas, 'Jugo de naranja', 2.0, 'Bebidas')
+    manzana = registrar_producto(sistema, entradas, 'Jugo de manzana', 2.0, 'Bebidas')
+
+    # 0 ya no elige el último resultado; texto o fuera de rango tampoco sirven
+    for eleccion in ('0', 'x', '3'):
+        entradas('jugo', eleccion)
+        sistema.actualizar_categoria_producto()
+        assert sistema.categorias_disponibles.obtener_lista() == ['bebidas']
+
+    entradas('jugo', '2', 'Jugos')
+    sistema.actualizar_categoria_producto()
+    assert manzana.categoria == 'Jugos'
+    assert sistema.indice_categorias.buscar(['jugos']) == [manzana]
+    assert sorted(sistema.categorias_disponibles.obtener_lista()) == ['bebidas', 'jugos']
+
+
+def test_listados_muestran_la_grafia_original(sistema, entradas, capsys):
+    registrar_producto(sistema, entradas, 'Café', 1.5, ' Bebidas Calientes ')
+    registrar_producto(sistema, entradas, 'Té', 1.2, 'bebidas calientes')
+    registrar_producto(sistema, entradas, 'Budín', 2.5, 'Postres')
+    assert sorted(sistema.nombres_de_categorias()) == ['Bebidas Calientes', 'Postres']
+    capsys.readouterr()
+
+    entradas('BEBIDAS CALIENTES')
+    sistema.listar_productos_por_categoria()
+    salida = capsys.readouterr().out
+    assert '. Bebidas Calientes' in salida and '. Postres' in salida
+    assert 'Bebidas Calientes (2 productos, 2 disponibles)' in salida
+
+    entradas('1')
+    sistema.menu_conjuntos()
+    salida = capsys.readouterr().out
+    assert '  - Bebidas Calientes' in salida and 'bebidas calientes' not in salida
+
+
+def test_nombre_de_categoria_sigue_al_indice():
+    indice = IndiceCategorias()
+    indice.agregar('a', 'Jugos ')
+    indice.agregar('b', 'JUGOS')
+    assert indice.nombre_de(' jugos') == 'Jugos'
+    assert indice.categorias() == ['jugos']
+    indice.cambiar_categoria('a', 'Licuados')
+    indice.eliminar('b')
+    assert indice.nombre_de('jugos') is None
+    indice.agregar('c', 'JUGOS')
+    assert indice.nombre_de('jugos') == 'JUGOS'
+    assert normalizar_categoria('  Licuados ') == 'licuados'
@@ -0,0 +1,87 @@
+import random
+import threading
+
+from estructuras.cola_concurrente import ColaPrioridadBloqueante, EstacionesCocina
+
+
+class _Pedido:
+    def __init__(self, pedido_id, prioridad):
+        self.id = pedido_id
+        self.prioridad = prioridad
+
+
+def test_productores_y_estaciones_no_pierden_ni_repiten_pedidos():
+    cola = ColaPrioridadBloqueante()
+    atendidos = []
+    inconsistentes = []
+    lock = threading.Lock()
+
+    def procesar(item, estacion):
+        if item['prioridad'] != item['pedido'].prioridad:
+            inconsistentes.append(item['id'])
+        with lock:
+            atendidos.append(item['id'])
+
+    estaciones = EstacionesCocina(cola, procesar, num_estaciones=4, intervalo_espera=0.01)
+    estaciones.iniciar()
+
+    productores, por_productor = 4, 500
+    cancelados = []
+
+    def producir(n):
+        rng = random.Random(n)
+        for i in range(por_productor):
+            prioridad = rng.randint(1, 3)
+            pedido = _Pedido(f"P{n}-{i}", prioridad)
+            assert cola.put(prioridad, pedido, pedido.id) == pedido.id
+
+    def modificar():
+        # Lo mismo que hace el sistema: cambio y actualización del pedido
+        # bajo el mismo candado, mientras las estaciones atienden
+        rng = random.Random(99)
+        for _ in range(2000):
+            pedido_id = f"P{rng.randrange(productores)}-{rng.randrange(por_productor)}"
+            if rng.random() < 0.1:
+                if cola.cancelar(pedido_id) is not None:
+                    cancelados.append(pedido_id)
+                continue
+            nueva = rng.randint(1, 3)
+            with cola.condicion:
+                if cola.cola.cambiar_prioridad(pedido_id, nueva):
+                    cola.cola.buscar_por_id(pedido_id)['pedido'].prioridad = nueva
+
+    hilos = [threading.Thread(target=producir, args=(n,)) for n in range(productores)]
+    hilos.append(threading.Thread(target=modificar))
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    estaciones.detener(vaciar=True)
+
+    todos = {f"P{n}-{i}" for n in range(productores) for i in range(por_productor)}
+    assert not estaciones.errores
+    assert not inconsistentes
+    assert len(atendidos) == len(set(atendidos))
+    assert set(atendidos).isdisjoint(cancelados)
+    assert set(atendidos) | set(cancelados) == todos
+    assert estaciones.total_procesados() == len(atendidos)
+    assert cola.tamanio() == 0
+
+
+def test_get_bloqueante_despierta_con_put_y_con_cerrar():
+    cola = ColaPrioridadBloqueante()
+    resultados = []
+    consumidores = [threading.Thread(target=lambda: resultados.append(cola.get(timeout=5)))
+                    for _ in range(3)]
+    for hilo in consumidores:
+        hilo.start()
+    cola.put(2, _Pedido('A', 2), 'A')
+    cola.put(1, _Pedido('B', 1), 'B')
+    cola.cerrar()
+    for hilo in consumidores:
+        hilo.join(timeout=5)
+        assert not hilo.is_alive()
+    ids = sorted(r['id'] for r in resultados if r is not None)
+    assert ids == ['A', 'B']
+    assert resultados.count(None) == 1
+    assert cola.put(1, _Pedido('C', 1), 'C') is None
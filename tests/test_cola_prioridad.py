@@ -0,0 +1,275 @@
+import random
+
+from estructuras.cola_concurrente import ColaPrioridadBloqueante
+from estructuras.cola_prioridad import ColaPrioridad, _ELIMINADO
+
+from test_deshacer import realizar_pedido, registrar_producto, registrar_usuario
+
+
+def _vaciar(cola):
+    atendidos = []
+    while not cola.esta_vacia():
+        atendidos.append(cola.atender_siguiente()['id'])
+    return atendidos
+
+
+def test_cancelar_y_cambiar_prioridad_contra_referencia():
+    rng = random.Random(7)
+    cola = ColaPrioridad()
+    referencia = {}
+    for i in range(500):
+        prioridad = rng.randint(1, 3)
+        cola.agregar(prioridad, f'pedido{i}', f'id{i}')
+        referencia[f'id{i}'] = (prioridad, i)
+
+    for pedido_id in rng.sample(sorted(referencia), 150):
+        cancelado = cola.cancelar(pedido_id)
+        assert cancelado['id'] == pedido_id and cancelado['prioridad'] == referencia[pedido_id][0]
+        del referencia[pedido_id]
+    assert cola.cancelar('id0' if 'id0' not in referencia else 'inexistente') is None
+
+    contador = 500
+    for pedido_id in rng.sample(sorted(referencia), 100):
+        nueva = rng.randint(1, 3)
+        assert cola.cambiar_prioridad(pedido_id, nueva)
+        if referencia[pedido_id][0] != nueva:
+            # En modo estricto pasa al final de su nuevo nivel
+            referencia[pedido_id] = (nueva, contador)
+            contador += 1
+        assert cola.buscar_por_id(pedido_id)['prioridad'] == nueva
+    assert not cola.cambiar_prioridad('inexistente', 1)
+
+    assert len(cola) == len(referencia)
+    assert [item['id'] for item in cola.ver_primeros(20)] == sorted(
+        referencia, key=referencia.get)[:20]
+    assert _vaciar(cola) == sorted(referencia, key=referencia.get)
+    assert cola.obtener_estadisticas()['activos'] == 0
+
+
+def test_compactacion_de_marcas():
+    cola = ColaPrioridad()
+    for i in range(100):
+        cola.agregar(2, i, f'id{i}')
+    # Se cancelan desde el final: las marcas no llegan al tope del heap
+    for i in range(99, 59, -1):
+        cola.cancelar(f'id{i}')
+    estadisticas = cola.obtener_estadisticas()
+    assert estadisticas == {'activos': 60, 'eliminados': 40, 'ratio_eliminados': 0.4,
+                            'compactaciones': 0}
+
+    for i in range(59, 48, -1):
+        cola.cancelar(f'id{i}')
+    estadisticas = cola.obtener_estadisticas()
+    assert estadisticas['compactaciones'] == 1
+    assert estadisticas['eliminados'] == 0 and estadisticas['activos'] == 49
+    assert len(cola.heap) == 49
+    assert all(entrada[3] is not _ELIMINADO for entrada in cola.heap)
+    assert _vaciar(cola) == [f'id{i}' for i in range(49)]
+
+
+def test_marcas_en_el_tope_se_descartan_al_atender():
+    cola = ColaPrioridad()
+    for i in range(5):
+        cola.agregar(1, i, f'id{i}')
+    cola.cancelar('id0')
+    cola.cancelar('id1')
+    assert cola.obtener_estadisticas()['eliminados'] == 2
+    assert cola.ver_siguiente()['id'] == 'id2'
+    assert cola.obtener_estadisticas() == {'activos': 3, 'eliminados': 0,
+                                           'ratio_eliminados': 0.0, 'compactaciones': 0}
+    assert ColaPrioridad().obtener_estadisticas()['ratio_eliminados'] == 0.0
+
+
+def test_gestionar_pedido_rechaza_prioridades_fuera_de_rango(sistema, entradas, capsys):
+    usuario = registrar_usuario(sistema, entradas, 'Fede Ríos')
+    cafe = registrar_producto(sistema, entradas, 'Café', 1.5, 'Bebidas')
+    pedido = realizar_pedido(sistema, entradas, usuario, cafe)
+    original = pedido.prioridad
+    capsys.readouterr()
+
+    for invalida in ('0', '4', '-1', 'alta'):
+        entradas('p', pedido.id, invalida)
+        sistema.gestionar_pedido_en_cola()
+        assert 'Prioridad inválida' in capsys.readouterr().out
+        assert sistema.cola_pedidos.buscar_por_id(pedido.id)['prioridad'] == original
+        assert pedido.prioridad == original
+
+    entradas('p', pedido.id, '1')
+    sistema.gestionar_pedido_en_cola()
+    assert sistema.cola_pedidos.buscar_por_id(pedido.id)['prioridad'] == 1
+    assert pedido.prioridad == 1
+
+
+class _Reloj:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+def test_plazos_adelantan_a_los_pedidos_antiguos():
+    reloj = _Reloj()
+    cola = ColaPrioridad(esperas_maximas={1: 30, 2: 60, 3: 120}, reloj=reloj)
+    cola.agregar(3, 'estudiante', 'e')        # plazo 120
+    reloj.ahora = 50
+    cola.agregar(1, 'profesor temprano', 'p1')  # plazo 80
+    reloj.ahora = 100
+    cola.agregar(1, 'profesor tarde', 'p2')     # plazo 130
+    cola.agregar(2, 'staff', 's')               # plazo 160
+    assert [item['id'] for item in cola.ver_primeros(4)] == ['p1', 'e', 'p2', 's']
+    assert _vaciar(cola) == ['p1', 'e', 'p2', 's']
+
+
+def test_plazos_empatados_respetan_el_orden_de_ingreso():
+    reloj = _Reloj()
+    cola = ColaPrioridad(esperas_maximas={1: 30, 2: 60, 3: 120}, reloj=reloj)
+    cola.agregar(3, 'estudiante', 'e')   # plazo 120
+    reloj.ahora = 60
+    cola.agregar(2, 'staff', 's')        # plazo 120
+    reloj.ahora = 90
+    cola.agregar(1, 'profesor', 'p')     # plazo 120
+    # Un nivel sin espera configurada usa la mayor: también vence en 120,
+    # y entre plazos iguales gana el que entró antes a la cola
+    cola.agregar(9, 'otro', 'x', llegada=0)
+    assert _vaciar(cola) == ['e', 's', 'p', 'x']
+
+
+def test_cambiar_prioridad_con_plazos_conserva_la_llegada():
+    reloj = _Reloj()
+    cola = ColaPrioridad(esperas_maximas={1: 30, 2: 60, 3: 120}, reloj=reloj)
+    cola.agregar(3, 'estudiante', 'e')   # plazo 120
+    reloj.ahora = 10
+    cola.agregar(1, 'profesor', 'p')     # plazo 40
+    reloj.ahora = 20
+    assert cola.cambiar_prioridad('e', 1)
+    # Su plazo pasa a 0 + 30, no a 20 + 30
+    assert _vaciar(cola) == ['e', 'p']
+
+
+def test_modo_estricto_desempata_por_llegada():
+    cola = ColaPrioridad()
+    for i, prioridad in enumerate([3, 1, 3, 2, 1]):
+        cola.agregar(prioridad, i, f'id{i}')
+    assert _vaciar(cola) == ['id1', 'id4', 'id3', 'id0', 'id2']
+
+
+def test_estadisticas_espera_sobre_una_copia():
+    reloj = _Reloj()
+    cola = ColaPrioridad(esperas_maximas={1: 30, 3: 120}, reloj=reloj)
+    for i in range(100):
+        cola.agregar(3, i, f'e{i}', llegada=0)
+    cola.agregar(1, 'p', 'p', llegada=0)
+    for i in range(101):
+        reloj.ahora = i + 1
+        cola.atender_siguiente()
+
+    muestras = cola.copiar_muestras_espera()
+    assert muestras[1] == [1] and len(muestras[3]) == 100
+    # La copia no cambia al seguir atendiendo
+    cola.agregar(1, 'q', 'q', llegada=0)
+    cola.atender_siguiente()
+    assert muestras[1] == [1]
+
+    esperas = cola.estadisticas_espera(muestras)
+    assert esperas[3] == {'atendidos': 100, 'p50': 51, 'p95': 96, 'p99': 100,
+                          'max': 101, 'espera_maxima': 120}
+    assert esperas[1]['max'] == 1
+    assert cola.estadisticas_espera()[1]['atendidos'] == 2
+
+
+def test_resumen_de_cola_no_sobrevive_al_pedido_atendido(sistema, entradas):
+    usuario = registrar_usuario(sistema, entradas, 'Gala Ortiz')
+    cafe = registrar_producto(sistema, entradas, 'Café', 1.5, 'Bebidas')
+    pedido = realizar_pedido(sistema, entradas, usuario, cafe)
+    # El resumen se arma recién al mostrar la cola, bajo su candado
+    assert pedido.id not in sistema.resumenes_cola
+
+    item = sistema.cola_concurrente.get(timeout=0)
+    sistema.preparar_en_estacion(item, 'Estacion-1')
+    entradas('')
+    sistema.ver_cola_pedidos()
+    assert sistema.resumenes_cola == {}
+
+
+def _es_heap(heap):
+    return all(not heap[hijo] < heap[(hijo - 1) // 2] for hijo in range(1, len(heap)))
+
+
+def test_agregar_rechaza_ids_repetidos():
+    cola = ColaPrioridad()
+    assert cola.agregar(2, 'primero', 'A') == 'A'
+    assert cola.agregar(1, 'segundo', 'A') is None
+    assert len(cola) == 1 and cola.buscar_por_id('A')['pedido'] == 'primero'
+    assert cola.cancelar('A')['pedido'] == 'primero'
+    assert cola.esta_vacia()
+    # Ya cancelado, el ID puede volver a usarse
+    assert cola.agregar(1, 'tercero', 'A') == 'A'
+    assert _vaciar(cola) == ['A']
+
+
+def test_put_con_id_repetido_no_despierta_estaciones():
+    cola = ColaPrioridadBloqueante()
+    assert cola.put(2, 'primero', 'A') == 'A'
+    assert cola.put(1, 'segundo', 'A') is None
+    assert cola.get(timeout=0)['pedido'] == 'primero'
+    assert cola.get(timeout=0) is None
+
+
+def test_agregar_lote_informa_rechazados_y_deja_un_heap_valido():
+    rng = random.Random(9)
+    for previos, lote in ((1000, 50), (50, 1000)):
+        cola = ColaPrioridad()
+        for i in range(previos):
+            cola.agregar(rng.randint(1, 3), i, f'id{i}')
+        pedidos = [(rng.randint(1, 3), f'n{i}', f'id{rng.randint(0, previos + lote)}')
+                   for i in range(lote)]
+        resultado = cola.agregar_lote(pedidos)
+
+        vistos = {f'id{i}' for i in range(previos)}
+        esperados_agregados, esperados_rechazados = [], []
+        for _, _, pedido_id in pedidos:
+            destino = esperados_rechazados if pedido_id in vistos else esperados_agregados
+            destino.append(pedido_id)
+            vistos.add(pedido_id)
+        assert resultado == {'agregados': esperados_agregados,
+                             'rechazados': esperados_rechazados}
+        assert _es_heap(cola.heap)
+        assert len(cola) == previos + len(esperados_agregados)
+        prioridades = [cola.atender_siguiente()['prioridad'] for _ in range(len(cola))]
+        assert prioridades == sorted(prioridades)
+
+
+def test_agregar_lote_genera_ids_y_desempata_por_orden():
+    cola = ColaPrioridad()
+    resultado = cola.agregar_lote([(2, 'a'), (1, 'b'), (2, 'c')])
+    assert resultado == {'agregados': ['P0', 'P1', 'P2'], 'rechazados': []}
+    assert [cola.atender_siguiente()['pedido'] for _ in range(3)] == ['b', 'a', 'c']
+
+
+def test_fusionar_ignora_cancelados_y_respeta_la_llegada():
+    origen = ColaPrioridad()
+    for i in range(100):
+        origen.agregar(1 + i % 3, i, f'o{i}')
+    for i in range(0, 100, 3):
+        origen.cancelar(f'o{i}')
+    assert origen.obtener_estadisticas()['eliminados'] > 0
+
+    destino = ColaPrioridad()
+    destino.agregar(1, 'propio', 'o1')
+    destino.agregar(3, 'propio', 'd0')
+    resultado = destino.fusionar(origen)
+
+    vivos = [f'o{i}' for i in range(100) if i % 3]
+    assert resultado['rechazados'] == ['o1']
+    assert resultado['agregados'] == [pid for pid in vivos if pid != 'o1']
+    assert _es_heap(destino.heap)
+    # El origen no cambia
+    assert len(origen) == len(vivos)
+    assert destino.buscar_por_id('o1')['pedido'] == 'propio'
+
+    orden = _vaciar(destino)
+    # Dentro de cada nivel se conserva la llegada relativa del origen
+    assert [pid for pid in orden if pid != 'd0' and int(pid[1:]) % 3 == 2] == [
+        pid for pid in vivos if int(pid[1:]) % 3 == 2]
+    assert len(orden) == len(vivos) + 1
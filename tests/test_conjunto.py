@@ -0,0 +1,53 @@
+import operator
+import random
+
+import pytest
+
+from estructuras.conjunto import ConjuntoPersonalizado, ExpresionConjunto
+
+
+def _conjuntos(rng):
+    return [set(rng.sample(range(30), rng.randint(0, 20))) for _ in range(3)]
+
+
+def test_expresiones_coinciden_con_set():
+    rng = random.Random(16)
+    for _ in range(200):
+        a, b, c = _conjuntos(rng)
+        ca, cb, cc = (ConjuntoPersonalizado(x) for x in (a, b, c))
+        assert set((ca | cb) - cc) == (a | b) - c
+        assert set((ca & cb) ^ cc) == (a & b) ^ c
+        assert set(ca - (cb & cc)) == a - (b & c)
+        assert ((ca & cb) | cc).es_subconjunto(a | b | c)
+        assert (ca - cb).es_disjunto(cb)
+
+
+OPERADORES_EN_LUGAR = {'|=': operator.ior, '&=': operator.iand, '-=': operator.isub, '^=': operator.ixor}
+
+
+@pytest.mark.parametrize('operador', sorted(OPERADORES_EN_LUGAR))
+def test_operadores_en_lugar_con_expresiones_que_leen_el_destino(operador):
+    # a -= (a - b) y similares: la expresión lee `a` mientras se actualiza
+    aplicar = OPERADORES_EN_LUGAR[operador]
+    casos = (
+        lambda x, y, z: x - y,
+        lambda x, y, z: x & y,
+        lambda x, y, z: (x | z) - y,
+        lambda x, y, z: y ^ x,
+    )
+    rng = random.Random(operador)
+    for _ in range(100):
+        a, b, c = _conjuntos(rng)
+        for caso in casos:
+            ca, cb, cc = (ConjuntoPersonalizado(x) for x in (a, b, c))
+            expresion = caso(ca, cb, cc)
+            assert isinstance(expresion, ExpresionConjunto)
+            assert aplicar(ca, expresion) is ca
+            assert ca.elementos == aplicar(set(a), caso(a, b, c))
+
+
+def test_isub_con_la_propia_diferencia():
+    a = ConjuntoPersonalizado(range(10))
+    b = ConjuntoPersonalizado(range(5))
+    a -= a - b
+    assert a.elementos == set(range(5))
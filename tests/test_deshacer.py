@@ -0,0 +1,198 @@
+import time
+from collections import deque
+
+from estructuras.historial_operaciones import HistorialOperaciones
+from estructuras.pila import Pila
+
+
+def registrar_usuario(sistema, entradas, nombre, tipo='2', email=''):
+    entradas(nombre, tipo, email)
+    sistema.registrar_usuario()
+    return sistema.buscar_usuario_por_nombre(nombre)
+
+
+def registrar_producto(sistema, entradas, nombre, precio, categoria, ingredientes=''):
+    entradas(nombre, str(precio), categoria, ingredientes)
+    sistema.registrar_producto()
+    return sistema.buscar_productos(nombre)[0]
+
+
+def realizar_pedido(sistema, entradas, usuario, *productos):
+    entradas(usuario.nombre, *(p.nombre for p in productos), 'fin')
+    sistema.realizar_pedido()
+    return sistema.cola_pedidos.ver_siguiente()['pedido']
+
+
+def atender(sistema):
+    item = sistema.cola_concurrente.get(timeout=0)
+    sistema.preparar_en_estacion(item, 'Estacion-1')
+    return item['pedido']
+
+
+def test_deshacer_y_rehacer_registro_de_usuario(sistema, entradas):
+    usuario = registrar_usuario(sistema, entradas, 'Ana López', '1', 'ana@uni.edu')
+    uid = usuario.obtener_id()
+
+    assert sistema.operaciones_deshacer.deshacer()['exito']
+    assert sistema.buscar_usuario_por_nombre('Ana López') is None
+    assert sistema.buscar_usuario_por_email('ana@uni.edu') is None
+    assert sistema.obtener_usuario(uid) is None
+    assert usuario not in sistema.usuarios_activos()
+    assert sistema.sugerir_usuarios('Ana Lopes') == []
+    assert len(sistema.arbol_gastos) == 0
+    assert sistema.estadisticas_usuarios.obtener('profesor')['cantidad'] == 0
+
+    assert sistema.operaciones_deshacer.rehacer()['exito']
+    assert sistema.buscar_usuario_por_nombre('Ana López') is usuario
+    assert sistema.obtener_usuario(uid) is usuario
+    assert sistema.usuarios_activos('profesor') == [usuario]
+    assert sistema.usuarios_top_gasto() == [usuario]
+    assert sistema.estadisticas_usuarios.obtener('profesor')['cantidad'] == 1
+
+
+def test_deshacer_y_rehacer_registro_de_producto(sistema, entradas):
+    producto = registrar_producto(sistema, entradas, 'Muffin de arándanos', 2.75, 'Postres', 'harina, huevo')
+
+    assert sistema.operaciones_deshacer.deshacer()['exito']
+    assert sistema.buscar_productos('muffin') == []
+    assert sistema.arbol_precios.buscar(2.75) in (None, [])
+    assert 'postres' not in sistema.indice_categorias
+    assert not sistema.categorias_disponibles.contiene('postres')
+    assert producto not in sistema.productos_activos()
+    assert producto.id not in sistema.mascaras_ingredientes
+
+    assert sistema.operaciones_deshacer.rehacer()['exito']
+    assert sistema.buscar_productos('muffin') == [producto]
+    assert sistema.arbol_precios.buscar(2.75) == [producto]
+    assert sistema.indice_categorias.buscar(['postres']) == [producto]
+    assert sistema.productos_activos() == [producto]
+
+
+def test_deshacer_y_rehacer_pedido_en_cola(sistema, entradas):
+    usuario = registrar_usuario(sistema, entradas, 'Beto Ruiz')
+    cafe = registrar_producto(sistema, entradas, 'Café', 1.5, 'Bebidas')
+    pedido = realizar_pedido(sistema, entradas, usuario, cafe)
+
+    operacion = sistema.operaciones_deshacer.deshacer()
+    assert operacion['tipo'] == 'realizar_pedido' and operacion['exito']
+    assert sistema.cola_pedidos.esta_vacia()
+    assert pedido.id not in sistema.resumenes_cola
+
+    assert sistema.operaciones_deshacer.rehacer()['exito']
+    assert sistema.cola_pedidos.buscar_por_id(pedido.id)['pedido'] is pedido
+
+
+def test_operacion_nueva_limpia_rehacer(sistema, entradas):
+    registrar_usuario(sistema, entradas, 'Carla Gómez')
+    sistema.operaciones_deshacer.deshacer()
+    assert sistema.operaciones_deshacer.puede_rehacer()
+
+    registrar_producto(sistema, entradas, 'Té', 1.2, 'Bebidas')
+    assert not sistema.operaciones_deshacer.puede_rehacer()
+    assert sistema.operaciones_deshacer.rehacer() is None
+    assert sistema.buscar_usuario_por_nombre('Carla Gómez') is None
+
+
+def test_no_se_deshace_lo_ya_atendido(sistema, entradas):
+    usuario = registrar_usuario(sistema, entradas, 'Dora Paz', '3')
+    sandwich = registrar_producto(sistema, entradas, 'Sándwich', 3.5, 'Comidas')
+    pedido = realizar_pedido(sistema, entradas, usuario, sandwich)
+    assert atender(sistema) is pedido
+
+    # El pedido ya se entregó: no se puede deshacer y se descarta
+    operacion = sistema.operaciones_deshacer.deshacer()
+    assert operacion['tipo'] == 'realizar_pedido' and not operacion['exito']
+    assert not sistema.operaciones_deshacer.puede_rehacer()
+
+    # El producto tiene ventas y el usuario pedidos atendidos: siguen registrados
+    operacion = sistema.operaciones_deshacer.deshacer()
+    assert operacion['tipo'] == 'registrar_producto' and not operacion['exito']
+    assert sistema.buscar_productos('sándwich') == [sandwich]
+    assert sistema.productos_populares() == [(sandwich, 1)]
+
+    operacion = sistema.operaciones_deshacer.deshacer()
+    assert operacion['tipo'] == 'registrar_usuario' and not operacion['exito']
+    assert sistema.buscar_usuario_por_nombre('Dora Paz') is usuario
+    assert sistema.usuarios_top_gasto(1) == [usuario]
+    assert sistema.operaciones_deshacer.deshacer() is None
+
+
+def test_no_se_deshace_con_pedidos_en_cola(sistema, entradas):
+    usuario = registrar_usuario(sistema, entradas, 'Eva Sol')
+    jugo = registrar_producto(sistema, entradas, 'Jugo', 2.0, 'Bebidas')
+    pedido = realizar_pedido(sistema, entradas, usuario, jugo)
+    # El pedido sale del historial de deshacer pero sigue en la cola
+    sistema.operaciones_deshacer.pila_deshacer.items.pop()
+
+    assert not sistema.operaciones_deshacer.deshacer()['exito']
+    assert not sistema.operaciones_deshacer.deshacer()['exito']
+    assert sistema.cola_pedidos.buscar_por_id(pedido.id) is not None
+    assert sistema.buscar_productos('jugo') == [jugo]
+    assert sistema.buscar_usuario_por_nombre('Eva Sol') is usuario
+
+
+def test_pila_llena_descarta_el_mas_antiguo():
+    pila = Pila(capacidad_maxima=3)
+    for i in range(5):
+        pila.apilar(i)
+    assert pila.ver_todos() == [4, 3, 2]
+    assert isinstance(pila.items, deque) and pila.items.maxlen == 3
+
+    historial = HistorialOperaciones(capacidad_maxima=2)
+    for tipo in ('a', 'b', 'c'):
+        historial.registrar(tipo, deshacer=lambda: True, rehacer=lambda: True)
+    assert [historial.deshacer()['tipo'] for _ in range(2)] == ['c', 'b']
+    assert historial.deshacer() is None
+
+
+def test_descarte_en_pila_llena_no_depende_de_la_capacidad():
+    # Con una lista y pop(0) apilar en una pila llena costaría O(capacidad)
+    def tiempo(capacidad, apilados=20000):
+        pila = Pila(capacidad_maxima=capacidad)
+        for i in range(capacidad):
+            pila.apilar(i)
+        inicio = time.perf_counter()
+        for i in range(apilados):
+            pila.apilar(i)
+        return time.perf_counter() - inicio
+
+    chica = min(tiempo(10) for _ in range(3))
+    grande = min(tiempo(200000) for _ in range(3))
+    assert grande < chica * 10
+
+
+def test_no_se_deshace_con_un_pedido_en_preparacion(sistema, entradas):
+    usuario = registrar_usuario(sistema, entradas, 'Fabio Luna')
+    te = registrar_producto(sistema, entradas, 'Té', 1.2, 'Bebidas')
+    pedido = realizar_pedido(sistema, entradas, usuario, te, te)
+    sistema.operaciones_deshacer.pila_deshacer.items.pop()
+    assert sistema.pendientes_por_usuario == {usuario.obtener_id(): 1}
+    assert sistema.pendientes_por_producto == {te.id: 1}
+
+    # Una estación lo tomó de la cola pero todavía no lo entregó
+    item = sistema.cola_concurrente.get(timeout=0)
+    assert sistema.cola_pedidos.esta_vacia()
+    assert not sistema.quitar_producto(te)
+    assert not sistema.quitar_usuario(usuario)
+
+    sistema.preparar_en_estacion(item, 'Estacion-1')
+    assert sistema.pedidos_pendientes == {}
+    assert sistema.pendientes_por_usuario == {} and sistema.pendientes_por_producto == {}
+    assert pedido.estado == 'entregado'
+
+
+def test_cancelar_y_rehacer_actualizan_los_pendientes(sistema, entradas):
+    usuario = registrar_usuario(sistema, entradas, 'Gina Paz')
+    jugo = registrar_producto(sistema, entradas, 'Jugo', 2.0, 'Bebidas')
+    pedido = realizar_pedido(sistema, entradas, usuario, jugo)
+
+    entradas('c', pedido.id)
+    sistema.gestionar_pedido_en_cola()
+    assert sistema.pendientes_por_usuario == {} and sistema.pendientes_por_producto == {}
+
+    pedido = realizar_pedido(sistema, entradas, usuario, jugo)
+    assert sistema.operaciones_deshacer.deshacer()['exito']
+    assert sistema.pedidos_pendientes == {}
+    assert sistema.operaciones_deshacer.rehacer()['exito']
+    assert sistema.pedidos_pendientes == {pedido.id: pedido}
+    assert sistema.pendientes_por_producto == {jugo.id: 1}
@@ -0,0 +1,80 @@
+import random
+import sys
+
+from test_deshacer import atender, realizar_pedido, registrar_producto, registrar_usuario
+
+
+def test_agregados_por_tipo_siguen_consistentes(sistema, entradas):
+    Pedido = sys.modules['main'].Pedido
+    rng = random.Random(23)
+    productos = [registrar_producto(sistema, entradas, f"Producto {i}", precio, 'Varios')
+                 for i, precio in enumerate((1.1, 2.35, 0.7, 4.05))]
+    usuarios = []
+    for paso in range(300):
+        accion = rng.random()
+        if accion < 0.25 or not usuarios:
+            usuarios.append(registrar_usuario(sistema, entradas, f"Usuario {paso}", rng.choice('123')))
+        elif accion < 0.35:
+            sistema.operaciones_deshacer.deshacer()
+        elif accion < 0.45:
+            sistema.operaciones_deshacer.rehacer()
+        elif accion < 0.55:
+            # Pedido por la consola: queda en cola y puede deshacerse o atenderse
+            usuario = rng.choice(usuarios)
+            en_catalogo = sistema.productos_activos()
+            if sistema.obtener_usuario(usuario.obtener_id()) is not None and en_catalogo:
+                realizar_pedido(sistema, entradas, usuario, rng.choice(en_catalogo))
+        elif accion < 0.65 and not sistema.cola_pedidos.esta_vacia():
+            atender(sistema)
+        else:
+            usuario = rng.choice(usuarios)
+            if sistema.obtener_usuario(usuario.obtener_id()) is not None:
+                sistema.completar_pedido(Pedido(usuario, rng.sample(productos, 2)))
+        if paso % 20 == 0:
+            assert sistema.verificar_estadisticas() == []
+    assert sistema.verificar_estadisticas() == []
+
+    activos = sistema.usuarios_activos()
+    assert len(sistema.estadisticas_usuarios) == len(activos)
+    for tipo in sistema.TIPOS_USUARIO:
+        del_tipo = [u for u in activos if u.tipo == tipo]
+        resumen = sistema.estadisticas_usuarios.obtener(tipo)
+        assert resumen['cantidad'] == len(del_tipo)
+        assert resumen['total_pedidos'] == sum(u.info['total_pedidos'] for u in del_tipo)
+
+
+def test_verificar_detecta_diferencias(sistema, entradas):
+    usuario = registrar_usuario(sistema, entradas, 'Ana', '1')
+    assert sistema.verificar_estadisticas() == []
+    usuario.info['total_pedidos'] += 1
+    assert sistema.verificar_estadisticas() == ['profesor.pedidos: 0 != 1']
+
+
+def test_carga_inicial_agrupa_por_el_tipo_del_usuario(sistema, monkeypatch, capsys):
+    main = sys.modules[type(sistema).__module__]
+
+    class GestorQueNormaliza(main.GestorUsuarios):
+        # Como el gestor real: el tipo guardado puede diferir del archivo
+        def registrar_usuario(self, nombre, tipo, email=''):
+            return super().registrar_usuario(nombre, tipo.strip().lower(), email)
+
+    class Cargador:
+        def cargar_usuarios(self):
+            return [{'nombre': 'Ana', 'tipo': ' Profesor'}, {'nombre': 'Beto', 'tipo': 'ESTUDIANTE'}]
+
+        def cargar_productos(self):
+            return []
+
+        def cargar_pedidos_historicos(self):
+            return [{'id': 'H1', 'usuario_id': 'U001', 'producto_ids': [], 'total': 4.0,
+                     'fecha': '2024-03-01 09:15', 'estado': 'entregado'}]
+
+    monkeypatch.setattr(main, 'GestorUsuarios', GestorQueNormaliza)
+    monkeypatch.setattr(main, 'CargadorDatos', Cargador)
+    sistema = main.SistemaCafeteria()
+    capsys.readouterr()
+
+    assert sorted(sistema.estadisticas_usuarios.grupos()) == ['estudiante', 'profesor']
+    assert sistema.estadisticas_usuarios.obtener('profesor')['total_gastado'] == 4.0
+    if sistema.almacen_pedidos is not None:
+        assert sistema.almacen_pedidos.ventas_por_tipo() == {'profesor': {'pedidos': 1, 'total': 4.0}}
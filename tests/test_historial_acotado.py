@@ -0,0 +1,56 @@
+import os
+
+from estructuras.historial_acotado import HistorialAcotado
+
+
+def _llenar(historial, cantidad, inicio=0):
+    for i in range(inicio, inicio + cantidad):
+        historial.agregar_al_inicio({'id': f"PED{i:03d}", 'total': float(i)})
+
+
+def test_orden_y_posiciones_entre_buffer_y_disco(tmp_path):
+    historial = HistorialAcotado(5, str(tmp_path / 'h.jsonl'))
+    _llenar(historial, 23)
+    ids = [f"PED{i:03d}" for i in range(22, -1, -1)]
+    assert len(historial) == 23
+    assert [d['id'] for d in historial] == ids
+    assert [d['id'] for d in historial.obtener_ultimos_n(8)] == ids[:8]
+    assert [historial.obtener_en_posicion(i)['id'] for i in range(23)] == ids
+    assert [d['id'] for d in historial.iter_antiguos(tamano_pagina=4, limite=6)] == ids[5:11]
+
+
+def test_cerrar_y_reabrir_conserva_el_buffer(tmp_path):
+    ruta = str(tmp_path / 'h.jsonl')
+    historial = HistorialAcotado(5, ruta)
+    _llenar(historial, 23)
+    historial.cerrar()
+    assert len(historial) == 23
+
+    reabierto = HistorialAcotado(5, ruta)
+    assert len(reabierto) == 23
+    assert [d['id'] for d in reabierto] == [f"PED{i:03d}" for i in range(22, -1, -1)]
+
+    # Lo nuevo queda delante de lo ya guardado
+    _llenar(reabierto, 7, inicio=23)
+    reabierto.cerrar()
+    assert [d['id'] for d in HistorialAcotado(5, ruta)] == [f"PED{i:03d}" for i in range(29, -1, -1)]
+
+
+def test_no_deja_archivos_abiertos(tmp_path):
+    if not os.path.isdir('/proc/self/fd'):
+        return
+    abiertos = len(os.listdir('/proc/self/fd'))
+    historiales = [HistorialAcotado(2, str(tmp_path / f"u{i}.jsonl")) for i in range(300)]
+    for historial in historiales:
+        _llenar(historial, 4)
+        historial.obtener_en_posicion(3)
+        list(historial)
+    assert len(os.listdir('/proc/self/fd')) <= abiertos + 1
+
+
+def test_limpiar_borra_el_archivo(tmp_path):
+    ruta = str(tmp_path / 'h.jsonl')
+    historial = HistorialAcotado(2, ruta)
+    _llenar(historial, 5)
+    historial.limpiar()
+    assert len(historial) == 0 and not os.path.exists(ruta)
@@ -0,0 +1,218 @@
+import random
+
+from estructuras.indice_difuso import IndiceDifuso, distancia_edicion
+from estructuras.indice_prefijos import IndicePrefijos
+from estructuras.indice_trigramas import IndiceTrigramas, normalizar_texto
+
+
+def _indice_trigramas(*nombres):
+    indice = IndiceTrigramas()
+    for i, nombre in enumerate(nombres):
+        indice.agregar(f'P{i}', nombre, nombre)
+    return indice
+
+
+def test_trigramas_ignoran_acentos_y_mayusculas():
+    indice = _indice_trigramas('Café con leche', 'Té verde', 'Pan de ÑANDÚ')
+    assert indice.buscar('cafe') == ['Café con leche']
+    assert indice.buscar('CAFÉ CON') == ['Café con leche']
+    assert indice.buscar('nandu') == ['Pan de ÑANDÚ']
+    assert normalizar_texto('Ñandú Crème') == 'nandu creme'
+
+
+def test_trigramas_consultas_cortas():
+    indice = _indice_trigramas('Té verde', 'Café', 'Tostado')
+    assert indice.buscar('te') == ['Té verde']
+    assert indice.buscar('t') == ['Té verde', 'Tostado']
+    assert indice.buscar('') == ['Té verde', 'Café', 'Tostado']
+    assert indice.buscar('zz') == []
+
+
+def test_trigramas_devuelven_en_orden_de_alta():
+    indice = _indice_trigramas('Jugo de naranja', 'Naranja exprimida', 'Torta de naranja')
+    assert indice.buscar('naranja') == ['Jugo de naranja', 'Naranja exprimida', 'Torta de naranja']
+    # Reemplazar el texto de una clave la pasa al final
+    indice.agregar('P0', 'Jugo de naranja grande', 'Jugo grande')
+    assert indice.buscar('naranja') == ['Naranja exprimida', 'Torta de naranja', 'Jugo grande']
+    assert indice.buscar('jugo de') == ['Jugo grande']
+
+
+def test_trigramas_eliminar_limpia_los_postings():
+    indice = _indice_trigramas('Medialuna', 'Muffin')
+    assert indice.eliminar('P0')
+    assert not indice.eliminar('P0')
+    assert indice.buscar('medialuna') == [] and indice.buscar('lun') == []
+    assert not indice.contiene('P0') and len(indice) == 1
+    assert all('P0' not in claves for claves in indice._postings.values())
+    assert 'dia' not in indice._postings
+    indice.eliminar('P1')
+    assert indice._postings == {}
+
+
+def test_trigramas_contra_busqueda_lineal():
+    rng = random.Random(17)
+    silabas = ['ca', 'fé', 'te', 'pan', 'jugo', 'na', 'ran', 'ja', 'tor', 'ta', ' ']
+    nombres = {}
+    indice = IndiceTrigramas()
+    for i in range(600):
+        nombre = ''.join(rng.choice(silabas) for _ in range(rng.randint(2, 6)))
+        nombres[f'P{i}'] = nombre
+        indice.agregar(f'P{i}', nombre)
+    for clave in rng.sample(sorted(nombres), 150):
+        indice.eliminar(clave)
+        del nombres[clave]
+    for consulta in ('ca', 'pan', 'fe', 'ranja', 'ta t', 'jugo na', 'xyz', 'ataca'):
+        esperado = [clave for clave, nombre in nombres.items()
+                    if normalizar_texto(consulta) in normalizar_texto(nombre)]
+        assert indice.buscar(consulta) == esperado
+
+
+def _levenshtein(a, b):
+    previa = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        actual = [i]
+        for j, cb in enumerate(b, 1):
+            actual.append(min(previa[j] + 1, actual[j - 1] + 1, previa[j - 1] + (ca != cb)))
+        previa = actual
+    return previa[-1]
+
+
+def test_distancia_edicion_acotada():
+    rng = random.Random(18)
+    for _ in range(2000):
+        a = ''.join(rng.choice('abc') for _ in range(rng.randint(0, 8)))
+        b = ''.join(rng.choice('abc') for _ in range(rng.randint(0, 8)))
+        maximo = rng.randint(0, 3)
+        assert distancia_edicion(a, b, maximo) == min(_levenshtein(a, b), maximo + 1)
+
+
+def test_palabras_similares_contra_fuerza_bruta():
+    rng = random.Random(19)
+    vocabulario = {''.join(rng.choice('aeilnrst') for _ in range(rng.randint(2, 11)))
+                   for _ in range(400)}
+    indice = IndiceDifuso()
+    for i, palabra in enumerate(sorted(vocabulario)):
+        indice.agregar(i, palabra)
+    for _ in range(200):
+        consulta = ''.join(rng.choice('aeilnrst') for _ in range(rng.randint(2, 11)))
+        tolerancia = indice._tolerancia(consulta)
+        esperado = {palabra: _levenshtein(consulta, palabra) for palabra in vocabulario
+                    if _levenshtein(consulta, palabra) <= tolerancia}
+        assert indice.palabras_similares(consulta) == esperado
+
+
+def test_difuso_ordena_por_distancia_y_alta():
+    indice = IndiceDifuso()
+    for i, nombre in enumerate(['Capuchino', 'Capuccino doble', 'Cappuccino', 'Té']):
+        indice.agregar(i, nombre, nombre)
+    assert indice.buscar('capuccino') == [
+        ('Capuccino doble', 0), ('Capuchino', 1), ('Cappuccino', 1)]
+    assert indice.buscar('capuccino', limite=2) == [('Capuccino doble', 0), ('Capuchino', 1)]
+    assert indice.buscar('capucino doblee') == [('Capuccino doble', 2)]
+    # Palabras cortas no admiten errores
+    assert indice.buscar('te') == [('Té', 0)] and indice.buscar('ta') == []
+
+
+def test_difuso_eliminar_limpia_el_indice_de_borrados():
+    indice = IndiceDifuso()
+    indice.agregar('a', 'Jugo de naranja')
+    indice.agregar('b', 'Jugo de manzana')
+    assert indice.eliminar('a')
+    assert not indice.eliminar('a')
+    # "jugo" y "de" siguen en uso por "b"; "naranja" sale del vocabulario
+    assert set(indice._claves_por_palabra) == {'jugo', 'de', 'manzana'}
+    assert all('naranja' not in grupo for grupo in indice._variantes.values())
+    assert indice.buscar('naranja') == [] and indice.buscar('jugo') == [('b', 0)]
+
+    indice.agregar('b', 'Licuado')
+    assert set(indice._claves_por_palabra) == {'licuado'}
+    indice.eliminar('b')
+    assert indice._variantes == {} and indice._claves_por_palabra == {} and len(indice) == 0
+
+
+def test_prefijos_limites_del_arreglo():
+    indice = IndicePrefijos()
+    for nombre in ('beto', 'ana', 'anabel', 'zoe'):
+        indice.agregar(nombre, nombre)
+    assert indice.completar('ana') == ['ana', 'anabel']
+    assert indice.completar('anab') == ['anabel']
+    assert indice.completar('zoe') == ['zoe']
+    assert indice.completar('zoey') == [] and indice.completar('zz') == []
+    assert indice.completar('a', limite=1) == ['ana']
+    assert indice.completar('') == ['ana', 'anabel', 'beto', 'zoe']
+    assert indice.completar('0') == [] and indice.completar('b') == ['beto']
+
+
+def test_prefijos_por_palabras_no_repiten_valores():
+    indice = IndicePrefijos(por_palabras=True)
+    indice.agregar('Ana  López', 'ana')
+    indice.agregar('López López', 'lopez')
+    # Con el mismo texto, primero el dado de alta antes
+    assert indice.completar('lop') == ['ana', 'lopez']
+    assert indice.completar('ANA LO') == ['ana']
+    assert indice.buscar_exacto(' ana lópez ') == ['ana']
+    assert len(indice) == 2
+
+
+def test_prefijos_ignoran_textos_en_blanco():
+    indice = IndicePrefijos(por_palabras=True)
+    assert not indice.agregar('   ', 'vacio')
+    indice.agregar_lote([('', 'a'), ('\t', 'b'), ('Luz', 'c')])
+    assert len(indice) == 1 and indice._claves == ['luz']
+    assert indice.completar('') == ['c']
+    assert indice.buscar_exacto('  ') == []
+    assert not indice.eliminar(' ', 'vacio')
+
+
+def test_prefijos_eliminar_solo_ese_valor():
+    indice = IndicePrefijos(por_palabras=True)
+    primera, segunda = object(), object()
+    indice.agregar('Ana Paz', primera)
+    indice.agregar('Ana Paz', segunda)
+    assert indice.eliminar('ana paz', primera)
+    assert not indice.eliminar('Ana Paz', primera)
+    assert indice.buscar_exacto('Ana Paz') == [segunda]
+    assert indice.completar('paz') == [segunda]
+    assert indice._claves == ['ana paz', 'paz']
+    assert indice.eliminar('Ana Paz', segunda)
+    assert indice._claves == [] and indice._exactos == {} and len(indice) == 0
+
+
+def test_prefijos_contra_recorrido():
+    rng = random.Random(20)
+    indice = IndicePrefijos(por_palabras=True)
+    nombres = {}
+    for i in range(300):
+        nombre = ' '.join(rng.choice(['ana', 'anibal', 'luz', 'lucas', 'paz', 'pedro'])
+                          for _ in range(rng.randint(1, 3)))
+        nombres[i] = nombre
+        indice.agregar(nombre, i)
+    for i in rng.sample(sorted(nombres), 100):
+        assert indice.eliminar(nombres.pop(i), i)
+    def primera_entrada(nombre, prefijo):
+        # Menor sufijo por palabras que empieza con el prefijo (None si no hay)
+        palabras = nombre.split()
+        sufijos = [' '.join(palabras[j:]) for j in range(len(palabras))]
+        return min((s for s in sufijos if s.startswith(prefijo)), default=None)
+
+    for prefijo in ('a', 'an', 'ani', 'lu', 'luc', 'paz p', 'pedro a', 'x'):
+        esperado = sorted((primera_entrada(n, prefijo), i) for i, n in nombres.items()
+                          if primera_entrada(n, prefijo) is not None)
+        assert indice.completar(prefijo, limite=1000) == [i for _, i in esperado]
+
+
+def test_seleccionar_usuario_comparte_el_selector(sistema, entradas, capsys):
+    from test_deshacer import registrar_usuario
+    ana = registrar_usuario(sistema, entradas, 'Ana Paz')
+    anabel = registrar_usuario(sistema, entradas, 'Anabel Ruiz')
+    capsys.readouterr()
+
+    entradas('2')
+    assert sistema.seleccionar_usuario('ana') is anabel
+    for invalida in ('0', '3', 'x'):
+        entradas(invalida)
+        assert sistema.seleccionar_usuario('an') is None
+        assert 'Selección inválida' in capsys.readouterr().out
+    entradas('1')
+    assert sistema.seleccionar_usuario('an') is ana
+    assert sistema.seleccionar_usuario('anab') is anabel
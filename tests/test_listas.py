@@ -0,0 +1,144 @@
+import random
+from collections import deque
+
+from estructuras.lista_desenrollada import ListaDesenrollada
+from estructuras.lista_enlazada import ListaEnlazada
+
+
+def _bloques(lista):
+    bloques = []
+    bloque = lista.cabeza
+    while bloque:
+        bloques.append(bloque)
+        bloque = bloque.siguiente
+    return bloques
+
+
+def _verificar_bloques(lista):
+    bloques = _bloques(lista)
+    assert all(0 < len(b.elementos) <= lista.tamano_bloque for b in bloques)
+    assert lista.cola is (bloques[-1] if bloques else None)
+    assert sum(len(b.elementos) for b in bloques) == len(lista)
+    return [len(b.elementos) for b in bloques]
+
+
+def test_desenrollada_abre_bloques_en_los_bordes():
+    lista = ListaDesenrollada(tamano_bloque=4)
+    for i in range(4):
+        lista.agregar_al_final(i)
+    assert _verificar_bloques(lista) == [4]
+    lista.agregar_al_final(4)
+    assert _verificar_bloques(lista) == [4, 1]
+    lista.agregar_al_inicio(-1)
+    assert _verificar_bloques(lista) == [1, 4, 1]
+    lista.agregar_al_inicio(-2)
+    assert _verificar_bloques(lista) == [2, 4, 1]
+    assert lista.obtener_todos() == [-2, -1, 0, 1, 2, 3, 4]
+    assert [lista.obtener_en_posicion(i) for i in (0, 1, 2, 5, 6, 7)] == [-2, -1, 0, 3, 4, None]
+
+
+def test_desenrollada_descarta_bloques_vacios():
+    lista = ListaDesenrollada(tamano_bloque=3)
+    for i in range(7):
+        lista.agregar_al_final(i)
+    assert _verificar_bloques(lista) == [3, 3, 1]
+    for esperado in range(6):
+        assert lista.eliminar_primero() == esperado
+        _verificar_bloques(lista)
+    assert _verificar_bloques(lista) == [1]
+    assert lista.eliminar_primero() == 6
+    assert lista.cabeza is None and lista.cola is None and lista.esta_vacia()
+    assert lista.eliminar_primero() is None
+    # Vaciada, vuelve a aceptar elementos por ambos extremos
+    lista.agregar_al_final('a')
+    lista.agregar_al_inicio('b')
+    assert lista.obtener_todos() == ['b', 'a'] and _verificar_bloques(lista) == [2]
+
+
+def test_desenrollada_contra_deque():
+    rng = random.Random(11)
+    for tamano_bloque in (1, 2, 5, 64):
+        lista = ListaDesenrollada(tamano_bloque)
+        referencia = deque()
+        for paso in range(3000):
+            operacion = rng.random()
+            if operacion < 0.35:
+                lista.agregar_al_inicio(paso)
+                referencia.appendleft(paso)
+            elif operacion < 0.7:
+                lista.agregar_al_final(paso)
+                referencia.append(paso)
+            else:
+                esperado = referencia.popleft() if referencia else None
+                assert lista.eliminar_primero() == esperado
+            if paso % 100 == 0:
+                _verificar_bloques(lista)
+        _verificar_bloques(lista)
+        assert list(lista) == list(referencia) == lista.obtener_todos()
+        for n in (0, 1, tamano_bloque, tamano_bloque + 1, len(referencia) + 5):
+            assert lista.obtener_ultimos_n(n) == list(referencia)[:n]
+        for i in rng.sample(range(len(referencia)), 50):
+            assert lista.obtener_en_posicion(i) == referencia[i]
+        assert lista.buscar(lambda x: x % 7 == 0) == [x for x in referencia if x % 7 == 0]
+
+
+def _pedido(i, dia, estado):
+    return {'id': i, 'fecha': f'2026-03-{dia:02d}', 'estado': estado}
+
+
+def test_indices_de_lista_enlazada_contra_recorrido():
+    rng = random.Random(13)
+    lista = ListaEnlazada(campo_fecha='fecha', campos_indexados=('estado',))
+    referencia = deque()
+    for i in range(2000):
+        pedido = _pedido(i, rng.randint(1, 28), rng.choice(['pendiente', 'listo', 'entregado']))
+        if rng.random() < 0.5:
+            lista.agregar_al_inicio(pedido)
+            referencia.appendleft(pedido)
+        else:
+            lista.agregar_al_final(pedido)
+            referencia.append(pedido)
+        if rng.random() < 0.3:
+            assert lista.eliminar_primero() is referencia.popleft()
+        if rng.random() < 0.2 and referencia:
+            objetivo = rng.choice(referencia)
+            lista.actualizar_campo(objetivo, 'estado', 'entregado')
+            lista.actualizar_campo(objetivo, 'fecha', f'2026-03-{rng.randint(1, 28):02d}')
+
+    assert len(lista) == len(referencia)
+    assert lista.cola.dato is referencia[-1]
+    assert lista.obtener_ultimos_n(5) == list(referencia)[:5]
+    for estado in ('pendiente', 'listo', 'entregado', 'cancelado'):
+        assert sorted(p['id'] for p in lista.buscar_por_campo('estado', estado)) == sorted(
+            p['id'] for p in referencia if p['estado'] == estado)
+    desde, hasta = '2026-03-10', '2026-03-12'
+    en_rango = lista.buscar_por_rango_fecha(desde, hasta)
+    assert [p['fecha'] for p in en_rango] == sorted(p['fecha'] for p in en_rango)
+    assert sorted(p['id'] for p in en_rango) == sorted(
+        p['id'] for p in referencia if desde <= p['fecha'] <= hasta)
+    # Los índices no conservan entradas eliminadas
+    assert len(lista._fechas) == len(referencia)
+    assert sum(len(g) for g in lista._indices['estado'].values()) == len(referencia)
+
+
+def test_lista_enlazada_vaciada_reinicia_la_cola():
+    lista = ListaEnlazada(campo_fecha='fecha', campos_indexados=('estado',))
+    for i in range(3):
+        lista.agregar_al_final(_pedido(i, 1, 'pendiente'))
+    while lista.eliminar_primero() is not None:
+        pass
+    assert lista.cabeza is None and lista.cola is None and len(lista) == 0
+    assert lista.buscar_por_campo('estado', 'pendiente') == []
+    assert lista._indices['estado'] == {} and lista._fechas == []
+    lista.agregar_al_final(_pedido(9, 2, 'listo'))
+    assert lista.cabeza is lista.cola and lista.obtener_ultimos_n(3) == [_pedido(9, 2, 'listo')]
+
+
+def test_lista_enlazada_sin_indices_recorre():
+    lista = ListaEnlazada()
+    lista.agregar_al_final(_pedido(1, 5, 'listo'))
+    lista.agregar_al_final({'id': 2})
+    lista.agregar_al_final(_pedido(3, 2, 'listo'))
+    # Las entradas sin el campo consultado se omiten
+    assert [p['id'] for p in lista.buscar_por_rango_fecha('2026-03-01', '2026-03-31')] == [3, 1]
+    assert [p['id'] for p in lista.buscar_por_campo('estado', 'listo')] == [1, 3]
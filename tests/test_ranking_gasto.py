@@ -0,0 +1,121 @@
+import random
+import sys
+import threading
+
+from estructuras.cola_concurrente import EstacionesCocina
+from test_deshacer import registrar_producto, registrar_usuario
+
+
+def _ordenados(sistema):
+    # Referencia: ordenar a todos los usuarios activos por gasto
+    return sorted(sistema.usuarios_activos(),
+                  key=lambda u: (u.info['total_gastado'], u.obtener_id()), reverse=True)
+
+
+def _verificar_ranking(sistema, rng):
+    esperado = _ordenados(sistema)
+    assert len(sistema.arbol_gastos) == len(esperado)
+    for k in (1, 3, 10, len(esperado) + 1):
+        assert sistema.usuarios_top_gasto(k) == esperado[:k]
+    for puesto, usuario in enumerate(esperado, 1):
+        assert sistema.posicion_por_gasto(usuario) == puesto
+    for monto in [0.0, 1.25] + [rng.choice([0.5, 2.0, 7.5, 12.75, 40.0]) for _ in range(3)]:
+        mayores = [u for u in esperado if u.info['total_gastado'] >= monto]
+        assert sistema.usuarios_con_gasto_desde(monto) == (len(mayores), mayores)
+        assert sistema.usuarios_con_gasto_desde(monto, limite=2) == (len(mayores), mayores[:2])
+
+
+def test_ranking_coincide_con_ordenar_todo(sistema, entradas):
+    Pedido = sys.modules['main'].Pedido
+    rng = random.Random(22)
+    productos = [registrar_producto(sistema, entradas, f"Producto {i}", precio, 'Varios')
+                 for i, precio in enumerate((1.25, 2.5, 3.75, 0.5, 6.0))]
+    usuarios = []
+    for paso in range(400):
+        accion = rng.random()
+        if accion < 0.2 or not usuarios:
+            usuarios.append(registrar_usuario(sistema, entradas, f"Usuario {paso}", rng.choice('123')))
+        elif accion < 0.3:
+            sistema.operaciones_deshacer.deshacer()
+        elif accion < 0.35:
+            sistema.operaciones_deshacer.rehacer()
+        else:
+            usuario = rng.choice(usuarios)
+            if sistema.obtener_usuario(usuario.obtener_id()) is not None:
+                sistema.completar_pedido(Pedido(usuario, rng.sample(productos, rng.randint(1, 3))))
+        if paso % 25 == 0:
+            _verificar_ranking(sistema, rng)
+    _verificar_ranking(sistema, rng)
+
+
+def test_ranking_con_estaciones_atendiendo_en_paralelo(sistema, entradas):
+    Pedido = sys.modules['main'].Pedido
+    rng = random.Random(2)
+    productos = [registrar_producto(sistema, entradas, f"Producto {i}", 1.25 * (i + 1), 'Varios')
+                 for i in range(4)]
+    usuarios = [registrar_usuario(sistema, entradas, f"Cliente {i}") for i in range(20)]
+
+    estaciones = EstacionesCocina(sistema.cola_concurrente, sistema.preparar_en_estacion,
+                                  num_estaciones=4, intervalo_espera=0.01)
+    estaciones.iniciar()
+
+    def encolar():
+        for _ in range(600):
+            pedido = Pedido(rng.choice(usuarios), rng.sample(productos, 2))
+            sistema.cola_concurrente.put(pedido.prioridad, pedido, pedido.id)
+
+    productor = threading.Thread(target=encolar)
+    productor.start()
+    # Altas desde la consola mientras las estaciones actualizan el ranking
+    for i in range(60):
+        registrar_usuario(sistema, entradas, f"Nuevo {i}")
+    productor.join()
+    estaciones.detener(vaciar=True)
+
+    assert not estaciones.errores
+    assert sistema.total_pedidos_procesados == 600
+    _verificar_ranking(sistema, rng)
+
+
+def test_venta_de_producto_retirado_no_vuelve_al_ranking(sistema, entradas):
+    Pedido = sys.modules['main'].Pedido
+    usuario = registrar_usuario(sistema, entradas, 'Lara Sosa')
+    cafe = registrar_producto(sistema, entradas, 'Café', 1.5, 'Bebidas')
+    te = registrar_producto(sistema, entradas, 'Té', 1.2, 'Bebidas')
+    assert sistema.operaciones_deshacer.deshacer()['exito']
+    assert te.id in sistema.productos_retirados
+
+    # Un pedido armado antes del retiro se entrega después
+    sistema.completar_pedido(Pedido(usuario, [cafe, te, te]))
+    assert sistema.productos_populares() == [(cafe, 1)]
+    assert len(sistema.arbol_popularidad) == 1
+    sistema.completar_pedido(Pedido(usuario, [te]))
+    assert sistema.productos_populares() == [(cafe, 1)]
+    assert sistema.ventas_por_producto[te.id] == 3
+
+    assert sistema.operaciones_deshacer.rehacer()['exito']
+    assert sistema.productos_populares() == [(te, 3), (cafe, 1)]
+    sistema.completar_pedido(Pedido(usuario, [te]))
+    assert sistema.productos_populares() == [(te, 4), (cafe, 1)]
+    assert len(sistema.arbol_popularidad) == 2
+
+
+def test_pedido_de_usuario_retirado_no_vuelve_al_ranking(sistema, entradas):
+    Pedido = sys.modules['main'].Pedido
+    cafe = registrar_producto(sistema, entradas, 'Café', 1.5, 'Bebidas')
+    otro = registrar_usuario(sistema, entradas, 'Omar Gil')
+    usuario = registrar_usuario(sistema, entradas, 'Nora Díaz')
+    assert sistema.operaciones_deshacer.deshacer()['exito']
+    assert usuario.obtener_id() in sistema.usuarios_retirados
+
+    # Un pedido armado antes del retiro se entrega después
+    sistema.completar_pedido(Pedido(usuario, [cafe, cafe]))
+    assert sistema.usuarios_top_gasto() == [otro]
+    assert len(sistema.arbol_gastos) == 1
+
+    assert sistema.operaciones_deshacer.rehacer()['exito']
+    assert sistema.usuarios_top_gasto() == [usuario, otro]
+    assert sistema.posicion_por_gasto(usuario) == 1
+    sistema.completar_pedido(Pedido(usuario, [cafe]))
+    assert sistema.usuarios_con_gasto_desde(4.5) == (1, [usuario])
+    assert len(sistema.arbol_gastos) == 2
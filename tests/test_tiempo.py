@@ -0,0 +1,108 @@
+import random
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+from estructuras.acumulador_temporal import AcumuladorTemporal
+from estructuras.tiempo import EPOCA, como_fecha, segundos_epoca
+
+
+def test_segundos_epoca_acepta_fechas_y_cadenas():
+    assert segundos_epoca(EPOCA) == 0
+    assert segundos_epoca('1970-01-02') == 86400
+    assert segundos_epoca('2024-11-01 12:30') == segundos_epoca(datetime(2024, 11, 1, 12, 30))
+    assert como_fecha('2024-11-01 12:30') == datetime(2024, 11, 1, 12, 30)
+
+
+def _ventas(rng, desde, cantidad=500):
+    for _ in range(cantidad):
+        fecha = desde + timedelta(minutes=rng.randrange(10 * 24 * 60))
+        yield fecha, round(rng.uniform(1, 20), 2)
+
+
+def test_rollups_coinciden_con_sumar_todo():
+    rng = random.Random(25)
+    inicio = datetime(2024, 11, 1)
+    ahora = inicio + timedelta(days=10)
+    ventas = list(_ventas(rng, inicio))
+    acumulador = AcumuladorTemporal(reloj=lambda: ahora)
+    for fecha, monto in ventas:
+        acumulador.registrar(fecha.strftime('%Y-%m-%d %H:%M'), monto)
+
+    for inicio_dia, pedidos, total in acumulador.serie('dia', 11):
+        del_dia = [m for f, m in ventas if inicio_dia <= f < inicio_dia + timedelta(days=1)]
+        assert pedidos == len(del_dia)
+        assert total == pytest.approx(sum(del_dia))
+
+    # Las 3 cubetas horarias que terminan en la de `hasta`: de 11:00 a 14:00
+    hasta = inicio + timedelta(days=4, hours=13, minutes=20)
+    fin = hasta.replace(minute=0) + timedelta(hours=1)
+    ultimas_3h = [m for f, m in ventas if fin - timedelta(hours=3) <= f < fin]
+    pedidos, total = acumulador.ventana('hora', 3, hasta)
+    assert pedidos == len(ultimas_3h) and total == pytest.approx(sum(ultimas_3h))
+
+
+def test_almacen_y_acumulador_agrupan_los_mismos_dias():
+    pytest.importorskip('numpy')
+    from estructuras.almacen_pedidos import AlmacenPedidos
+
+    rng = random.Random(7)
+    inicio = datetime(2024, 11, 1)
+    ventas = list(_ventas(rng, inicio, 300))
+    almacen = AlmacenPedidos(capacidad_inicial=16)
+    acumulador = AcumuladorTemporal(reloj=lambda: inicio + timedelta(days=10))
+    for i, (fecha, monto) in enumerate(ventas):
+        texto = fecha.strftime('%Y-%m-%d %H:%M')
+        almacen.agregar(f"PED{i}", 'U001', 'estudiante', texto, monto, 'entregado', ['P001'])
+        acumulador.registrar(texto, monto)
+
+    por_dia = almacen.ventas_por_dia()
+    for inicio_dia, pedidos, total in acumulador.serie('dia', 11):
+        datos = por_dia.get(inicio_dia.strftime('%Y-%m-%d'), {'pedidos': 0, 'total': 0.0})
+        assert datos['pedidos'] == pedidos
+        assert datos['total'] == pytest.approx(total)
+
+
+def test_tasa_de_una_ventana_vacia_es_cero():
+    ahora = datetime(2024, 11, 1, 12, 0)
+    acumulador = AcumuladorTemporal(reloj=lambda: ahora)
+    acumulador.registrar('2024-11-01 11:58', 6.0)
+    assert acumulador.tasa('minuto', 0) == (0.0, 0.0)
+    assert acumulador.tasa('minuto', 4) == (0.25, 1.5)
+
+
+def test_carga_inicial_omite_pedidos_con_fecha_invalida(sistema, monkeypatch, capsys):
+    main = sys.modules[type(sistema).__module__]
+
+    class Cargador:
+        def cargar_usuarios(self):
+            return [{'nombre': 'Ana', 'tipo': 'profesor'}]
+
+        def cargar_productos(self):
+            return [{'nombre': 'Café', 'precio': 1.5, 'categoria': 'Bebidas',
+                     'ingredientes': [], 'disponible': True}]
+
+        def cargar_pedidos_historicos(self):
+            return [
+                {'id': 'H1', 'usuario_id': 'U001', 'producto_ids': ['P001'], 'total': 1.5,
+                 'fecha': '2024-11-01 09:15', 'estado': 'entregado'},
+                {'id': 'H2', 'usuario_id': 'U001', 'producto_ids': ['P001'], 'total': 3.0,
+                 'fecha': '01/11/2024 10:00', 'estado': 'entregado'},
+                {'id': 'H3', 'usuario_id': 'U001', 'producto_ids': ['P001', 'P001'], 'total': 3.0,
+                 'fecha': '2024-11-01 10:30', 'estado': 'entregado'},
+            ]
+
+    monkeypatch.setattr(main, 'CargadorDatos', Cargador)
+    sistema = main.SistemaCafeteria()
+    salida = capsys.readouterr().out
+
+    assert "Pedidos históricos omitidos por fecha inválida: H2" in salida
+    assert sistema.total_pedidos_procesados == 2
+    assert sistema.ventas_totales == 4.5
+    assert sistema.ventas_por_producto == {'P001': 3}
+    usuario = sistema.obtener_usuario('U001')
+    assert usuario.info['total_pedidos'] == 2
+    assert sistema.ventas_por_periodo.ventana('dia', 1, datetime(2024, 11, 1)) == (2, 4.5)
+    if sistema.almacen_pedidos is not None:
+        assert sistema.almacen_pedidos.total_ventas() == (2, 4.5)
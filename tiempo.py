@@ -0,0 +1,15 @@
+from datetime import datetime
+
+EPOCA = datetime(1970, 1, 1)
+
+
+def como_fecha(fecha):
+    # Acepta datetime o cadenas 'AAAA-MM-DD' / 'AAAA-MM-DD HH:MM'
+    if isinstance(fecha, str):
+        return datetime.fromisoformat(fecha)
+    return fecha
+
+
+def segundos_epoca(fecha):
+    # Segundos enteros desde EPOCA (sin zona horaria, como las fechas del sistema)
+    return int((como_fecha(fecha) - EPOCA).total_seconds())